@@ -31,10 +31,36 @@ def cli():
     help="Path to Obsidian vault",
 )
 @click.option("--force", "-f", is_flag=True, help="Force reindex all files")
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Resume an interrupted --force run (incremental runs resume automatically)",
+)
 @click.option(
     "--persist-dir", "-p", default=".vault", help="ChromaDB storage directory"
 )
-def index(vault: str, force: bool, persist_dir: str):
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Worker threads for reading and hashing files (default: auto)",
+)
+@click.option(
+    "--chunk-workers",
+    type=click.IntRange(min=0),
+    default=0,
+    show_default=True,
+    help="Worker processes for chunking, e.g. one per core for a large --force "
+    "run (0: chunk in the main process)",
+)
+def index(
+    vault: str,
+    force: bool,
+    resume: bool,
+    persist_dir: str,
+    jobs: int | None,
+    chunk_workers: int,
+):
     """Index an Obsidian vault for semantic search."""
     from obsidian_rag_mcp.rag import RAGEngine
 
@@ -52,14 +78,88 @@ def index(vault: str, force: bool, persist_dir: str):
         vault_path=vault,
         persist_dir=persist_dir,
         reasoning_enabled=reasoning_enabled,
+        jobs=jobs,
+        chunk_workers=chunk_workers,
     )
 
-    stats = engine.index(force=force)
+    stats = engine.index(force=force, resume=resume)
 
     click.echo("\nIndex complete:")
     click.echo(f"  Files: {stats.total_files}")
     click.echo(f"  Chunks: {stats.total_chunks}")
     click.echo(f"  Indexed at: {stats.indexed_at}")
+    if stats.scan_seconds is not None:
+        click.echo(f"  Scan time: {stats.scan_seconds:.2f}s")
+    if stats.skipped_chunks:
+        click.echo(
+            f"  Skipped: {stats.skipped_chunks} chunks rejected by the embeddings API "
+            "(list them with `obsidian-rag stats --skipped`)"
+        )
+    if stats.deduplicated_chunks:
+        click.echo(
+            f"  Deduplicated: {stats.deduplicated_chunks} chunks reused an "
+            "identical chunk's embedding"
+        )
+
+
+@cli.command()
+@click.option(
+    "--vault",
+    "-v",
+    envvar="OBSIDIAN_VAULT_PATH",
+    required=True,
+    type=click.Path(exists=True),
+    help="Path to Obsidian vault",
+)
+@click.option(
+    "--persist-dir", "-p", default=".vault", help="ChromaDB storage directory"
+)
+@click.option(
+    "--debounce",
+    type=click.IntRange(min=0),
+    default=1000,
+    show_default=True,
+    help="Milliseconds to wait for changes to settle before indexing",
+)
+@click.option(
+    "--poll",
+    is_flag=True,
+    help="Poll the vault instead of using native file events",
+)
+def watch(vault: str, persist_dir: str, debounce: int, poll: bool):
+    """Keep the index up to date as notes change."""
+    from obsidian_rag_mcp.rag import RAGEngine
+    from obsidian_rag_mcp.rag.watcher import VaultWatcher, WatcherConfig
+
+    reasoning_enabled = os.getenv("REASONING_ENABLED", "false").lower() in (
+        "true",
+        "1",
+        "yes",
+    )
+
+    engine = RAGEngine(
+        vault_path=vault,
+        persist_dir=persist_dir,
+        reasoning_enabled=reasoning_enabled,
+    )
+
+    def report(stats):
+        click.echo(
+            f"Index updated: {stats.total_files} files, {stats.total_chunks} chunks"
+        )
+
+    watcher = VaultWatcher(
+        engine.indexer,
+        WatcherConfig(debounce_ms=debounce, force_polling=poll),
+        on_update=report,
+    )
+
+    click.echo(f"Watching vault: {vault} ({watcher.backend} events)")
+    click.echo("Press Ctrl+C to stop.")
+    try:
+        watcher.run(sync_first=True)
+    except KeyboardInterrupt:
+        click.echo("\nStopped watching.")
 
 
 def validate_top_k(ctx, param, value):
@@ -141,7 +241,12 @@ def search(
 @click.option(
     "--persist-dir", "-p", default=".vault", help="ChromaDB storage directory"
 )
-def stats(vault: str, persist_dir: str):
+@click.option(
+    "--skipped",
+    is_flag=True,
+    help="List the chunks the embeddings API rejected, and why",
+)
+def stats(vault: str, persist_dir: str, skipped: bool):
     """Show index statistics."""
     from obsidian_rag_mcp.rag import RAGEngine
 
@@ -156,6 +261,12 @@ def stats(vault: str, persist_dir: str):
     click.echo(f"Files: {index_stats.total_files}")
     click.echo(f"Chunks indexed: {index_stats.total_chunks}")
 
+    if skipped:
+        rejected = engine.indexer.manifest.skipped_chunks()
+        click.echo(f"Skipped chunks: {len(rejected)}")
+        for chunk_id, _, reason in rejected:
+            click.echo(f"  {chunk_id}: {reason}")
+
 
 @cli.command()
 @click.option(
@@ -168,7 +279,13 @@ def stats(vault: str, persist_dir: str):
 @click.option(
     "--persist-dir", "-p", default=".vault", help="ChromaDB storage directory"
 )
-def serve(vault: str, persist_dir: str):
+@click.option(
+    "--watch",
+    is_flag=True,
+    envvar="WATCH_ENABLED",
+    help="Reindex changed notes in the background while serving",
+)
+def serve(vault: str, persist_dir: str, watch: bool):
     """Start the MCP server (stdio transport)."""
     from obsidian_rag_mcp.mcp.server import run_server
 
@@ -183,12 +300,15 @@ def serve(vault: str, persist_dir: str):
     click.echo(f"ChromaDB: {persist_dir}", err=True)
     if reasoning_enabled:
         click.echo("Reasoning: enabled", err=True)
+    if watch:
+        click.echo("Watch: enabled", err=True)
     click.echo("Using stdio transport (for Claude Code integration)", err=True)
 
     run_server(
         vault_path=vault,
         persist_dir=persist_dir,
         reasoning_enabled=reasoning_enabled,
+        watch=watch,
     )
 
 
@@ -619,6 +619,7 @@ def run_server(
     vault_path: str,
     persist_dir: str = ".vault",
     reasoning_enabled: bool = False,
+    watch: bool = False,
 ):
     """
     Run the MCP server.
@@ -627,6 +628,7 @@ def run_server(
         vault_path: Path to the Obsidian vault
         persist_dir: ChromaDB storage directory
         reasoning_enabled: Enable reasoning layer for conclusion extraction
+        watch: Reindex changed notes in a background thread while serving
     """
     global _engine
 
@@ -634,6 +636,7 @@ def run_server(
     logger.info(f"Vault path: {vault_path}")
     logger.info(f"Persist dir: {persist_dir}")
     logger.info(f"Reasoning enabled: {reasoning_enabled}")
+    logger.info(f"Watch enabled: {watch}")
 
     # Initialize the RAG engine
     _engine = RAGEngine(
@@ -642,6 +645,14 @@ def run_server(
         reasoning_enabled=reasoning_enabled,
     )
 
+    # Keep the index fresh without blocking the event loop
+    watcher = None
+    if watch:
+        from obsidian_rag_mcp.rag.watcher import VaultWatcher
+
+        watcher = VaultWatcher(_engine.indexer)
+        watcher.start(sync_first=True)
+
     # Create MCP server
     server = Server("obsidian-rag")
 
@@ -660,7 +671,11 @@ def run_server(
                 read_stream, write_stream, server.create_initialization_options()
             )
 
-    asyncio.run(run())
+    try:
+        asyncio.run(run())
+    finally:
+        if watcher is not None:
+            watcher.stop(timeout=5)
 
 
 def main():
@@ -682,7 +697,11 @@ def main():
         "yes",
     )
 
-    run_server(vault_path, persist_dir, reasoning_enabled=reasoning_enabled)
+    watch = os.getenv("WATCH_ENABLED", "false").lower() in ("true", "1", "yes")
+
+    run_server(
+        vault_path, persist_dir, reasoning_enabled=reasoning_enabled, watch=watch
+    )
 
 
 if __name__ == "__main__":
@@ -1,7 +1,7 @@
 """RAG components for Obsidian vault indexing and search."""
 
 from .chunker import Chunk, ChunkerConfig, MarkdownChunker
-from .embedder import EmbedderConfig, OpenAIEmbedder
+from .embedder import Embedder, EmbedderConfig, OpenAIEmbedder, create_embedder
 from .engine import RAGEngine, SearchResponse, SearchResult
 from .indexer import IndexerConfig, IndexStats, VaultIndexer
 
@@ -9,8 +9,10 @@ __all__ = [
     "Chunk",
     "ChunkerConfig",
     "MarkdownChunker",
+    "Embedder",
     "EmbedderConfig",
     "OpenAIEmbedder",
+    "create_embedder",
     "RAGEngine",
     "SearchResponse",
     "SearchResult",
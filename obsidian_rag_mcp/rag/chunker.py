@@ -8,17 +8,99 @@ Splits documents into semantically meaningful chunks while preserving:
 - Obsidian-specific syntax (tags, links)
 """
 
+import functools
+import hashlib
 import logging
 import re
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
 
 import frontmatter
 import yaml
+from frontmatter.default_handlers import BaseHandler, YAMLHandler
 
-from obsidian_rag_mcp.utils.tokens import count_tokens
+from obsidian_rag_mcp.utils.tokens import (
+    count_tokens,
+    count_tokens_batch,
+    encode_with_offsets,
+)
 
 logger = logging.getLogger(__name__)
 
+# Line-level patterns for MarkdownChunker._paragraph_spans, matched in place
+# between a line's start and end. _LINE_TEXT's group is None on blank lines.
+_LINE_TEXT = re.compile(r"\s*(\S(?:.*\S)?)?")
+_FENCE_OPEN = re.compile(r" {0,3}(`{3,}|~{3,})(.*)")
+_FENCE_CLOSE = re.compile(r" {0,3}(`{3,}|~{3,})[ \t]*\r?$")
+
+# A character is at most 4 UTF-8 bytes, and byte-level BPE never uses more
+# than one token per byte
+_MAX_CHAR_TOKENS = 4
+
+# libyaml's loader is several times faster than the pure-Python one
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@functools.lru_cache(maxsize=1024)
+def _load_frontmatter(handler: BaseHandler, text: str) -> object:
+    """
+    Parse a frontmatter block, caching by its text.
+
+    Notes made from the same template, and notes re-chunked after a body
+    edit, share their frontmatter, so most lookups skip the YAML parse.
+    Cached values are shared: treat them as read-only.
+    """
+    if isinstance(handler, YAMLHandler):
+        return handler.load(text, Loader=_YAML_LOADER)
+    return handler.load(text)
+
+
+def parse_frontmatter(content: str) -> tuple[dict, str]:
+    """
+    Split a note into its frontmatter metadata and body.
+
+    Equivalent to ``frontmatter.loads`` (which also skips notes without
+    frontmatter), but frontmatter is parsed with libyaml when available and
+    cached by its text. The speedup is in notes that have frontmatter.
+
+    Raises:
+        yaml.YAMLError: If the frontmatter is invalid YAML.
+    """
+    text = content.strip()
+    handler = frontmatter.detect_format(text, frontmatter.handlers)
+    if handler is None:
+        return {}, text
+    try:
+        fm_text, body = handler.split(text)
+    except ValueError:
+        return {}, text
+    metadata = _load_frontmatter(handler, fm_text)
+    return (dict(metadata) if isinstance(metadata, dict) else {}), body.strip()
+
+
+def title_from_path(source_path: str) -> str:
+    """Title of a note with no frontmatter title or H1: its file name."""
+    return source_path.split("/")[-1].replace(".md", "")
+
+
+def make_chunk_id(
+    source_path: str, heading: str | None, content: str, occurrence: int = 0
+) -> str:
+    """
+    Build a stable chunk ID from the chunk's heading and content.
+
+    Unlike a positional index, the ID survives edits elsewhere in the note,
+    so unchanged chunks keep their identity. ``occurrence`` disambiguates
+    identical chunks within the same file.
+    """
+    digest = hashlib.sha256(f"{heading or ''}\0{content}".encode()).hexdigest()[:16]
+    chunk_id = f"{source_path}#{digest}"
+    if occurrence:
+        chunk_id += f"-{occurrence}"
+    return chunk_id
+
 
 @dataclass
 class Chunk:
@@ -38,10 +120,32 @@ class Chunk:
     start_line: int = 0
     end_line: int = 0
 
+    # Content-derived ID; filled in from heading and content when not given
+    chunk_id: str = ""
+
+    # Memoized token_estimate; see count_chunk_tokens
+    _token_count: int | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        if not self.chunk_id:
+            self.chunk_id = make_chunk_id(self.source_path, self.heading, self.content)
+
     @property
     def token_estimate(self) -> int:
-        """Accurate token count using tiktoken."""
-        return count_tokens(self.content)
+        """Accurate token count using tiktoken (computed once)."""
+        if self._token_count is None:
+            self._token_count = count_tokens(self.content)
+        return self._token_count
+
+
+def count_chunk_tokens(chunks: Iterable[Chunk]) -> None:
+    """Compute the token counts of many chunks in one batch encode."""
+    pending = [chunk for chunk in chunks if chunk._token_count is None]
+    counts = count_tokens_batch([chunk.content for chunk in pending])
+    for chunk, count in zip(pending, counts, strict=True):
+        chunk._token_count = count
 
 
 @dataclass
@@ -57,6 +161,21 @@ class ChunkerConfig:
     split_on_h3: bool = False  # Also split on ### headers
     preserve_code_blocks: bool = True
 
+    # Size chunks by tiktoken counts instead of ~4 characters per token.
+    # Each section is encoded once; splits and overlap fall on token
+    # boundaries and max_chunk_tokens is a hard limit, so paragraphs over
+    # it are split too (except code blocks, with preserve_code_blocks).
+    token_sizing: bool = False
+
+    def __post_init__(self) -> None:
+        # Each chunk must have room for the overlap plus at least one character
+        if self.max_chunk_tokens <= self.overlap_tokens + _MAX_CHAR_TOKENS:
+            raise ValueError(
+                f"max_chunk_tokens ({self.max_chunk_tokens}) must be greater than "
+                f"overlap_tokens ({self.overlap_tokens}) + {_MAX_CHAR_TOKENS}, "
+                "the most tokens a single character can take"
+            )
+
 
 class MarkdownChunker:
     """
@@ -93,9 +212,7 @@ class MarkdownChunker:
         """
         # Parse frontmatter (with fallback for invalid YAML)
         try:
-            post = frontmatter.loads(content)
-            fm = dict(post.metadata)
-            body = post.content
+            fm, body = parse_frontmatter(content)
         except yaml.YAMLError as e:
             # Fallback: treat as plain content with no frontmatter
             logger.warning(f"Failed to parse frontmatter in {source_path}: {e}")
@@ -106,11 +223,7 @@ class MarkdownChunker:
         title = fm.get("title")
         if not title:
             h1_match = re.search(r"^# (.+)$", body, re.MULTILINE)
-            title = (
-                h1_match.group(1)
-                if h1_match
-                else source_path.split("/")[-1].replace(".md", "")
-            )
+            title = h1_match.group(1) if h1_match else title_from_path(source_path)
 
         # Extract tags from frontmatter and body
         tags = self._extract_tags(fm, body)
@@ -132,6 +245,16 @@ class MarkdownChunker:
             )
             chunks.extend(section_chunks)
 
+        # Repeated chunks (e.g. identical boilerplate sections) need distinct IDs
+        seen: Counter[str] = Counter()
+        for chunk in chunks:
+            occurrence = seen[chunk.chunk_id]
+            seen[chunk.chunk_id] += 1
+            if occurrence:
+                chunk.chunk_id = make_chunk_id(
+                    source_path, chunk.heading, chunk.content, occurrence
+                )
+
         return chunks
 
     def _extract_tags(self, fm: dict, body: str) -> list[str]:
@@ -200,22 +323,28 @@ class MarkdownChunker:
         """
         Chunk a section, respecting max token limits.
         """
+
+        def make_chunk(text: str, index: int) -> Chunk:
+            return Chunk(
+                content=text,
+                source_path=source_path,
+                chunk_index=index,
+                title=title,
+                heading=heading,
+                tags=tags,
+                frontmatter=frontmatter,
+            )
+
+        if self.config.token_sizing:
+            texts = self._split_by_tokens(content)
+            return [make_chunk(text, base_index + i) for i, text in enumerate(texts)]
+
         max_chars = self.config.max_chunk_tokens * 4
         min_chars = self.config.min_chunk_tokens * 4
 
         # If section is small enough, return as single chunk
         if len(content) <= max_chars:
-            return [
-                Chunk(
-                    content=content,
-                    source_path=source_path,
-                    chunk_index=base_index,
-                    title=title,
-                    heading=heading,
-                    tags=tags,
-                    frontmatter=frontmatter,
-                )
-            ]
+            return [make_chunk(content, base_index)]
 
         # Need to split further - by paragraphs
         chunks = []
@@ -231,17 +360,7 @@ class MarkdownChunker:
                 and len(current_chunk) >= min_chars
             ):
                 # Save current chunk
-                chunks.append(
-                    Chunk(
-                        content=current_chunk.strip(),
-                        source_path=source_path,
-                        chunk_index=current_index,
-                        title=title,
-                        heading=heading,
-                        tags=tags,
-                        frontmatter=frontmatter,
-                    )
-                )
+                chunks.append(make_chunk(current_chunk.strip(), current_index))
                 current_index += 1
 
                 # Start new chunk with overlap
@@ -255,42 +374,138 @@ class MarkdownChunker:
 
         # Don't forget the last chunk
         if current_chunk.strip():
-            chunks.append(
-                Chunk(
-                    content=current_chunk.strip(),
-                    source_path=source_path,
-                    chunk_index=current_index,
-                    title=title,
-                    heading=heading,
-                    tags=tags,
-                    frontmatter=frontmatter,
-                )
-            )
+            chunks.append(make_chunk(current_chunk.strip(), current_index))
 
         return chunks
 
+    def _split_by_tokens(self, content: str) -> list[str]:
+        """
+        Split a section into chunk texts sized by exact token counts.
+
+        The section is encoded once. Paragraphs are mapped to token spans
+        through the token offsets and packed greedily; chunk text is sliced
+        from the section at token boundaries. Unlike character sizing,
+        max_chunk_tokens is never exceeded (except by an atomic code block,
+        or when a tiny budget can't fit a multi-token character), so
+        min_chunk_tokens doesn't apply.
+        """
+        max_tokens = self.config.max_chunk_tokens
+        tokens, offsets = encode_with_offsets(content)
+        if len(tokens) <= max_tokens:
+            return [content]
+
+        def char_at(token: int) -> int:
+            return offsets[token] if token < len(offsets) else len(content)
+
+        def starts_char(token: int) -> bool:
+            # Tokens starting inside a multi-byte character share its offset
+            return token == 0 or offsets[token] > offsets[token - 1]
+
+        def starts_word(token: int) -> bool:
+            return starts_char(token) and content[offsets[token]].isspace()
+
+        # Paragraphs as token spans; oversized prose is cut into windows,
+        # preferably between words
+        units: list[tuple[int, int]] = []
+        for start, end, fenced in self._paragraph_spans(content):
+            first = bisect_left(offsets, start)
+            last = bisect_left(offsets, end)
+            if fenced and self.config.preserve_code_blocks:
+                units.append((first, last))
+                continue
+            while last - first > max_tokens:
+                # Even windows, so the last one isn't a scrap
+                windows = -(-(last - first) // max_tokens)
+                limit = first + -(-(last - first) // windows)
+                cut = next(
+                    (
+                        i
+                        for i in range(limit, (first + limit) // 2, -1)
+                        if starts_word(i)
+                    ),
+                    None,
+                )
+                if cut is None:
+                    # Otherwise the last character start in the window
+                    cut = next(
+                        (i for i in range(limit, first, -1) if starts_char(i)), None
+                    )
+                if cut is None:
+                    # A character spans the window's end: cut after it, going
+                    # over the budget rather than splitting the character
+                    cut = next(
+                        (i for i in range(limit + 1, last) if starts_char(i)), last
+                    )
+                units.append((first, cut))
+                first = cut
+            if last > first:
+                units.append((first, last))
+
+        texts = []
+        chunk_start = chunk_end = units[0][0]
+        for first, last in units:
+            if last - chunk_start > max_tokens and chunk_end > chunk_start:
+                texts.append(content[char_at(chunk_start) : char_at(chunk_end)].strip())
+                # Overlap the previous chunk, as far as this paragraph allows,
+                # starting between words; otherwise don't overlap
+                overlap_start = max(
+                    chunk_end - self.config.overlap_tokens,
+                    min(first, last - max_tokens),
+                )
+                chunk_start = next(
+                    (i for i in range(overlap_start, first) if starts_word(i)), first
+                )
+            chunk_end = last
+        text = content[char_at(chunk_start) : char_at(chunk_end)].strip()
+        if text:
+            texts.append(text)
+        return texts
+
     def _split_paragraphs(self, content: str) -> list[str]:
         """
         Split content into paragraphs, keeping code blocks intact.
         """
-        # Temporarily replace code blocks with placeholders
-        code_blocks = []
-
-        def save_code_block(match):
-            code_blocks.append(match.group(0))
-            return f"__CODE_BLOCK_{len(code_blocks) - 1}__"
+        return [content[start:end] for start, end, _ in self._paragraph_spans(content)]
 
-        content = self.code_block_pattern.sub(save_code_block, content)
-
-        # Split on double newlines
-        paragraphs = re.split(r"\n\s*\n", content)
-
-        # Restore code blocks
-        result = []
-        for para in paragraphs:
-            for i, block in enumerate(code_blocks):
-                para = para.replace(f"__CODE_BLOCK_{i}__", block)
-            if para.strip():
-                result.append(para.strip())
-
-        return result
+    def _paragraph_spans(self, content: str) -> Iterator[tuple[int, int, bool]]:
+        """
+        Walk the content once, yielding paragraphs as (start, end, fenced)
+        character spans stripped of surrounding whitespace.
+
+        Paragraphs are separated by blank lines. Fenced code blocks (``` or
+        ~~~, optionally indented up to three spaces and followed by an info
+        string) are kept whole: blank lines inside them don't split, and an
+        unclosed fence runs to the end of the content. ``fenced`` is whether
+        the paragraph contains a code block.
+        """
+        start = end = -1  # Current paragraph, or -1 between paragraphs
+        fenced = False
+        fence = ""  # Opening fence of the code block we're in, if any
+        pos = 0
+        while pos < len(content):
+            line_end = content.find("\n", pos)
+            if line_end == -1:
+                line_end = len(content)
+            text = _LINE_TEXT.match(content, pos, line_end)
+            assert text is not None  # Every part of the pattern is optional
+            if fence:
+                close = _FENCE_CLOSE.match(content, pos, line_end)
+                if close and close[1][0] == fence[0] and len(close[1]) >= len(fence):
+                    fence = ""
+                if text[1] is not None:
+                    end = text.end(1)
+            elif text[1] is None:
+                if start != -1:
+                    yield start, end, fenced
+                    start = -1
+            else:
+                if start == -1:
+                    start, fenced = text.start(1), False
+                end = text.end(1)
+                opening = _FENCE_OPEN.match(content, pos, line_end)
+                # Backtick fences can't have backticks in their info string
+                if opening and not (opening[1][0] == "`" and "`" in opening[2]):
+                    fence, fenced = opening[1], True
+            pos = line_end + 1
+        if start != -1:
+            yield start, end, fenced
@@ -3,14 +3,37 @@ OpenAI embedding wrapper with batching, retries, and logging.
 
 Supports both OpenAI and Azure OpenAI endpoints. Azure OpenAI is auto-detected
 when AZURE_OPENAI_ENDPOINT and AZURE_API_KEY environment variables are set.
+
+Embeddings are returned as float32 NumPy arrays, one row per input, and are
+decoded straight from the API's base64 payload without passing through
+Python floats.
+
+Other backends implement the ``Embedder`` protocol and are selected with
+``EmbedderConfig.backend`` (or EMBEDDING_BACKEND) through ``create_embedder``.
 """
 
+from __future__ import annotations
+
+import base64
 import logging
 import os
-from dataclasses import dataclass
-
-import httpx
-from openai import APIConnectionError, APITimeoutError, OpenAI, RateLimitError
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Protocol
+
+import numpy as np
+from openai import (
+    APIConnectionError,
+    APITimeoutError,
+    BadRequestError,
+    OpenAI,
+    RateLimitError,
+    UnprocessableEntityError,
+)
 from tenacity import (
     before_sleep_log,
     retry,
@@ -19,20 +42,119 @@ from tenacity import (
     wait_exponential,
 )
 
+from obsidian_rag_mcp.utils.http import HTTPConfig, get_http_client
+from obsidian_rag_mcp.utils.ratelimit import RateLimiter
+from obsidian_rag_mcp.utils.tokens import count_tokens_batch, truncate_tokens
+
+from .embedding_cache import EmbeddingCache
+
 logger = logging.getLogger(__name__)
 
+# Supported values of EmbedderConfig.backend
+BACKENDS = ("openai", "hashing")
+
+# The OpenAI client's default endpoint
+_OPENAI_BASE_URL = "https://api.openai.com/v1"
+
 
 @dataclass
 class EmbedderConfig:
     """Configuration for the embedder."""
 
+    # "openai" (OpenAI or Azure OpenAI) or "hashing" (local, offline)
+    backend: str = "openai"
     model: str = "text-embedding-3-small"
-    batch_size: int = 100  # OpenAI allows up to 2048
+    batch_size: int = 2048  # Max inputs per request (OpenAI's limit)
     dimensions: int | None = None  # Use model default
     query_max_chars: int = 8000  # Stricter limit for queries
 
+    # Batches are packed by tiktoken counts up to the per-request token
+    # limit; longer inputs are truncated to the model's context length
+    max_batch_tokens: int = 300_000
+    max_input_tokens: int = 8191
+
+    # Recent query embeddings kept in memory (0 = disabled). With
+    # persist_query_cache, queries also use the persistent embedding cache.
+    query_cache_size: int = 1024
+    persist_query_cache: bool = False
+
+    # Batches in flight at once (1 = sequential). Above 1, each call's texts
+    # are spread over at least this many batches, so a pipeline batch far
+    # below batch_size still goes out as concurrent requests.
+    max_concurrency: int = 1
+    # Provider quota; None = unlimited. Requests wait rather than hit 429s.
+    requests_per_minute: int | None = None
+    tokens_per_minute: int | None = None
+
+    def __post_init__(self):
+        if self.backend not in BACKENDS:
+            raise ValueError(
+                f"backend must be one of {', '.join(BACKENDS)}, got {self.backend!r}"
+            )
+        if self.batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, got {self.batch_size}")
+        if self.max_input_tokens < 1:
+            raise ValueError(
+                f"max_input_tokens must be at least 1, got {self.max_input_tokens}"
+            )
+        if self.max_batch_tokens < self.max_input_tokens:
+            raise ValueError(
+                f"max_batch_tokens ({self.max_batch_tokens}) must be at least "
+                f"max_input_tokens ({self.max_input_tokens})"
+            )
+        if self.query_cache_size < 0:
+            raise ValueError(
+                f"query_cache_size must be non-negative, got {self.query_cache_size}"
+            )
+        if self.max_concurrency < 1:
+            raise ValueError(
+                f"max_concurrency must be at least 1, got {self.max_concurrency}"
+            )
+        for name in ("requests_per_minute", "tokens_per_minute"):
+            value = getattr(self, name)
+            if value is not None and value < 1:
+                raise ValueError(f"{name} must be at least 1, got {value}")
+
+    @classmethod
+    def from_env(cls) -> EmbedderConfig:
+        """
+        Build a config from environment variables, using defaults for unset ones.
+
+        - EMBEDDING_BACKEND: Embedding backend ("openai" or "hashing")
+        - EMBEDDING_QUERY_CACHE_SIZE: Query embeddings kept in memory
+        - EMBEDDING_PERSIST_QUERIES: Also cache queries on disk (true/false)
+        - EMBEDDING_MAX_CONCURRENCY: Batches in flight at once
+        - EMBEDDING_RPM: Requests per minute
+        - EMBEDDING_TPM: Tokens per minute
+        """
 
-def _create_openai_client(api_key: str | None = None) -> OpenAI:
+        kwargs: dict[str, Any] = {}
+        backend = os.getenv("EMBEDDING_BACKEND", "").strip().lower()
+        if backend:
+            kwargs["backend"] = backend
+        persist = os.getenv("EMBEDDING_PERSIST_QUERIES", "").strip().lower()
+        if persist:
+            kwargs["persist_query_cache"] = persist in ("true", "1", "yes")
+        for field, name in (
+            ("query_cache_size", "EMBEDDING_QUERY_CACHE_SIZE"),
+            ("max_concurrency", "EMBEDDING_MAX_CONCURRENCY"),
+            ("requests_per_minute", "EMBEDDING_RPM"),
+            ("tokens_per_minute", "EMBEDDING_TPM"),
+        ):
+            value = os.getenv(name, "").strip()
+            if value:
+                try:
+                    kwargs[field] = int(value)
+                except ValueError:
+                    raise ValueError(
+                        f"{name} must be an integer, got {value!r}"
+                    ) from None
+        return cls(**kwargs)
+
+
+def _create_openai_client(
+    api_key: str | None = None, http_config: HTTPConfig | None = None
+) -> OpenAI:
     """
     Create an OpenAI client, auto-detecting Azure OpenAI when configured.
 
@@ -40,7 +162,16 @@ def _create_openai_client(api_key: str | None = None) -> OpenAI:
     1. Explicit api_key parameter → standard OpenAI
     2. AZURE_OPENAI_ENDPOINT + AZURE_API_KEY → Azure OpenAI
     3. OPENAI_API_KEY env var → standard OpenAI
+
+    All clients send requests through the shared connection pool for
+    ``http_config`` (default: from environment variables).
     """
+    http_config = http_config or HTTPConfig.from_env()
+    pooled = {
+        "http_client": get_http_client(http_config),
+        "timeout": http_config.httpx_timeout,
+    }
+
     # Explicit api_key takes precedence over Azure env vars
     if api_key:
         azure_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT", "")
@@ -49,7 +180,7 @@ def _create_openai_client(api_key: str | None = None) -> OpenAI:
                 "Explicit api_key provided; ignoring AZURE_OPENAI_ENDPOINT. "
                 "Remove api_key to use Azure OpenAI."
             )
-        return OpenAI(api_key=api_key)
+        return OpenAI(api_key=api_key, **pooled)
 
     azure_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT", "").rstrip("/")
     azure_api_key = os.getenv("AZURE_API_KEY", "")
@@ -63,12 +194,142 @@ def _create_openai_client(api_key: str | None = None) -> OpenAI:
             api_key=azure_api_key,
             base_url=base_url,
             default_query={"api-version": azure_api_version},
-            http_client=httpx.Client(
-                headers={"api-key": azure_api_key},
-            ),
+            # Per client, not on the shared pool
+            default_headers={"api-key": azure_api_key},
+            **pooled,
         )
 
-    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"), **pooled)
+
+
+@dataclass
+class EmbedderStats:
+    """Counters for an embedder's lifetime (not persisted)."""
+
+    query_cache_hits: int = 0
+    query_cache_misses: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class _LRUCache:
+    """Thread-safe in-memory LRU mapping of cache keys to embeddings."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._items: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> np.ndarray | None:
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: np.ndarray) -> None:
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class Embedder(Protocol):
+    """Interface shared by embedding backends."""
+
+    config: EmbedderConfig
+    stats: EmbedderStats
+
+    @property
+    def embedding_dimension(self) -> int: ...
+
+    def embed_text(self, text: str, is_query: bool = True) -> np.ndarray: ...
+
+    def embed_texts(self, texts: list[str], is_query: bool = False) -> np.ndarray: ...
+
+    def embed_texts_partial(
+        self, texts: list[str]
+    ) -> tuple[np.ndarray, dict[int, str]]: ...
+
+
+def create_embedder(
+    config: EmbedderConfig | None = None,
+    api_key: str | None = None,
+    cache: EmbeddingCache | None = None,
+) -> Embedder:
+    """
+    Create the embedder selected by ``config.backend``.
+
+    Args:
+        config: Embedder configuration (default: from environment variables)
+        api_key: API key for remote backends
+        cache: Persistent cache for document embeddings (remote backends only;
+            local embeddings are cheaper to recompute than to look up)
+    """
+    config = config or EmbedderConfig.from_env()
+    if config.backend == "hashing":
+        from .local_embedder import HashingEmbedder
+
+        return HashingEmbedder(config)
+    return OpenAIEmbedder(api_key=api_key, config=config, cache=cache)
+
+
+def _decode_embedding(embedding: str | list[float]) -> np.ndarray:
+    """Decode an API embedding: base64 little-endian float32, or a float list."""
+    if isinstance(embedding, str):
+        return np.frombuffer(base64.b64decode(embedding), dtype="<f4")
+    return np.asarray(embedding, dtype=np.float32)
+
+
+def clean_text(text: str, max_chars: int | None = None) -> str:
+    """Clean text for embedding while preserving code structure.
+
+    Texts that clean to the same string get the same embedding, so callers
+    deduplicating inputs should compare cleaned texts.
+    """
+    # Remove null bytes
+    text = text.replace("\x00", "")
+    # Dedupe excessive blank lines (3+ -> 2) but preserve structure
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    # Strip trailing whitespace from lines
+    text = "\n".join(line.rstrip() for line in text.split("\n"))
+    # Truncate if too long
+    if max_chars is not None and len(text) > max_chars:
+        text = text[:max_chars]
+        logger.debug(f"Truncated text to {max_chars} characters")
+    return text
+
+
+class EmbeddingCountError(RuntimeError):
+    """The API returned fewer embeddings than inputs (e.g. content was filtered)."""
+
+
+# Failures that may be caused by the inputs themselves, as opposed to
+# transient or account-level errors; see _is_input_error
+_INPUT_ERRORS = (BadRequestError, UnprocessableEntityError, EmbeddingCountError)
+
+# Error codes of request errors that blame an input's content
+_INPUT_ERROR_CODES = frozenset({"content_filter", "context_length_exceeded"})
+
+
+def _is_input_error(error: Exception) -> bool:
+    """
+    Whether an error points at specific inputs, so bisecting can isolate them.
+
+    Request errors about the request as a whole (an unknown model,
+    unsupported dimensions) fail every batch alike and are not.
+    """
+    if isinstance(error, EmbeddingCountError):
+        return True  # Filtered inputs were dropped from the response
+    if isinstance(error, (BadRequestError, UnprocessableEntityError)):
+        param = error.param if isinstance(error.param, str) else ""
+        return param.startswith("input") or error.code in _INPUT_ERROR_CODES
+    return False
 
 
 class OpenAIEmbedder:
@@ -81,13 +342,30 @@ class OpenAIEmbedder:
     - Configurable model and dimensions
     - Simple interface
     - Auto-detects Azure OpenAI via environment variables
+    - Optional persistent cache for document embeddings
+    - In-memory LRU cache for repeated queries
     """
 
     def __init__(
-        self, api_key: str | None = None, config: EmbedderConfig | None = None
+        self,
+        api_key: str | None = None,
+        config: EmbedderConfig | None = None,
+        cache: EmbeddingCache | None = None,
     ):
-        self.config = config or EmbedderConfig()
+        self.config = config or EmbedderConfig.from_env()
+        self.cache = cache
+        self.stats = EmbedderStats()
+        self._stats_lock = threading.Lock()
+        self.query_cache: _LRUCache | None = None
+        if self.config.query_cache_size:
+            self.query_cache = _LRUCache(self.config.query_cache_size)
         self.client = _create_openai_client(api_key)
+        self._cache_model = self._cache_namespace()
+        # Shared by all threads embedding through this instance
+        self.rate_limiter = RateLimiter(
+            requests_per_minute=self.config.requests_per_minute,
+            tokens_per_minute=self.config.tokens_per_minute,
+        )
 
         # Validate API key
         if not self.client.api_key:
@@ -98,7 +376,19 @@ class OpenAIEmbedder:
 
         logger.debug(f"Initialized embedder with model={self.config.model}")
 
-    def embed_text(self, text: str, is_query: bool = True) -> list[float]:
+    def _cache_namespace(self) -> str:
+        """
+        Model name under which embeddings are cached.
+
+        Any endpoint other than OpenAI's is part of it: on Azure the
+        deployment in the URL picks the model, whatever ``config.model`` says.
+        """
+        base_url = str(self.client.base_url).rstrip("/")
+        if base_url == _OPENAI_BASE_URL:
+            return self.config.model
+        return f"{self.config.model}@{base_url}"
+
+    def embed_text(self, text: str, is_query: bool = True) -> np.ndarray:
         """
         Embed a single text string.
 
@@ -107,14 +397,12 @@ class OpenAIEmbedder:
             is_query: If True, apply stricter length limit for queries
 
         Returns:
-            Embedding vector as list of floats
+            Embedding vector (1-D float32 array)
         """
         result = self.embed_texts([text], is_query=is_query)
         return result[0]
 
-    def embed_texts(
-        self, texts: list[str], is_query: bool = False
-    ) -> list[list[float]]:
+    def embed_texts(self, texts: list[str], is_query: bool = False) -> np.ndarray:
         """
         Embed multiple texts efficiently with batching.
 
@@ -123,33 +411,266 @@ class OpenAIEmbedder:
             is_query: If True, apply stricter length limits
 
         Returns:
-            List of embedding vectors
+            Embedding vectors (float32 array with one row per text)
+        """
+        embeddings, _ = self._embed(texts, is_query=is_query, partial=False)
+        return embeddings
+
+    def embed_texts_partial(
+        self, texts: list[str]
+    ) -> tuple[np.ndarray, dict[int, str]]:
+        """
+        Embed documents, skipping inputs the API rejects instead of failing.
+
+        A batch failing with a request error that blames its inputs (or
+        returning too few embeddings) is split in halves recursively until
+        the offending inputs are isolated; everything else is still
+        embedded. Other request errors raise, as does a batch whose inputs
+        are all rejected. Transient errors are retried as usual and still
+        raise once retries run out.
+
+        Args:
+            texts: List of document texts to embed
+
+        Returns:
+            (embeddings, with zero rows for skipped inputs; error message
+            for each skipped input, by index)
         """
+        return self._embed(texts, is_query=False, partial=True)
+
+    def _embed(
+        self, texts: list[str], is_query: bool, partial: bool
+    ) -> tuple[np.ndarray, dict[int, str]]:
         if not texts:
-            return []
+            return np.empty((0, self.embedding_dimension), dtype=np.float32), {}
+
+        # Clean texts (remove null bytes, excessive whitespace); token
+        # truncation happens when batches are packed
+        max_chars = self.config.query_max_chars if is_query else None
+        cleaned = [clean_text(t, max_chars) for t in texts]
+
+        if is_query:
+            return self._embed_queries(cleaned), {}
+
+        # Documents are looked up in the persistent cache
+        if self.cache is None:
+            return self._embed_uncached(cleaned, partial)
+
+        keys = [
+            self.cache.make_key(self._cache_model, self.config.dimensions, t)
+            for t in cleaned
+        ]
+        cached = self.cache.get_many(keys)
+        missing = [i for i, key in enumerate(keys) if key not in cached]
+        logger.debug(
+            f"Embedding cache: {len(texts) - len(missing)} hits, {len(missing)} misses"
+        )
 
-        all_embeddings = []
-        total_batches = (
-            len(texts) + self.config.batch_size - 1
-        ) // self.config.batch_size
+        embeddings, errors = self._fill_missing(
+            [cached.get(key) for key in keys],
+            missing,
+            lambda batch: self._embed_uncached(batch, partial),
+            cleaned,
+        )
+        self.cache.put_many(
+            {keys[i]: embeddings[i] for i in missing if i not in errors}
+        )
+        return embeddings, errors
+
+    def _embed_queries(self, cleaned: list[str]) -> np.ndarray:
+        """Embed cleaned queries, serving repeats from the query caches."""
+        keys = [
+            EmbeddingCache.make_key(self._cache_model, self.config.dimensions, t)
+            for t in cleaned
+        ]
+        rows: list[np.ndarray | None] = [None] * len(keys)
+        if self.query_cache is not None:
+            rows = [self.query_cache.get(key) for key in keys]
+        missing = [i for i, row in enumerate(rows) if row is None]
+
+        with self._stats_lock:
+            self.stats.query_cache_hits += len(keys) - len(missing)
+            self.stats.query_cache_misses += len(missing)
+
+        persistent = self.cache if self.config.persist_query_cache else None
+        if missing and persistent is not None:
+            stored = persistent.get_many(keys[i] for i in missing)
+            for i in missing:
+                rows[i] = stored.get(keys[i])
+            missing = [i for i in missing if rows[i] is None]
+
+        # The result is a fresh array, so callers can't change cached rows
+        embeddings, _ = self._fill_missing(rows, missing, self._embed_uncached, cleaned)
+        if missing and persistent is not None:
+            persistent.put_many({keys[i]: embeddings[i] for i in missing})
+        if self.query_cache is not None:
+            for key, row in zip(keys, embeddings, strict=True):
+                self.query_cache.put(key, row.copy())
+        return embeddings
+
+    @staticmethod
+    def _fill_missing(
+        rows: list[np.ndarray | None],
+        missing: list[int],
+        embed: Callable[[list[str]], tuple[np.ndarray, dict[int, str]]],
+        texts: list[str],
+    ) -> tuple[np.ndarray, dict[int, str]]:
+        """
+        Stack known rows, embedding the texts at the ``missing`` positions.
 
-        logger.debug(f"Embedding {len(texts)} texts in {total_batches} batches")
+        Returns:
+            (embeddings for all rows; errors by position in ``rows``)
+        """
+        errors: dict[int, str] = {}
+        fresh = None
+        if missing:
+            fresh, fresh_errors = embed([texts[i] for i in missing])
+            errors = {missing[j]: message for j, message in fresh_errors.items()}
+            dimension = fresh.shape[1]
+        else:
+            dimension = len(rows[0])
+
+        embeddings = np.empty((len(rows), dimension), dtype=np.float32)
+        for i, row in enumerate(rows):
+            if row is not None:
+                embeddings[i] = row
+        if fresh is not None:
+            embeddings[missing] = fresh
+        return embeddings, errors
+
+    def _embed_uncached(
+        self, texts: list[str], partial: bool = False
+    ) -> tuple[np.ndarray, dict[int, str]]:
+        """Embed cleaned texts through the API in token-packed batches.
+
+        With ``max_concurrency`` above 1, batches are sent from a thread pool
+        (subject to the rate limiter); rows keep the input order. With
+        ``partial``, inputs the API rejects are left as zero rows and
+        reported in the returned errors, by index.
+        """
+        batches = self._pack_batches(texts)
+        workers = min(self.config.max_concurrency, len(batches))
+        send = self._embed_bisecting if partial else self._embed_packed
+        logger.debug(
+            f"Embedding {len(texts)} texts "
+            f"({sum(sum(counts) for _, counts in batches)} tokens) in "
+            f"{len(batches)} batches ({workers} in flight)"
+        )
 
-        # Process in batches
-        for batch_num, i in enumerate(range(0, len(texts), self.config.batch_size)):
-            batch = texts[i : i + self.config.batch_size]
+        if workers <= 1:
+            results = (send(*batch) for batch in batches)
+            return self._collect(results, len(texts), len(batches))
+
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="embed"
+        ) as pool:
+            # map() yields in submission order, whatever order batches finish in
+            results = pool.map(lambda batch: send(*batch), batches)
+            return self._collect(results, len(texts), len(batches))
+
+    def _collect(
+        self,
+        results: Iterable[list[np.ndarray | Exception]],
+        total: int,
+        num_batches: int,
+    ) -> tuple[np.ndarray, dict[int, str]]:
+        """
+        Copy batch results into one preallocated array.
 
-            # Clean texts (remove null bytes, excessive whitespace)
-            max_chars = self.config.query_max_chars if is_query else 30000
-            batch = [self._clean_text(t, max_chars) for t in batch]
+        Each batch result is a list of consecutive segments: an array of
+        rows, or an exception standing in for a single rejected input.
+        """
+        embeddings: np.ndarray | None = None
+        errors: dict[int, str] = {}
+        offset = 0
+        for batch_num, segments in enumerate(results, start=1):
+            for segment in segments:
+                if isinstance(segment, Exception):
+                    errors[offset] = str(segment)
+                    offset += 1
+                    continue
+                if embeddings is None:
+                    embeddings = np.zeros((total, segment.shape[1]), dtype=np.float32)
+                embeddings[offset : offset + len(segment)] = segment
+                offset += len(segment)
+            logger.debug(f"Completed batch {batch_num}/{num_batches}")
+
+        if embeddings is None:
+            # Every input was rejected
+            embeddings = np.zeros((total, self.embedding_dimension), dtype=np.float32)
+        return embeddings, errors
+
+    def _pack_batches(self, texts: list[str]) -> list[tuple[list[str], list[int]]]:
+        """
+        Truncate texts to ``max_input_tokens`` and pack them into batches.
 
-            # Call OpenAI API with retries
-            batch_embeddings = self._embed_batch(batch)
-            all_embeddings.extend(batch_embeddings)
+        Consecutive texts share a batch until adding the next one would
+        exceed ``batch_size`` inputs or ``max_batch_tokens`` tokens. With
+        ``max_concurrency`` above 1, batches are also capped at an even share
+        of the texts, so there are enough of them to fill the thread pool.
 
-            logger.debug(f"Completed batch {batch_num + 1}/{total_batches}")
+        Returns:
+            (texts, token count of each text) for each batch
+        """
+        share = -(-len(texts) // self.config.max_concurrency)
+        max_inputs = min(self.config.batch_size, max(share, 1))
+        max_tokens = self.config.max_batch_tokens
+        max_input = self.config.max_input_tokens
+        batches: list[tuple[list[str], list[int]]] = []
+        batch: list[str] = []
+        counts: list[int] = []
+        total = 0
+        # Count everything in one multi-threaded pass; only long texts are
+        # encoded again, to truncate them
+        for text, count in zip(texts, count_tokens_batch(texts), strict=True):
+            if count > max_input:
+                text, count = truncate_tokens(text, max_input)
+                logger.debug(f"Truncated text to {count} tokens")
+            if batch and (len(batch) >= max_inputs or total + count > max_tokens):
+                batches.append((batch, counts))
+                batch, counts, total = [], [], 0
+            batch.append(text)
+            counts.append(count)
+            total += count
+        if batch:
+            batches.append((batch, counts))
+        return batches
+
+    def _embed_packed(self, batch: list[str], counts: list[int]) -> list[np.ndarray]:
+        return [self._embed_batch(batch, sum(counts))]
+
+    def _embed_bisecting(
+        self, batch: list[str], counts: list[int]
+    ) -> list[np.ndarray | Exception]:
+        """
+        Embed a batch, splitting it around inputs the API rejects.
 
-        return all_embeddings
+        If every input of the batch is rejected, the request rather than
+        the inputs is the likely problem, so the first error is raised.
+        """
+        segments = self._bisect(batch, counts)
+        if len(batch) > 1 and all(isinstance(s, Exception) for s in segments):
+            error = segments[0]
+            assert isinstance(error, Exception)
+            raise error
+        return segments
+
+    def _bisect(
+        self, batch: list[str], counts: list[int]
+    ) -> list[np.ndarray | Exception]:
+        try:
+            return [self._embed_batch(batch, sum(counts))]
+        except _INPUT_ERRORS as e:
+            if not _is_input_error(e):
+                raise
+            if len(batch) == 1:
+                logger.warning(f"Skipping input rejected by the embeddings API: {e}")
+                return [e]
+            logger.debug(f"Batch of {len(batch)} inputs failed ({e}); bisecting")
+        mid = len(batch) // 2
+        return self._bisect(batch[:mid], counts[:mid]) + self._bisect(
+            batch[mid:], counts[mid:]
+        )
 
     @retry(
         retry=retry_if_exception_type(
@@ -159,19 +680,27 @@ class OpenAIEmbedder:
         wait=wait_exponential(multiplier=1, min=1, max=10),
         before_sleep=before_sleep_log(logger, logging.WARNING),
     )
-    def _embed_batch(self, batch: list[str]) -> list[list[float]]:
+    def _embed_batch(self, batch: list[str], tokens: int = 0) -> np.ndarray:
         """
         Embed a single batch with retry logic.
 
         Args:
             batch: List of cleaned texts to embed
+            tokens: Token count of the batch, charged to the rate limiter
 
         Returns:
-            List of embedding vectors
+            Embedding vectors (float32 array with one row per text)
         """
+        if self.rate_limiter.enabled:
+            waited = self.rate_limiter.acquire(tokens)
+            if waited:
+                logger.debug(f"Rate limit: waited {waited:.2f}s")
+
         kwargs = {
             "model": self.config.model,
             "input": batch,
+            # Raw float32 bytes, decoded without building a Python float per value
+            "encoding_format": "base64",
         }
         if self.config.dimensions:
             kwargs["dimensions"] = self.config.dimensions
@@ -179,34 +708,18 @@ class OpenAIEmbedder:
         response = self.client.embeddings.create(**kwargs)
 
         # Extract embeddings in order
-        batch_embeddings: list[list[float] | None] = [None] * len(batch)
+        batch_embeddings: list[np.ndarray | None] = [None] * len(batch)
         for item in response.data:
-            batch_embeddings[item.index] = item.embedding
+            batch_embeddings[item.index] = _decode_embedding(item.embedding)
 
         # Verify we got all embeddings back - fail explicitly if count doesn't match
         result = [e for e in batch_embeddings if e is not None]
         if len(result) != len(batch):
-            raise RuntimeError(
+            raise EmbeddingCountError(
                 f"OpenAI returned {len(result)} embeddings for {len(batch)} inputs. "
                 "This indicates content was filtered or an API error occurred."
             )
-        return result
-
-    def _clean_text(self, text: str, max_chars: int = 30000) -> str:
-        """Clean text for embedding while preserving code structure."""
-        import re
-
-        # Remove null bytes
-        text = text.replace("\x00", "")
-        # Dedupe excessive blank lines (3+ -> 2) but preserve structure
-        text = re.sub(r"\n{3,}", "\n\n", text)
-        # Strip trailing whitespace from lines
-        text = "\n".join(line.rstrip() for line in text.split("\n"))
-        # Truncate if too long
-        if len(text) > max_chars:
-            text = text[:max_chars]
-            logger.debug(f"Truncated text to {max_chars} characters")
-        return text
+        return np.stack(result)
 
     @property
     def embedding_dimension(self) -> int:
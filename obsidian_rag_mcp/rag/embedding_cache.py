@@ -0,0 +1,167 @@
+"""
+Persistent, content-addressed cache of embeddings.
+
+Entries are keyed by (model, dimensions, hash of the cleaned text), so an
+unchanged chunk is never embedded twice for the same model, even after the
+ChromaDB collection is wiped or a note is rewritten around it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Keep parameter lists well under SQLite's host parameter limit
+_SQL_BATCH = 500
+
+# When full, evict down to this fraction of max_entries so eviction is amortized
+_EVICT_TO = 0.9
+
+
+class EmbeddingCache:
+    """
+    SQLite-backed embedding cache with least-recently-used eviction.
+
+    Vectors are stored as packed float32, about 6 KB per entry for
+    1536-dimension embeddings. The database is opened lazily on first use.
+    """
+
+    FILENAME = "embedding_cache.sqlite3"
+
+    def __init__(self, path: str | Path, max_entries: int = 50_000):
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be at least 1, got {max_entries}")
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self._conn: sqlite3.Connection | None = None
+        self._count: int | None = None
+        # Shared between the indexing pipeline and query threads
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def make_key(model: str, dimensions: int | None, text: str) -> str:
+        """Build the cache key for a cleaned text."""
+        text_hash = hashlib.sha256(text.encode()).hexdigest()
+        return f"{model}:{dimensions or 0}:{text_hash}"
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Open the database on first use."""
+        if self._conn is None:
+            with self._lock:
+                if self._conn is None:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    conn = sqlite3.connect(self.path, check_same_thread=False)
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute("PRAGMA synchronous=NORMAL")
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS embeddings ("
+                        "key TEXT PRIMARY KEY, vector BLOB NOT NULL, "
+                        "last_used INTEGER NOT NULL)"
+                    )
+                    conn.execute(
+                        "CREATE INDEX IF NOT EXISTS embeddings_last_used "
+                        "ON embeddings (last_used)"
+                    )
+                    self._conn = conn
+        return self._conn
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, np.ndarray]:
+        """
+        Look up embeddings, refreshing the recency of every hit.
+
+        Vectors are read-only float32 arrays viewing the stored bytes.
+        """
+        keys = list(dict.fromkeys(keys))
+        found: dict[str, np.ndarray] = {}
+        if not keys:
+            return found
+
+        with self._lock:
+            for i in range(0, len(keys), _SQL_BATCH):
+                batch = keys[i : i + _SQL_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self.conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    batch,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+
+            if found:
+                now = time.time_ns()
+                with self.conn:
+                    self.conn.executemany(
+                        "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                        [(now, key) for key in found],
+                    )
+
+        return found
+
+    def put_many(self, items: dict[str, np.ndarray | list[float]]) -> None:
+        """Store embeddings, evicting least recently used entries when full."""
+        if not items:
+            return
+        now = time.time_ns()
+        rows = [
+            (key, np.asarray(vec, dtype=np.float32).tobytes(), now)
+            for key, vec in items.items()
+        ]
+
+        with self._lock, self.conn:
+            # Insert new keys first, so the count can be kept without a scan
+            added = self.conn.executemany(
+                "INSERT OR IGNORE INTO embeddings VALUES (?, ?, ?)", rows
+            ).rowcount
+            if added < len(rows):
+                self.conn.executemany(
+                    "UPDATE embeddings SET vector = ?, last_used = ? WHERE key = ?",
+                    [(vector, last_used, key) for key, vector, last_used in rows],
+                )
+            if self._count is not None:
+                self._count += added
+            if len(self) > self.max_entries:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries down to the eviction target."""
+        target = int(self.max_entries * _EVICT_TO)
+        excess = len(self) - target
+        self.conn.execute(
+            "DELETE FROM embeddings WHERE key IN ("
+            "SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+            (excess,),
+        )
+        # Re-counted on next use
+        self._count = None
+        logger.debug(f"Evicted {excess} entries from embedding cache")
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._count is None:
+                self._count = self.conn.execute(
+                    "SELECT COUNT(*) FROM embeddings"
+                ).fetchone()[0]
+            return self._count
+
+    def clear(self) -> None:
+        """Remove all cached embeddings."""
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM embeddings")
+            self._count = 0
+
+    def close(self) -> None:
+        """Close the database connection, if open."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -7,9 +7,12 @@ Supports optional reasoning layer for enriched search with logical conclusions.
 from __future__ import annotations
 
 import logging
+from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from chromadb.errors import NotFoundError
 
 from .indexer import IndexerConfig, VaultIndexer
 
@@ -19,6 +22,10 @@ if TYPE_CHECKING:
     from obsidian_rag_mcp.reasoning import ConclusionStore
     from obsidian_rag_mcp.reasoning.extractor import ExtractorConfig
 
+    from .embedder import EmbedderConfig
+
+_T = TypeVar("_T")
+
 
 @dataclass
 class SearchResult:
@@ -149,6 +156,9 @@ class RAGEngine:
         api_key: str | None = None,
         reasoning_enabled: bool = False,
         extractor_config: ExtractorConfig | None = None,
+        jobs: int | None = None,
+        embedder_config: EmbedderConfig | None = None,
+        chunk_workers: int = 0,
     ):
         self.vault_path = Path(vault_path).resolve()
         self.reasoning_enabled = reasoning_enabled
@@ -160,23 +170,45 @@ class RAGEngine:
                 persist_dir=persist_dir,
                 reasoning_enabled=reasoning_enabled,
                 extractor_config=extractor_config,
+                jobs=jobs,
+                embedder_config=embedder_config,
+                chunk_workers=chunk_workers,
             ),
             api_key=api_key,
         )
 
         # Use the same embedder for queries
         self.embedder = self.indexer.embedder
-        self.collection = self.indexer.collection
 
         # Access reasoning components from indexer
         self.conclusion_store: ConclusionStore | None = self.indexer.conclusion_store
 
+    @property
+    def collection(self):
+        """The live chunk collection (replaced when a force reindex finishes)."""
+        return self.indexer.collection
+
+    @collection.setter
+    def collection(self, collection) -> None:
+        self.indexer.collection = collection
+
+    def _read_collection(self, read: Callable[[Any], _T]) -> _T:
+        """Run a read on the live collection, reopening it if it was swapped out."""
+        try:
+            return read(self.collection)
+        except NotFoundError:
+            # A force reindex in another process swapped in a new collection
+            self.indexer.reopen_collection()
+            return read(self.collection)
+
     def _get_source_chunk(self, chunk_id: str) -> SourceEvidence | None:
         """Fetch source chunk content for a conclusion."""
         try:
-            result = self.collection.get(
-                ids=[chunk_id],
-                include=["documents", "metadatas"],
+            result = self._read_collection(
+                lambda collection: collection.get(
+                    ids=[chunk_id],
+                    include=["documents", "metadatas"],
+                )
             )
             if result["ids"]:
                 metadata = result["metadatas"][0]
@@ -247,7 +279,9 @@ class RAGEngine:
             if where_document:
                 query_kwargs["where_document"] = where_document
 
-            results = self.collection.query(**query_kwargs)
+            results = self._read_collection(
+                lambda collection: collection.query(**query_kwargs)
+            )
         except Exception as e:
             # Handle empty collection
             if "empty" in str(e).lower():
@@ -296,7 +330,9 @@ class RAGEngine:
         return SearchResponse(
             query=query,
             results=search_results,
-            total_chunks_searched=self.collection.count(),
+            total_chunks_searched=self._read_collection(
+                lambda collection: collection.count()
+            ),
         )
 
     def search_with_reasoning(
@@ -424,9 +460,11 @@ class RAGEngine:
         # Get the source chunk as supporting evidence
         supporting_evidence = []
         try:
-            chunk_result = self.collection.get(
-                ids=[conclusion.source_chunk_id],
-                include=["documents", "metadatas"],
+            chunk_result = self._read_collection(
+                lambda collection: collection.get(
+                    ids=[conclusion.source_chunk_id],
+                    include=["documents", "metadatas"],
+                )
             )
             if chunk_result["ids"]:
                 metadata = chunk_result["metadatas"][0]
@@ -653,10 +691,10 @@ class RAGEngine:
 
         return file_info[:limit]
 
-    def index(self, force: bool = False):
+    def index(self, force: bool = False, resume: bool = False):
         """Index or reindex the vault."""
-        return self.indexer.index_vault(force=force)
+        return self.indexer.index_vault(force=force, resume=resume)
 
     def get_stats(self):
         """Get index statistics."""
-        return self.indexer.get_stats()
+        return self._read_collection(lambda _: self.indexer.get_stats())
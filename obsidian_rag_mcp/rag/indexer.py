@@ -6,21 +6,43 @@ Optionally extracts reasoning conclusions at index time for enriched search.
 
 from __future__ import annotations
 
-import fnmatch
 import hashlib
-import json
 import logging
+import multiprocessing
 import os
+import threading
+from collections import deque
+from collections.abc import Iterable, Iterator, Mapping
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import AbstractContextManager, nullcontext
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, TypeVar
 
 import chromadb
+import numpy as np
 from chromadb.config import Settings
 
-from .chunker import Chunk, ChunkerConfig, MarkdownChunker
-from .embedder import EmbedderConfig, OpenAIEmbedder
+from obsidian_rag_mcp.utils.pipeline import prefetch
+
+from .chunker import (
+    Chunk,
+    ChunkerConfig,
+    MarkdownChunker,
+    count_chunk_tokens,
+    title_from_path,
+)
+from .embedder import (
+    EmbedderConfig,
+    EmbedderStats,
+    _LRUCache,
+    clean_text,
+    create_embedder,
+)
+from .embedding_cache import EmbeddingCache
+from .manifest import FileRecord, IndexManifest
+from .scanner import IgnoreMatcher, ScanResult, scan_markdown
 
 if TYPE_CHECKING:
     from obsidian_rag_mcp.reasoning import ConclusionExtractor, ConclusionStore
@@ -28,6 +50,8 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 @dataclass
 class IndexerConfig:
@@ -45,10 +69,84 @@ class IndexerConfig:
     reasoning_enabled: bool = False
     extractor_config: ExtractorConfig | None = None
 
-    # Behavior - use field with default_factory for mutable default
+    # Behavior - use field with default_factory for mutable default.
+    # Patterns use .gitignore semantics; see obsidian_rag_mcp.rag.scanner.
     ignore_patterns: list[str] | None = None
 
+    # Worker threads for the read/hash stage (None = auto). Reads are I/O-bound,
+    # so this can usefully exceed the core count on network filesystems.
+    jobs: int | None = None
+
+    # Worker processes for the chunking stage (0 = chunk on the pipeline's
+    # chunking thread). Chunking is CPU-bound, so large reindexes go faster
+    # with up to one worker per core; each worker costs a process start.
+    chunk_workers: int = 0
+
+    # Streaming pipeline: chunks per chunk->embed->store batch, and how many
+    # batches may wait between stages. Peak memory scales with their product.
+    pipeline_batch_size: int = 500
+    pipeline_queue_size: int = 2
+
+    # Chunks per pipeline batch when a force reindex bulk-loads a fresh
+    # collection (capped by ChromaDB's maximum batch size)
+    rebuild_batch_size: int = 5000
+
+    # Files (or chunk IDs) per bulk delete when clearing stale and changed files
+    delete_batch_size: int = 200
+
+    # Persistent cache of document embeddings (0 = disabled). Each entry is
+    # about 6 KB on disk for 1536-dimension embeddings, so the default takes
+    # up to about 300 MB; a cache smaller than the vault's chunk count can't
+    # save a force reindex from re-embedding.
+    embedding_cache_size: int = 50_000
+
+    # Recent embeddings kept in memory during a run, so chunks repeated across
+    # pipeline batches are embedded once even without the embedding cache
+    # (0 = only within a batch). Same per-entry size as the cache.
+    dedup_cache_size: int = 10_000
+
+    # Chunks the embeddings API rejects (e.g. filtered content) are isolated
+    # by bisecting the failing batch, recorded in the manifest and skipped,
+    # instead of failing the whole run
+    skip_failed_chunks: bool = True
+
+    # Incremental runs diff each changed file's chunks against the stored ones
+    # and only delete/add chunks whose content-derived ID changed. Force runs
+    # always replace every chunk.
+    chunk_diff: bool = True
+
     def __post_init__(self):
+        if self.jobs is not None and self.jobs < 1:
+            raise ValueError(f"jobs must be at least 1, got {self.jobs}")
+        if self.chunk_workers < 0:
+            raise ValueError(
+                f"chunk_workers must be non-negative, got {self.chunk_workers}"
+            )
+        if self.pipeline_batch_size < 1:
+            raise ValueError(
+                f"pipeline_batch_size must be at least 1, got {self.pipeline_batch_size}"
+            )
+        if self.pipeline_queue_size < 1:
+            raise ValueError(
+                f"pipeline_queue_size must be at least 1, got {self.pipeline_queue_size}"
+            )
+        if self.rebuild_batch_size < 1:
+            raise ValueError(
+                f"rebuild_batch_size must be at least 1, got {self.rebuild_batch_size}"
+            )
+        if self.delete_batch_size < 1:
+            raise ValueError(
+                f"delete_batch_size must be at least 1, got {self.delete_batch_size}"
+            )
+        if self.embedding_cache_size < 0:
+            raise ValueError(
+                "embedding_cache_size must be non-negative, "
+                f"got {self.embedding_cache_size}"
+            )
+        if self.dedup_cache_size < 0:
+            raise ValueError(
+                f"dedup_cache_size must be non-negative, got {self.dedup_cache_size}"
+            )
         if self.ignore_patterns is None:
             self.ignore_patterns = [
                 ".obsidian/*",
@@ -60,6 +158,101 @@ class IndexerConfig:
             ]
 
 
+def _batched(items: list[T], size: int) -> Iterator[list[T]]:
+    """Split a list into consecutive lists of at most ``size`` items."""
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+# Chunker of a chunking worker process (see VaultIndexer._chunk_pool)
+_worker_chunker: MarkdownChunker | None = None
+
+
+def _init_chunk_worker(config: ChunkerConfig) -> None:
+    global _worker_chunker
+    _worker_chunker = MarkdownChunker(config)
+
+
+# Per-file chunk record sent back by workers: title, tags and frontmatter
+# (shared by all of a file's chunks), then per chunk its content, index,
+# heading, start and end line, ID and token count
+_ChunkRecord = tuple[str | None, list[str], dict[str, Any], list[tuple[Any, ...]]]
+
+
+def _chunk_in_worker(item: tuple[str, str]) -> _ChunkRecord | None:
+    """Chunk one file in a worker process, counting tokens there too."""
+    assert _worker_chunker is not None, "worker started without _init_chunk_worker"
+    rel_path, content = item
+    chunks = _worker_chunker.chunk_document(content, rel_path)
+    if not chunks:
+        return None
+    count_chunk_tokens(chunks)
+    first = chunks[0]
+    return (
+        first.title,
+        first.tags,
+        first.frontmatter,
+        [
+            (
+                c.content,
+                c.chunk_index,
+                c.heading,
+                c.start_line,
+                c.end_line,
+                c.chunk_id,
+                c.token_estimate,
+            )
+            for c in chunks
+        ],
+    )
+
+
+def _unpack_chunks(rel_path: str, record: _ChunkRecord | None) -> list[Chunk]:
+    """Rebuild the chunks of a file from a worker's record."""
+    if record is None:
+        return []
+    title, tags, fm, rows = record
+    chunks = []
+    for content, index, heading, start_line, end_line, chunk_id, tokens in rows:
+        chunk = Chunk(
+            content=content,
+            source_path=rel_path,
+            chunk_index=index,
+            title=title,
+            heading=heading,
+            tags=tags,
+            frontmatter=fm,
+            start_line=start_line,
+            end_line=end_line,
+            chunk_id=chunk_id,
+        )
+        chunk._token_count = tokens
+        chunks.append(chunk)
+    return chunks
+
+
+@dataclass
+class _ChunkBatch:
+    """A batch of chunks flowing through the indexing pipeline.
+
+    ``completed`` lists the files whose last chunk is in this batch (or that
+    produced no chunks); their records are committed once it is stored.
+    """
+
+    chunks: list[Chunk]
+    completed: list[tuple[str, FileRecord]]
+
+
+@dataclass
+class _PipelineResult:
+    """Totals from one pass of the indexing pipeline."""
+
+    chunks: int = 0
+    conclusions: int = 0
+    skipped: int = 0  # Chunks the embeddings API rejected
+    deduplicated: int = 0  # Chunks that reused an embedding from earlier in the run
+
+
 @dataclass
 class IndexStats:
     """Statistics about the index."""
@@ -70,6 +263,10 @@ class IndexStats:
     vault_path: str
     total_conclusions: int = 0
     reasoning_enabled: bool = False
+    scan_seconds: float | None = None  # Set by indexing runs
+    skipped_chunks: int = 0  # Chunks that couldn't be embedded in this run
+    deduplicated_chunks: int = 0  # Embedding inputs saved in this run
+    embedder_stats: dict | None = None  # Set by get_stats
 
     def to_dict(self) -> dict:
         result = {
@@ -78,6 +275,14 @@ class IndexStats:
             "indexed_at": self.indexed_at.isoformat(),
             "vault_path": self.vault_path,
         }
+        if self.scan_seconds is not None:
+            result["scan_seconds"] = round(self.scan_seconds, 3)
+        if self.skipped_chunks:
+            result["skipped_chunks"] = self.skipped_chunks
+        if self.deduplicated_chunks:
+            result["deduplicated_chunks"] = self.deduplicated_chunks
+        if self.embedder_stats is not None:
+            result["embedder"] = self.embedder_stats
         if self.reasoning_enabled:
             result["total_conclusions"] = self.total_conclusions
             result["reasoning_enabled"] = True
@@ -90,10 +295,14 @@ class VaultIndexer:
 
     Features:
     - Scans vault for markdown files
+    - Reads and hashes files on a thread pool
+    - Streams chunk -> embed -> store through bounded queues
     - Chunks documents intelligently
-    - Creates embeddings via OpenAI
+    - Creates embeddings via OpenAI (or a local backend)
     - Stores in ChromaDB with metadata
-    - Supports incremental updates (by file hash)
+    - Supports incremental updates (by stat signature, then file hash)
+    - Reuses cached embeddings for unchanged chunk text
+    - Rewrites only the chunks that changed within an edited file
     """
 
     def __init__(self, config: IndexerConfig, api_key: str | None = None):
@@ -108,33 +317,42 @@ class VaultIndexer:
 
         logger.info(f"Initializing indexer for vault: {self.vault_path}")
 
+        persist_path = Path(config.persist_dir).resolve()
+        persist_path.mkdir(parents=True, exist_ok=True)
+
+        embedder_config = config.embedder_config or EmbedderConfig.from_env()
+
+        # Embeddings of unchanged chunk text are reused across edits and
+        # rebuilds (local embeddings are cheaper to recompute than look up)
+        self.embedding_cache: EmbeddingCache | None = None
+        if config.embedding_cache_size and embedder_config.backend == "openai":
+            self.embedding_cache = EmbeddingCache(
+                persist_path / EmbeddingCache.FILENAME,
+                max_entries=config.embedding_cache_size,
+            )
+
         # Initialize components
         self.chunker = MarkdownChunker(config.chunker_config)
-        self.embedder = OpenAIEmbedder(api_key=api_key, config=config.embedder_config)
+        self.embedder = create_embedder(
+            embedder_config, api_key=api_key, cache=self.embedding_cache
+        )
 
         # Initialize ChromaDB
-        persist_path = Path(config.persist_dir).resolve()
-        persist_path.mkdir(parents=True, exist_ok=True)
 
         self.chroma_client = chromadb.PersistentClient(
             path=str(persist_path), settings=Settings(anonymized_telemetry=False)
         )
 
         # Get or create collection
-        self.collection = self.chroma_client.get_or_create_collection(
-            name=config.collection_name, metadata={"hnsw:space": "cosine"}
-        )
+        self.collection = self._open_collection()
 
-        # Load file hashes for incremental indexing
-        self.hash_file = persist_path / "file_hashes.json"
-        self.file_hashes = self._load_hashes()
+        self.ignore_matcher = IgnoreMatcher(config.ignore_patterns or [])
 
-        # Load extraction cache (tracks which chunks have been processed)
-        self.extraction_cache_file = persist_path / "extraction_cache.json"
-        self.extraction_cache = self._load_extraction_cache()
+        # Serializes full runs and watcher-driven updates
+        self._index_lock = threading.Lock()
 
-        logger.debug(f"Loaded {len(self.file_hashes)} file hashes from cache")
-        logger.debug(f"Loaded {len(self.extraction_cache)} extraction cache entries")
+        # File records and extraction cache live in a lazily opened manifest
+        self.manifest = IndexManifest(persist_path)
 
         # Initialize reasoning layer if enabled
         self.conclusion_extractor: ConclusionExtractor | None = None
@@ -162,43 +380,75 @@ class VaultIndexer:
             chroma_client=self.chroma_client,
         )
 
-    def _load_hashes(self) -> dict[str, str]:
-        """Load previously computed file hashes."""
-        if self.hash_file.exists():
-            try:
-                with open(self.hash_file) as f:
-                    return json.load(f)
-            except (OSError, json.JSONDecodeError) as e:
-                logger.warning(f"Failed to load hash cache: {e}")
-                return {}
-        return {}
-
-    def _save_hashes(self):
-        """Save file hashes for incremental indexing."""
-        try:
-            with open(self.hash_file, "w") as f:
-                json.dump(self.file_hashes, f)
-        except OSError as e:
-            logger.warning(f"Failed to save hash cache: {e}")
-
-    def _load_extraction_cache(self) -> dict[str, bool]:
-        """Load extraction cache (tracks processed chunks)."""
-        if self.extraction_cache_file.exists():
-            try:
-                with open(self.extraction_cache_file) as f:
-                    return json.load(f)
-            except (OSError, json.JSONDecodeError) as e:
-                logger.warning(f"Failed to load extraction cache: {e}")
-                return {}
-        return {}
-
-    def _save_extraction_cache(self):
-        """Save extraction cache."""
-        try:
-            with open(self.extraction_cache_file, "w") as f:
-                json.dump(self.extraction_cache, f)
-        except OSError as e:
-            logger.warning(f"Failed to save extraction cache: {e}")
+    @property
+    def _build_collection_name(self) -> str:
+        """Collection a force reindex builds into before it's swapped in."""
+        return f"{self.config.collection_name}__build"
+
+    @property
+    def _retired_collection_name(self) -> str:
+        """Name the live collection is moved to while a rebuild is swapped in."""
+        return f"{self.config.collection_name}__old"
+
+    def _collection_names(self) -> set[str]:
+        return {collection.name for collection in self.chroma_client.list_collections()}
+
+    def _open_collection(self) -> chromadb.Collection:
+        """Get or create the live collection.
+
+        Between a swap's two renames there is no live collection, only the
+        retired one. It is opened as is: the swap may still be running in
+        another process, so finishing or undoing it is left to the next
+        indexing run (see ``_recover_swap``).
+        """
+        name = self.config.collection_name
+        retired_name = self._retired_collection_name
+        names = self._collection_names()
+        if name not in names and retired_name in names:
+            return self.chroma_client.get_collection(retired_name)
+        return self.chroma_client.get_or_create_collection(
+            name=name, metadata={"hnsw:space": "cosine"}
+        )
+
+    def _recover_swap(self) -> None:
+        """Finish or undo a swap that a crashed force reindex left half done.
+
+        The manifest marks a swap from before its first rename until the
+        file records are switched over. If the build was never renamed in,
+        the previous index is restored and ``--resume`` can finish the run;
+        otherwise the new index is already live and only the records are
+        switched.
+        """
+        name = self.config.collection_name
+        if self.manifest.swap_in_progress():
+            names = self._collection_names()
+            retired_name = self._retired_collection_name
+            if self._build_collection_name in names:
+                if retired_name in names:
+                    if name in names:
+                        self.chroma_client.delete_collection(name)
+                    self.chroma_client.get_collection(retired_name).modify(name=name)
+                self.manifest.end_swap()
+                logger.warning(
+                    "A force reindex was interrupted while swapping collections; "
+                    "restored the previous index. Run with --resume to finish it."
+                )
+            else:
+                self.manifest.end_force_run()
+                if retired_name in names:
+                    self.chroma_client.delete_collection(retired_name)
+                logger.warning(
+                    "A force reindex was interrupted while swapping collections; "
+                    "finished swapping in the rebuilt index."
+                )
+        if self.collection.name != name:
+            self.collection = self.chroma_client.get_or_create_collection(
+                name=name, metadata={"hnsw:space": "cosine"}
+            )
+
+    def reopen_collection(self) -> None:
+        """Look the live collection up again, e.g. after another process swapped it."""
+        self.collection = self.chroma_client.get_collection(self.config.collection_name)
 
     def _compute_hash(self, content: str) -> str:
         """Compute hash of file content.
@@ -208,100 +458,122 @@ class VaultIndexer:
         """
         return hashlib.sha256(content.encode()).hexdigest()[:32]
 
+    @property
+    def jobs(self) -> int:
+        """Number of worker threads used for reading and hashing files."""
+        if self.config.jobs is not None:
+            return self.config.jobs
+        # Same heuristic as ThreadPoolExecutor's default for I/O-bound work
+        return min(32, (os.cpu_count() or 1) + 4)
+
+    def _check_file(
+        self,
+        file_path: Path,
+        previous: FileRecord | None = None,
+        force: bool = False,
+    ) -> tuple[str, str | None, FileRecord] | None:
+        """Stat a file and read and hash it if its signature changed.
+
+        Runs on worker threads; returns None if the file can't be read.
+
+        Args:
+            file_path: Absolute path of the file
+            previous: Record stored for this file by the last run, if any
+            force: If True, always read the file
+
+        Returns:
+            Tuple of (relative path, content, record). Content is None when
+            the stat signature matches the stored record and the read was skipped.
+        """
+        rel_path = str(file_path.relative_to(self.vault_path))
+        try:
+            # Stat before reading so a concurrent edit shows up as a stat change
+            st = file_path.stat()
+            if not force and previous is not None and previous.matches_stat(st):
+                return rel_path, None, previous
+            content = file_path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError) as e:
+            logger.warning(f"Failed to read {rel_path}: {e}")
+            return None
+        return rel_path, content, FileRecord.from_stat(st, self._compute_hash(content))
+
     def _should_ignore(self, path: Path) -> bool:
-        """Check if a file should be ignored using glob pattern matching."""
-        rel_path = str(path.relative_to(self.vault_path))
-
-        if self.config.ignore_patterns is None:
-            return False
-
-        for pattern in self.config.ignore_patterns:
-            # Use fnmatch for glob-style pattern matching
-            if fnmatch.fnmatch(rel_path, pattern):
-                return True
-            # Also check each path component for directory patterns
-            parts = rel_path.split(os.sep)
-            for i, part in enumerate(parts):
-                # Check if any directory in path matches a directory pattern
-                partial_path = os.sep.join(parts[: i + 1])
-                if fnmatch.fnmatch(partial_path, pattern.rstrip("/*")):
-                    return True
-                if fnmatch.fnmatch(part, pattern.rstrip("/*")):
-                    return True
-
-        return False
+        """Check if a file should be ignored, including via its parent directories."""
+        return self.ignore_matcher.ignores(str(path.relative_to(self.vault_path)))
+
+    def _scan(self) -> ScanResult:
+        """Walk the vault for markdown files, pruning ignored directories."""
+        result = scan_markdown(self.vault_path, self.ignore_matcher)
+        logger.debug(
+            f"Scanned {len(result.files)} files in {result.seconds:.3f}s "
+            f"({result.dirs_visited} directories visited, "
+            f"{result.dirs_pruned} pruned)"
+        )
+        return result
 
     def scan_vault(self) -> list[Path]:
         """Scan vault for markdown files, skipping symlinks for security."""
-        md_files = []
-
-        for path in self.vault_path.rglob("*.md"):
-            # Skip symlinks to prevent reading files outside the vault
-            if path.is_symlink():
-                logger.debug(f"Skipping symlink: {path}")
-                continue
-            if not self._should_ignore(path):
-                md_files.append(path)
-
-        return sorted(md_files)
+        return self._scan().files
 
-    def index_vault(self, force: bool = False) -> IndexStats:
+    def index_vault(self, force: bool = False, resume: bool = False) -> IndexStats:
         """
         Index the entire vault.
 
+        Changed files flow through a streaming pipeline: a chunking thread
+        feeds batches of chunks to an embedding thread, which feeds the
+        ChromaDB writer on the calling thread. Bounded queues between the
+        stages keep peak memory proportional to the batch size rather than
+        the vault size.
+
+        Each file's record is committed to the manifest only once all of its
+        chunks are stored, so an interrupted run loses at most the batches in
+        flight and the next run picks up the remaining files.
+
+        A force reindex bulk-loads a fresh collection in large batches and
+        swaps it in when it's complete, so searches keep using the old
+        index until then.
+
         Args:
             force: If True, reindex all files regardless of hash
+            resume: If True, continue an interrupted force reindex, skipping
+                files it already finished (incremental runs always resume)
 
         Returns:
             IndexStats with indexing results
         """
-        files = self.scan_vault()
-        files_indexed = 0
+        with self._index_lock:
+            self._recover_swap()
+            scan = self._scan()
+            files = scan.files
 
-        all_chunks: list[Chunk] = []
-        files_to_index: list[tuple[Path, str]] = []
+            logger.info(
+                f"Scanning {len(files)} files (found in {scan.seconds:.2f}s)..."
+            )
 
-        logger.info(f"Scanning {len(files)} files...")
+            started_at = self.manifest.force_run_started_at() if resume else None
+            if resume and not started_at:
+                logger.info("No interrupted force reindex to resume.")
 
-        # Clean up stale documents (files deleted from vault but still in index)
-        current_paths = {str(f.relative_to(self.vault_path)) for f in files}
-        stale_paths = set(self.file_hashes.keys()) - current_paths
-        if stale_paths:
-            logger.info(f"Removing {len(stale_paths)} stale documents from index...")
-            for stale_path in stale_paths:
-                try:
-                    self.collection.delete(where={"source_path": stale_path})
-                    # Also remove stale conclusions if reasoning is enabled
-                    if self.conclusion_store:
-                        self.conclusion_store.delete_by_source(stale_path)
-                    del self.file_hashes[stale_path]
-                    logger.debug(f"Removed stale: {stale_path}")
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to remove stale document {stale_path}: {e}. "
-                        "Index may be inconsistent - consider reindexing with --force."
-                    )
-
-        # First pass: determine what needs indexing
-        for file_path in files:
-            rel_path = str(file_path.relative_to(self.vault_path))
-            try:
-                content = file_path.read_text(encoding="utf-8")
-            except (OSError, UnicodeDecodeError) as e:
-                logger.warning(f"Failed to read {rel_path}: {e}")
-                continue
+            if force or started_at:
+                files_to_index, result = self._rebuild(files, resume=bool(started_at))
+            else:
+                # One bulk load of the manifest instead of a query per file
+                file_records = self.manifest.file_records()
 
-            content_hash = self._compute_hash(content)
+                # Files deleted from the vault but still in the index
+                rel_paths = [str(f.relative_to(self.vault_path)) for f in files]
+                stale_paths = set(file_records) - set(rel_paths)
 
-            if force or self.file_hashes.get(rel_path) != content_hash:
-                files_to_index.append((file_path, content))
-                self.file_hashes[rel_path] = content_hash
+                changed = self._sync_changes(
+                    list(zip(files, rel_paths, strict=True)), file_records, stale_paths
+                )
+                files_to_index = [f for f in files if f in changed]
+                result = self._run_pipeline(files_to_index)
 
-        if not files_to_index:
-            logger.info("No files need indexing.")
-            total_conclusions = 0
-            if self.conclusion_store:
+            total_conclusions = result.conclusions
+            if not files_to_index and self.conclusion_store:
                 total_conclusions = self.conclusion_store.count()
+
             return IndexStats(
                 total_files=len(files),
                 total_chunks=self.collection.count(),
@@ -309,115 +581,821 @@ class VaultIndexer:
                 vault_path=str(self.vault_path),
                 total_conclusions=total_conclusions,
                 reasoning_enabled=self.config.reasoning_enabled,
+                scan_seconds=scan.seconds,
+                skipped_chunks=result.skipped,
+                deduplicated_chunks=result.deduplicated,
             )
 
-        logger.info(f"Indexing {len(files_to_index)} files...")
+    def index_paths(self, paths: Iterable[str | Path]) -> IndexStats:
+        """
+        Incrementally reindex specific paths without scanning the vault.
 
-        # Second pass: chunk all files
-        for file_path, content in files_to_index:
-            rel_path = str(file_path.relative_to(self.vault_path))
+        Intended for filesystem watchers. Each path may be a markdown file or
+        a directory, absolute or relative to the vault. Existing files go
+        through the same checks as ``index_vault`` (stat, hash, move
+        detection); paths that no longer exist, or are now ignored, are
+        removed from the index. Paths outside the vault are skipped.
 
-            # Remove old chunks for this file
-            try:
-                self.collection.delete(where={"source_path": rel_path})
-            except ValueError:
-                # Collection might be empty or have no matching documents
-                pass
-            except Exception as e:
-                # Log at WARNING - deletion failures may indicate index inconsistency
-                logger.warning(
-                    f"Failed to delete old chunks for {rel_path}: {e}. "
-                    "Index may be inconsistent - consider reindexing with --force."
-                )
+        Args:
+            paths: Paths reported as created, modified, moved or deleted
 
-            # Remove old conclusions if reasoning is enabled
-            if self.conclusion_store:
+        Returns:
+            IndexStats for the whole index (``total_files`` is the number of
+            indexed files recorded in the manifest)
+        """
+        with self._index_lock:
+            self._recover_swap()
+            present: dict[str, Path] = {}
+            gone: set[str] = set()
+
+            for raw in paths:
+                path = Path(raw)
+                if not path.is_absolute():
+                    path = self.vault_path / path
                 try:
-                    self.conclusion_store.delete_by_source(rel_path)
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to delete old conclusions for {rel_path}: {e}. "
-                        "Index may be inconsistent - consider reindexing with --force."
-                    )
-
-            # Chunk the document
-            chunks = self.chunker.chunk_document(content, rel_path)
-            all_chunks.extend(chunks)
-            files_indexed += 1
-
-        if not all_chunks:
-            logger.info("No chunks generated.")
+                    rel_path = str(path.relative_to(self.vault_path))
+                except ValueError:
+                    logger.debug(f"Skipping path outside the vault: {path}")
+                    continue
+                if rel_path == ".":
+                    continue
+
+                if path.is_symlink():
+                    gone.add(rel_path)
+                elif path.is_dir():
+                    if self.ignore_matcher.ignores(rel_path, is_dir=True):
+                        gone.update(self.manifest.paths_under(rel_path))
+                        continue
+                    # A directory appeared or was moved in: index its files
+                    scan = scan_markdown(self.vault_path, self.ignore_matcher, rel_path)
+                    for file_path in scan.files:
+                        present[str(file_path.relative_to(self.vault_path))] = file_path
+                    # Anything recorded under it that's no longer there
+                    gone.update(self.manifest.paths_under(rel_path))
+                elif path.is_file():
+                    if rel_path.endswith(".md") and not self._should_ignore(path):
+                        present[rel_path] = path
+                    else:
+                        gone.add(rel_path)
+                else:
+                    # Deleted: a file, or a directory and everything below it
+                    gone.add(rel_path)
+                    gone.update(self.manifest.paths_under(rel_path))
+
+            gone -= present.keys()
+            file_records: dict[str, FileRecord] = {}
+            for rel_path in sorted(present.keys() | gone):
+                record = self.manifest.get_file(rel_path)
+                if record is not None:
+                    file_records[rel_path] = record
+            stale_paths = gone & file_records.keys()
+
+            to_check = sorted((path, rel) for rel, path in present.items())
+            changed = self._sync_changes(to_check, file_records, stale_paths)
+            files_to_index = [path for path, _ in to_check if path in changed]
+
+            result = self._run_pipeline(files_to_index)
+
+            total_conclusions = result.conclusions
+            if not files_to_index and self.conclusion_store:
+                total_conclusions = self.conclusion_store.count()
+
             return IndexStats(
-                total_files=len(files),
-                total_chunks=0,
+                total_files=self.manifest.file_count(),
+                total_chunks=self.collection.count(),
                 indexed_at=datetime.now(),
                 vault_path=str(self.vault_path),
-                total_conclusions=0,
+                total_conclusions=total_conclusions,
                 reasoning_enabled=self.config.reasoning_enabled,
+                skipped_chunks=result.skipped,
+                deduplicated_chunks=result.deduplicated,
             )
 
-        logger.info(f"Embedding {len(all_chunks)} chunks...")
-
-        # Third pass: embed all chunks
-        texts = [chunk.content for chunk in all_chunks]
-        embeddings = self.embedder.embed_texts(texts, is_query=False)
-
-        # Fourth pass: store in ChromaDB
-        ids = []
-        documents = []
-        metadatas = []
-
-        for chunk in all_chunks:
-            chunk_id = f"{chunk.source_path}:{chunk.chunk_index}"
-            ids.append(chunk_id)
-            documents.append(chunk.content)
-            metadatas.append(
-                {
-                    "source_path": chunk.source_path,
-                    "chunk_index": chunk.chunk_index,
-                    "title": chunk.title or "",
-                    "heading": chunk.heading or "",
-                    "tags": ",".join(chunk.tags),
-                    "token_estimate": chunk.token_estimate,
-                }
+    def _sync_changes(
+        self,
+        to_check: list[tuple[Path, str]],
+        file_records: dict[str, FileRecord],
+        stale_paths: set[str],
+    ) -> set[Path]:
+        """
+        Find changed files, apply detected moves and remove stale files.
+
+        Content is not kept here; the chunking stage re-reads each changed
+        file when it gets to it. Stale cleanup waits until new files are
+        hashed, in case some of them were just moved.
+
+        Args:
+            to_check: (file, relative path) pairs to stat and maybe hash
+            file_records: Stored records for (at least) these files and the
+                stale paths
+            stale_paths: Indexed paths that no longer exist; updated in place
+
+        Returns:
+            Files whose content changed and need (re)indexing
+        """
+        changed: set[Path] = set()
+        # Files not in the manifest yet: rename candidates for stale paths
+        new_files: dict[str, tuple[Path, FileRecord]] = {}
+        refreshed: dict[str, FileRecord] = {}
+        # Stat (and read/hash only when the stat changed) in parallel
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            results = pool.map(
+                lambda item: self._check_file(
+                    item[0], previous=file_records.get(item[1])
+                ),
+                to_check,
             )
+            for (file_path, _), result in zip(to_check, results, strict=True):
+                if result is None:
+                    continue
+                rel_path, content, record = result
+                if content is None:
+                    continue  # Stat signature unchanged
+
+                previous = file_records.get(rel_path)
+                if previous is None:
+                    new_files[rel_path] = (file_path, record)
+                if previous is None or previous.content_hash != record.content_hash:
+                    changed.add(file_path)
+                else:
+                    # Only the stat changed; refresh the signature so the
+                    # next run can skip reading the file again
+                    refreshed[rel_path] = record
+        self.manifest.set_files(refreshed.items())
+
+        if stale_paths and new_files:
+            for stale_path, file_path in self._move_renamed_files(
+                stale_paths, new_files, file_records
+            ):
+                stale_paths.discard(stale_path)
+                # With chunk diffs, the moved file still goes through the
+                # pipeline, which re-embeds nothing. Without them it would be
+                # re-embedded, so the move alone updates its metadata.
+                if not self.config.chunk_diff:
+                    changed.discard(file_path)
+
+        if stale_paths:
+            logger.info(f"Removing {len(stale_paths)} stale documents from index...")
+            # Failed batches keep their manifest records and are retried next run
+            removed = self._delete_sources(sorted(stale_paths))
+            self.manifest.delete_files(removed)
+            self.manifest.clear_skipped(removed)
+
+        return changed
+
+    def _rebuild(
+        self, files: list[Path], resume: bool = False
+    ) -> tuple[list[Path], _PipelineResult]:
+        """
+        Force reindex: bulk-load every file into a fresh collection, then swap.
+
+        The build collection is never read from, so there is nothing to
+        delete or diff while loading it. File records for the build are
+        kept apart from the live ones until the swap.
 
-        # Batch insert
-        batch_size = 500
-        for i in range(0, len(ids), batch_size):
-            end = min(i + batch_size, len(ids))
-            self.collection.add(
-                ids=ids[i:end],
-                embeddings=embeddings[i:end],
-                documents=documents[i:end],
-                metadatas=metadatas[i:end],
+        Args:
+            files: All files in the vault
+            resume: Continue the build left by an interrupted run, redoing
+                only files that changed (or disappeared) since it stored them
+
+        Returns:
+            (files indexed, pipeline totals)
+        """
+        build_name = self._build_collection_name
+        built: dict[str, FileRecord] = {}
+        if resume and build_name in self._collection_names():
+            build = self.chroma_client.get_collection(build_name)
+            built = self.manifest.force_run_records()
+            logger.info(
+                f"Resuming force reindex started at "
+                f"{self.manifest.force_run_started_at()} "
+                f"({len(built)} files already done)"
+            )
+        else:
+            if resume:
+                logger.info("Interrupted force reindex left no build; starting over.")
+            self.manifest.begin_force_run()
+            if build_name in self._collection_names():
+                self.chroma_client.delete_collection(build_name)
+            build = self.chroma_client.create_collection(
+                name=build_name, metadata={"hnsw:space": "cosine"}
             )
-            logger.debug(f"Stored batch {i // batch_size + 1}")
 
-        # Save hashes
-        self._save_hashes()
+        rel_paths = [str(f.relative_to(self.vault_path)) for f in files]
+        outdated = set(built) - set(rel_paths)
+        done = [
+            (f, rel) for f, rel in zip(files, rel_paths, strict=True) if rel in built
+        ]
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            results = pool.map(
+                lambda item: self._check_file(item[0], previous=built[item[1]]), done
+            )
+            for (_, rel_path), checked in zip(done, results, strict=True):
+                if checked is None or (
+                    checked[1] is not None
+                    and checked[2].content_hash != built[rel_path].content_hash
+                ):
+                    outdated.add(rel_path)
+        if outdated:
+            logger.info(f"Redoing {len(outdated)} files changed since they were built")
+            for batch in _batched(sorted(outdated), self.config.delete_batch_size):
+                build.delete(where=self._source_filter(batch))
+            self.manifest.delete_files(outdated, force_run=True)
+
+        files_to_index = [
+            f
+            for f, rel in zip(files, rel_paths, strict=True)
+            if rel not in built or rel in outdated
+        ]
+        result = self._run_pipeline(files_to_index, build=build)
+        self._swap_in(build)
+        return files_to_index, result
+
+    def _swap_in(self, build: chromadb.Collection) -> None:
+        """
+        Replace the live collection with a finished build.
 
-        total_chunks = self.collection.count()
+        The live collection is renamed out of the way, the build renamed into
+        its place and the file records switched over, then the old collection
+        is dropped. ``self.collection`` changes in a single assignment, so
+        searches in this process see either index in full. Conclusions of
+        chunks that didn't survive the rebuild are removed.
+        """
+        name = self.config.collection_name
+        retired_name = self._retired_collection_name
+        if retired_name in self._collection_names():
+            self.chroma_client.delete_collection(retired_name)
 
-        # Fifth pass: extract conclusions if reasoning is enabled
-        total_conclusions = 0
-        if self.conclusion_extractor and self.conclusion_store:
-            total_conclusions = self._extract_conclusions(all_chunks)
+        if self.conclusion_store:
+            old_ids = set(self.collection.get(include=[])["ids"])
+            removed = sorted(old_ids - set(build.get(include=[])["ids"]))
+            try:
+                for batch in _batched(removed, self.config.delete_batch_size):
+                    self.conclusion_store.delete_by_source_chunks(batch)
+            except Exception as e:
+                logger.warning(
+                    f"Failed to delete old conclusions: {e}. "
+                    "Index may be inconsistent - consider reindexing with --force."
+                )
 
-        logger.info(
-            f"Indexed {files_indexed} files, {len(all_chunks)} chunks. Total: {total_chunks}."
+        # Until the records are switched over, the next run can tell the
+        # swap was interrupted and finish or undo it
+        self.manifest.begin_swap()
+        self.collection.modify(name=retired_name)
+        build.modify(name=name)
+        self.collection = build
+        self.manifest.end_force_run()
+        self.chroma_client.delete_collection(retired_name)
+        logger.info("Swapped in the rebuilt index.")
+
+    def _run_pipeline(
+        self, files_to_index: list[Path], build: chromadb.Collection | None = None
+    ) -> _PipelineResult:
+        """
+        Chunk, embed and store files through the streaming pipeline.
+
+        A chunking thread feeds batches of chunks to an embedding thread,
+        which feeds the ChromaDB writer on the calling thread.
+
+        Args:
+            files_to_index: Files to (re)index
+            build: Fresh collection to bulk-load instead of updating the live
+                one (force reindex)
+
+        Chunks the embeddings API rejects are recorded in the manifest and
+        left out (with ``skip_failed_chunks``); their files still count as
+        indexed, so they aren't retried until they change. A file whose
+        chunks were all rejected isn't recorded, so the next run retries it.
+        """
+        if not files_to_index:
+            logger.info("No files need indexing.")
+            return _PipelineResult()
+
+        logger.info(f"Indexing {len(files_to_index)} files...")
+
+        if build is None:
+            collection = self.collection
+            batches = self._iter_chunk_batches(
+                files_to_index, diff=self.config.chunk_diff
+            )
+        else:
+            collection = build
+            batch_size = min(
+                self.config.rebuild_batch_size, self.chroma_client.get_max_batch_size()
+            )
+            batches = self._iter_chunk_batches(files_to_index, batch_size, clear=False)
+
+        queue_size = self.config.pipeline_queue_size
+        chunk_batches = prefetch(batches, maxsize=queue_size, name="chunk")
+        recent = (
+            _LRUCache(self.config.dedup_cache_size)
+            if self.config.dedup_cache_size
+            else None
+        )
+        embedded_batches = prefetch(
+            (
+                (batch, self._embed_chunks(batch.chunks, recent))
+                for batch in chunk_batches
+            ),
+            maxsize=queue_size,
+            name="embed",
         )
-        if total_conclusions:
-            logger.info(f"Extracted {total_conclusions} conclusions.")
 
-        return IndexStats(
-            total_files=len(files),
-            total_chunks=total_chunks,
-            indexed_at=datetime.now(),
-            vault_path=str(self.vault_path),
-            total_conclusions=total_conclusions,
-            reasoning_enabled=self.config.reasoning_enabled,
+        result = _PipelineResult()
+        # Files with rejected chunks, and files with stored chunks, among
+        # those not committed yet
+        rejected: set[str] = set()
+        stored: set[str] = set()
+        unrecorded = 0
+        for batch_num, (batch, (embeddings, errors, deduplicated)) in enumerate(
+            embedded_batches, start=1
+        ):
+            chunks = batch.chunks
+            result.deduplicated += deduplicated
+            if errors:
+                self.manifest.add_skipped(
+                    (chunks[i].chunk_id, chunks[i].source_path, reason)
+                    for i, reason in errors.items()
+                )
+                result.skipped += len(errors)
+                rejected.update(chunks[i].source_path for i in errors)
+                chunks = [c for i, c in enumerate(chunks) if i not in errors]
+                embeddings = np.delete(embeddings, list(errors), axis=0)
+            stored.update(c.source_path for c in chunks)
+
+            if chunks:
+                self._store_chunks(chunks, embeddings, collection)
+                result.chunks += len(chunks)
+                logger.debug(
+                    f"Stored batch {batch_num} ({result.chunks} chunks so far)"
+                )
+
+                # Extract conclusions if reasoning is enabled
+                if self.conclusion_extractor and self.conclusion_store:
+                    result.conclusions += self._extract_conclusions(chunks)
+
+            # Checkpoint: these files are now fully stored
+            completed = [
+                (path, record)
+                for path, record in batch.completed
+                if path not in rejected or path in stored
+            ]
+            unrecorded += len(batch.completed) - len(completed)
+            for path, _ in batch.completed:
+                rejected.discard(path)
+                stored.discard(path)
+            self.manifest.set_files(completed, force_run=build is not None)
+
+        if not result.chunks:
+            logger.info("No chunks generated.")
+
+        logger.info(f"Indexed {len(files_to_index)} files, {result.chunks} chunks.")
+        if result.deduplicated:
+            logger.info(
+                f"Reused embeddings for {result.deduplicated} duplicate chunks."
+            )
+        if result.skipped:
+            logger.warning(
+                f"Skipped {result.skipped} chunks the embeddings API rejected; "
+                "list them with `obsidian-rag stats --skipped`."
+            )
+        if unrecorded:
+            logger.warning(
+                f"Every chunk of {unrecorded} files was rejected; "
+                "they will be retried on the next run."
+            )
+        if result.conclusions:
+            logger.info(f"Extracted {result.conclusions} conclusions.")
+
+        return result
+
+    def _move_renamed_files(
+        self,
+        stale_paths: set[str],
+        new_files: dict[str, tuple[Path, FileRecord]],
+        file_records: dict[str, FileRecord],
+    ) -> list[tuple[str, Path]]:
+        """
+        Detect moved files and move their chunks and conclusions.
+
+        A stale path and a new path with the same content hash are treated as
+        a move. Each stale path matches at most one new path.
+
+        Returns:
+            (old path, new file) pairs that were moved
+        """
+        stale_by_hash: dict[str, list[str]] = {}
+        for stale_path in sorted(stale_paths):
+            content_hash = file_records[stale_path].content_hash
+            stale_by_hash.setdefault(content_hash, []).append(stale_path)
+
+        moved = []
+        for new_path, (file_path, record) in new_files.items():
+            candidates = stale_by_hash.get(record.content_hash)
+            if not candidates:
+                continue
+            old_path = candidates.pop(0)
+            try:
+                self._move_file_chunks(old_path, new_path)
+            except Exception as e:
+                logger.warning(
+                    f"Failed to move {old_path} to {new_path}: {e}. "
+                    "Reindexing it instead."
+                )
+                continue
+            self.manifest.rename_file(old_path, new_path, record)
+            moved.append((old_path, file_path))
+            logger.debug(f"Moved: {old_path} -> {new_path}")
+
+        if moved:
+            logger.info(f"Detected {len(moved)} moved files, kept their embeddings.")
+        return moved
+
+    def _move_file_chunks(self, old_path: str, new_path: str) -> None:
+        """Re-key a file's chunks (and conclusions) to a new path without re-embedding.
+
+        A title taken from the old file name is renamed along with the file.
+        The new chunks are written before the old ones are deleted, so an
+        interruption leaves duplicates that the next run cleans up rather than
+        losing the file's chunks.
+        """
+        stored = self.collection.get(
+            where={"source_path": old_path},
+            include=["embeddings", "documents", "metadatas"],
+        )
+        # Chunk IDs start with the source path
+        chunk_ids = {
+            chunk_id: new_path + chunk_id[len(old_path) :] for chunk_id in stored["ids"]
+        }
+
+        if stored["ids"]:
+            self.collection.upsert(
+                ids=list(chunk_ids.values()),
+                embeddings=stored["embeddings"],
+                documents=stored["documents"],
+                metadatas=[
+                    self._moved_metadata(metadata, old_path, new_path)
+                    for metadata in stored["metadatas"]
+                ],
+            )
+            self.collection.delete(ids=stored["ids"])
+
+        if self.conclusion_store:
+            self.conclusion_store.move_source(old_path, new_path, chunk_ids)
+
+    @staticmethod
+    def _moved_metadata(
+        metadata: Mapping[str, Any], old_path: str, new_path: str
+    ) -> dict[str, Any]:
+        """A moved chunk's metadata, with its path-derived fields updated."""
+        moved = {**metadata, "source_path": new_path}
+        if metadata.get("title") == title_from_path(old_path):
+            moved["title"] = title_from_path(new_path)
+        return moved
+
+    def _iter_chunk_batches(
+        self,
+        files: list[Path],
+        batch_size: int | None = None,
+        diff: bool = False,
+        clear: bool = True,
+    ) -> Iterator[_ChunkBatch]:
+        """
+        Chunking stage: read, clear and chunk each file, yielding chunk batches.
+
+        Batches may span several files. A file's manifest record is dropped
+        before its old chunks are deleted and only re-added (via the batch's
+        ``completed`` list) once its new chunks are stored, so a crash in
+        between leaves it marked for reindexing rather than silently missing.
+
+        With ``diff``, only chunks not already stored for the file are
+        yielded; see ``_diff_chunks``. Without ``clear``, nothing is deleted
+        (the chunks go to a fresh collection).
+        """
+        batch_size = batch_size or self.config.pipeline_batch_size
+        chunks: list[Chunk] = []
+        # Files whose chunks are all in ``chunks`` (not yet yielded)
+        pending: list[tuple[str, FileRecord]] = []
+
+        # Old chunks are cleared a group of files at a time, in bulk
+        with self._chunk_pool(len(files)) as pool:
+            for group in self._chunk_groups(files, pool):
+                for rel_path, record, file_chunks in self._clear_replaced(
+                    group, diff, clear
+                ):
+                    chunks.extend(file_chunks)
+                    pending.append((rel_path, record))
+
+                    while len(chunks) >= batch_size:
+                        out, chunks = chunks[:batch_size], chunks[batch_size:]
+                        # Any leftover chunks belong to the file just added
+                        if chunks:
+                            completed, pending = pending[:-1], pending[-1:]
+                        else:
+                            completed, pending = pending, []
+                        # Token counts for metadata, off the writer thread
+                        count_chunk_tokens(out)
+                        yield _ChunkBatch(out, completed)
+
+        if chunks or pending:
+            count_chunk_tokens(chunks)
+            yield _ChunkBatch(chunks, pending)
+
+    def _chunk_pool(self, num_files: int) -> AbstractContextManager[Executor | None]:
+        """Process pool for the chunking stage, or None to chunk in-process.
+
+        Runs of a single group of files (such as watcher updates) aren't
+        worth starting worker processes for.
+        """
+        if not self.config.chunk_workers or num_files <= self.config.delete_batch_size:
+            return nullcontext()
+        return ProcessPoolExecutor(
+            max_workers=self.config.chunk_workers,
+            # Forking would copy the pipeline's threads and their locks
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_chunk_worker,
+            initargs=(self.chunker.config,),
+        )
+
+    def _chunk_groups(
+        self, files: list[Path], pool: Executor | None
+    ) -> Iterator[list[tuple[str, FileRecord, list[Chunk]]]]:
+        """
+        Read and chunk files a group at a time.
+
+        With a pool, each group is chunked by the workers while the previous
+        one is cleared and passed downstream.
+
+        Yields:
+            (relative path, record, chunks) for each readable file in a group
+        """
+        groups = (
+            self._read_files(group)
+            for group in _batched(files, self.config.delete_batch_size)
         )
+        if pool is None:
+            for loaded in groups:
+                yield [
+                    (rel_path, record, self.chunker.chunk_document(content, rel_path))
+                    for rel_path, content, record in loaded
+                ]
+            return
+
+        in_flight: deque = deque()
+        for loaded in groups:
+            items = [(rel_path, content) for rel_path, content, _ in loaded]
+            chunksize = max(1, len(items) // (4 * self.config.chunk_workers))
+            in_flight.append(
+                (loaded, pool.map(_chunk_in_worker, items, chunksize=chunksize))
+            )
+            if len(in_flight) > 1:
+                yield self._unpack_group(*in_flight.popleft())
+        while in_flight:
+            yield self._unpack_group(*in_flight.popleft())
+
+    def _unpack_group(
+        self, loaded: list[tuple[str, str, FileRecord]], records: Iterator
+    ) -> list[tuple[str, FileRecord, list[Chunk]]]:
+        return [
+            (rel_path, record, _unpack_chunks(rel_path, chunk_record))
+            for (rel_path, _, record), chunk_record in zip(loaded, records, strict=True)
+        ]
+
+    def _read_files(self, files: list[Path]) -> list[tuple[str, str, FileRecord]]:
+        """Read and hash files, skipping unreadable ones."""
+        loaded = []
+        for file_path in files:
+            result = self._check_file(file_path, force=True)
+            if result is not None:
+                loaded.append(result)
+        return loaded
+
+    def _clear_replaced(
+        self,
+        prepared: list[tuple[str, FileRecord, list[Chunk]]],
+        diff: bool,
+        clear: bool = True,
+    ) -> list[tuple[str, FileRecord, list[Chunk]]]:
+        """
+        Clear what a group of chunked files replaces, in bulk.
+
+        Returns:
+            (relative path, record, chunks to embed) for each file
+        """
+        if not prepared:
+            return []
+
+        if not clear:
+            # The live index's skipped chunks are replaced at the swap
+            return prepared
+
+        rel_paths = [rel_path for rel_path, _, _ in prepared]
+        # Earlier failures are retried along with the rest of the file
+        self.manifest.clear_skipped(rel_paths)
+        self.manifest.delete_files(rel_paths)
+        if diff:
+            return self._diff_chunks(prepared)
+        self._delete_sources(rel_paths)
+        return prepared
+
+    def _source_filter(self, paths: list[str]) -> dict:
+        """ChromaDB filter matching chunks from any of the given files."""
+        return {"source_path": {"$in": paths}}
+
+    def _delete_sources(self, paths: list[str]) -> list[str]:
+        """
+        Delete all chunks (and conclusions) of the given files.
+
+        Uses one ``$in`` delete per ``delete_batch_size`` paths instead of one
+        per file.
+
+        Returns:
+            Paths whose deletion succeeded
+        """
+        deleted = []
+        for batch in _batched(paths, self.config.delete_batch_size):
+            try:
+                self.collection.delete(where=self._source_filter(batch))
+                # Also remove conclusions if reasoning is enabled
+                if self.conclusion_store:
+                    self.conclusion_store.delete_by_sources(batch)
+            except Exception as e:
+                # Log at WARNING - deletion failures may indicate index inconsistency
+                logger.warning(
+                    f"Failed to delete chunks for {len(batch)} files "
+                    f"(starting with {batch[0]}): {e}. "
+                    "Index may be inconsistent - consider reindexing with --force."
+                )
+                continue
+            deleted.extend(batch)
+        return deleted
+
+    def _diff_chunks(
+        self, prepared: list[tuple[str, FileRecord, list[Chunk]]]
+    ) -> list[tuple[str, FileRecord, list[Chunk]]]:
+        """
+        Reconcile stored chunks with new chunks by chunk ID for a group of files.
+
+        Stored chunks that no longer exist are deleted (with their
+        conclusions), kept chunks get a metadata-only update when e.g. their
+        position changed, and only new chunks are returned for embedding.
+        Falls back to replacing every chunk if the stored ones can't be read.
+        """
+        rel_paths = [rel_path for rel_path, _, _ in prepared]
+        try:
+            existing = self.collection.get(
+                where=self._source_filter(rel_paths), include=["metadatas"]
+            )
+        except Exception as e:
+            logger.warning(
+                f"Failed to read stored chunks: {e}. "
+                f"Replacing all chunks of {len(rel_paths)} files."
+            )
+            self._delete_sources(rel_paths)
+            return prepared
+
+        stored: dict[str, dict[str, dict]] = {}
+        for chunk_id, metadata in zip(
+            existing["ids"], existing["metadatas"], strict=True
+        ):
+            stored.setdefault(metadata["source_path"], {})[chunk_id] = metadata
+
+        result = []
+        removed: list[str] = []
+        updated: dict[str, dict] = {}
+        for rel_path, record, chunks in prepared:
+            file_stored = stored.get(rel_path, {})
+            new_ids = {chunk.chunk_id for chunk in chunks}
+            file_removed = [cid for cid in file_stored if cid not in new_ids]
+            added = [chunk for chunk in chunks if chunk.chunk_id not in file_stored]
+            file_updated = 0
+            for chunk in chunks:
+                if chunk.chunk_id in file_stored:
+                    metadata = self._chunk_metadata(chunk)
+                    if file_stored[chunk.chunk_id] != metadata:
+                        updated[chunk.chunk_id] = metadata
+                        file_updated += 1
+
+            logger.debug(
+                f"{rel_path}: {len(added)} added, {len(file_removed)} removed, "
+                f"{len(chunks) - len(added)} kept ({file_updated} moved or retagged)"
+            )
+            removed.extend(file_removed)
+            result.append((rel_path, record, added))
+
+        try:
+            for batch in _batched(removed, self.config.delete_batch_size):
+                self.collection.delete(ids=batch)
+            if updated:
+                self.collection.update(
+                    ids=list(updated), metadatas=list(updated.values())
+                )
+        except Exception as e:
+            logger.warning(
+                f"Failed to update stored chunks: {e}. "
+                "Index may be inconsistent - consider reindexing with --force."
+            )
+
+        if removed and self.conclusion_store:
+            try:
+                for batch in _batched(removed, self.config.delete_batch_size):
+                    self.conclusion_store.delete_by_source_chunks(batch)
+            except Exception as e:
+                logger.warning(
+                    f"Failed to delete old conclusions: {e}. "
+                    "Index may be inconsistent - consider reindexing with --force."
+                )
+
+        return result
+
+    def _embed_chunks(
+        self, chunks: list[Chunk], recent: _LRUCache | None = None
+    ) -> tuple[np.ndarray, dict[int, str], int]:
+        """Embedding stage: embed one batch of chunks.
+
+        Chunks whose text is identical once cleaned for embedding (template
+        sections, boilerplate) are embedded once and the result is copied to
+        each of them. Embeddings are also looked up in and added to
+        ``recent``, which carries them across the batches of a run.
+
+        Returns:
+            (float32 embeddings, one row per chunk; reason for each skipped
+            chunk, by position; number of chunks that reused an embedding)
+        """
+        if not chunks:
+            return np.empty((0, 0), dtype=np.float32), {}, 0
+
+        # Key on a digest of the cleaned text, so ``recent`` doesn't hold texts
+        texts: dict[str, str] = {}
+        keys = []
+        for chunk in chunks:
+            text = clean_text(chunk.content)
+            key = hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+            texts.setdefault(key, text)
+            keys.append(key)
+
+        rows: dict[str, np.ndarray] = {}
+        if recent is not None:
+            for key in texts:
+                row = recent.get(key)
+                if row is not None:
+                    rows[key] = row
+        missing = [key for key in texts if key not in rows]
+
+        failed: dict[str, str] = {}
+        if missing:
+            batch = [texts[key] for key in missing]
+            if self.config.skip_failed_chunks:
+                embeddings, errors = self.embedder.embed_texts_partial(batch)
+            else:
+                embeddings, errors = self.embedder.embed_texts(batch), {}
+            for i, key in enumerate(missing):
+                if i in errors:
+                    failed[key] = errors[i]
+                    continue
+                rows[key] = embeddings[i]
+                if recent is not None:
+                    # A copy, so the cache doesn't keep the whole batch alive
+                    recent.put(key, embeddings[i].copy())
+
+        dimension = (
+            len(next(iter(rows.values())))
+            if rows
+            else self.embedder.embedding_dimension
+        )
+        result = np.zeros((len(chunks), dimension), dtype=np.float32)
+        chunk_errors: dict[int, str] = {}
+        for i, key in enumerate(keys):
+            if key in failed:
+                chunk_errors[i] = failed[key]
+            else:
+                result[i] = rows[key]
+        return result, chunk_errors, len(chunks) - len(missing)
+
+    def _store_chunks(
+        self,
+        chunks: list[Chunk],
+        embeddings: np.ndarray,
+        collection: chromadb.Collection | None = None,
+    ) -> None:
+        """Storage stage: write one batch of embedded chunks to ChromaDB."""
+        (collection or self.collection).add(
+            ids=[chunk.chunk_id for chunk in chunks],
+            embeddings=embeddings,
+            documents=[chunk.content for chunk in chunks],
+            metadatas=[self._chunk_metadata(chunk) for chunk in chunks],
+        )
+
+    def _chunk_metadata(self, chunk: Chunk) -> dict:
+        """Metadata stored alongside a chunk in ChromaDB."""
+        return {
+            "source_path": chunk.source_path,
+            "chunk_index": chunk.chunk_index,
+            "title": chunk.title or "",
+            "heading": chunk.heading or "",
+            "tags": ",".join(chunk.tags),
+            "token_estimate": chunk.token_estimate,
+        }
 
     def _extract_conclusions(self, chunks: list[Chunk]) -> int:
         """
@@ -451,12 +1429,14 @@ class VaultIndexer:
         chunk_data = []
         cached_count = 0
 
-        for chunk in chunks:
-            chunk_id = f"{chunk.source_path}:{chunk.chunk_index}"
-            content_hash = self._compute_hash(chunk.content)
+        chunk_hashes = [self._compute_hash(chunk.content) for chunk in chunks]
+        already_extracted = self.manifest.extracted_hashes(chunk_hashes)
+
+        for chunk, content_hash in zip(chunks, chunk_hashes, strict=True):
+            chunk_id = chunk.chunk_id
 
             # Check if this chunk was already processed
-            if content_hash in self.extraction_cache:
+            if content_hash in already_extracted:
                 cached_count += 1
                 continue
 
@@ -523,9 +1503,7 @@ class VaultIndexer:
                         continue
 
         # Update extraction cache
-        for h in processed_hashes:
-            self.extraction_cache[h] = True
-        self._save_extraction_cache()
+        self.manifest.mark_extracted(processed_hashes)
 
         # Store all conclusions
         if all_conclusions:
@@ -540,6 +1518,8 @@ class VaultIndexer:
         if self.conclusion_store:
             total_conclusions = self.conclusion_store.count()
 
+        embedder_stats = getattr(self.embedder, "stats", None)
+
         return IndexStats(
             total_files=len(self.scan_vault()),
             total_chunks=self.collection.count(),
@@ -547,21 +1527,27 @@ class VaultIndexer:
             vault_path=str(self.vault_path),
             total_conclusions=total_conclusions,
             reasoning_enabled=self.config.reasoning_enabled,
+            embedder_stats=(
+                embedder_stats.to_dict()
+                if isinstance(embedder_stats, EmbedderStats)
+                else None
+            ),
         )
 
     def delete_index(self):
         """Delete the entire index."""
         logger.info("Deleting index...")
+        # Including any unfinished force reindex build
+        stale = {self._build_collection_name, self._retired_collection_name}
+        for name in stale & self._collection_names():
+            self.chroma_client.delete_collection(name)
         self.chroma_client.delete_collection(self.config.collection_name)
         self.collection = self.chroma_client.create_collection(
             name=self.config.collection_name, metadata={"hnsw:space": "cosine"}
         )
-        self.file_hashes = {}
-        self._save_hashes()
 
-        # Clear extraction cache
-        self.extraction_cache = {}
-        self._save_extraction_cache()
+        # Clear file records and extraction cache
+        self.manifest.clear()
 
         # Clear conclusions if reasoning is enabled
         if self.conclusion_store:
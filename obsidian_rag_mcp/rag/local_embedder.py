@@ -0,0 +1,88 @@
+"""
+Local, deterministic embeddings from hashed n-gram features.
+
+No network access or model files are needed, so indexing and search run
+offline (benchmarks, tests, air-gapped deployments). Texts sharing words
+and word fragments get similar vectors; this is lexical similarity, not
+the semantic similarity of a trained model.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import zlib
+
+import numpy as np
+
+from .embedder import EmbedderConfig, EmbedderStats
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"\w+")
+
+# Dimension used when the config doesn't set one
+DEFAULT_DIMENSIONS = 512
+
+
+class HashingEmbedder:
+    """
+    Embeds text by hashing word unigrams, word bigrams and character
+    trigrams into a fixed-size, L2-normalized vector (the "hashing trick").
+
+    Features are hashed with CRC32, so vectors are identical across
+    processes and platforms. A second hash bit picks each feature's sign,
+    which keeps collisions from only ever adding up.
+    """
+
+    def __init__(self, config: EmbedderConfig | None = None):
+        self.config = config or EmbedderConfig(backend="hashing")
+        self.stats = EmbedderStats()  # Nothing to count; queries are never cached
+        self._dimensions = self.config.dimensions or DEFAULT_DIMENSIONS
+        logger.debug(f"Initialized hashing embedder with {self._dimensions} dimensions")
+
+    @property
+    def embedding_dimension(self) -> int:
+        return self._dimensions
+
+    def embed_text(self, text: str, is_query: bool = True) -> np.ndarray:
+        return self.embed_texts([text], is_query=is_query)[0]
+
+    def embed_texts(self, texts: list[str], is_query: bool = False) -> np.ndarray:
+        if is_query:
+            texts = [text[: self.config.query_max_chars] for text in texts]
+        embeddings = np.zeros((len(texts), self._dimensions), dtype=np.float32)
+        for row, text in zip(embeddings, texts, strict=True):
+            self._embed(text, row)
+        return embeddings
+
+    def embed_texts_partial(
+        self, texts: list[str]
+    ) -> tuple[np.ndarray, dict[int, str]]:
+        # Every input can be embedded locally
+        return self.embed_texts(texts), {}
+
+    def _features(self, text: str) -> list[str]:
+        words = _WORD.findall(text.lower())
+        features = [f"w:{word}" for word in words]
+        features.extend(f"b:{a} {b}" for a, b in zip(words, words[1:], strict=False))
+        for word in words:
+            padded = f"<{word}>"
+            features.extend(f"c:{padded[i : i + 3]}" for i in range(len(padded) - 2))
+        return features
+
+    def _embed(self, text: str, out: np.ndarray) -> None:
+        """Write the embedding of ``text`` into the zeroed row ``out``."""
+        hashes = np.fromiter(
+            (zlib.crc32(feature.encode()) for feature in self._features(text)),
+            dtype=np.uint32,
+        )
+        signs = np.where(hashes & 0x80000000, 1.0, -1.0).astype(np.float32)
+        np.add.at(out, hashes % self._dimensions, signs)
+
+        norm = np.linalg.norm(out)
+        if norm == 0:
+            # Empty or symbol-only text: any fixed unit vector will do
+            out[0] = 1.0
+            return
+        out /= norm
@@ -0,0 +1,437 @@
+"""
+Index manifest - SQLite-backed bookkeeping for incremental indexing.
+
+Tracks which files have been indexed (stat signature + content hash),
+which chunks have already been through conclusion extraction, and which
+chunks were skipped because they couldn't be embedded. Replaces the
+earlier file_hashes.json / extraction_cache.json files, which were rewritten
+in full on every save and loaded in full on every startup.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Keep parameter lists well under SQLite's host parameter limit
+_SQL_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    size INTEGER NOT NULL DEFAULT -1,
+    mtime_ns INTEGER NOT NULL DEFAULT -1,
+    inode INTEGER NOT NULL DEFAULT -1
+);
+CREATE TABLE IF NOT EXISTS extracted_chunks (
+    chunk_hash TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS build_files (
+    path TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    size INTEGER NOT NULL DEFAULT -1,
+    mtime_ns INTEGER NOT NULL DEFAULT -1,
+    inode INTEGER NOT NULL DEFAULT -1
+);
+CREATE TABLE IF NOT EXISTS skipped_chunks (
+    chunk_id TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    reason TEXT NOT NULL,
+    skipped_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS skipped_chunks_path ON skipped_chunks (path);
+"""
+
+# meta key holding the start time of an unfinished force reindex
+_FORCE_RUN_KEY = "force_run_started_at"
+# meta key set while a force reindex swaps its build in for the live collection
+_SWAP_KEY = "swap_started_at"
+
+
+@dataclass
+class FileRecord:
+    """Stat signature and content hash recorded for an indexed file.
+
+    Unchanged (size, mtime_ns, inode) means the file can be skipped without
+    reading it; any difference falls back to comparing the content hash.
+    """
+
+    content_hash: str
+    size: int = -1
+    mtime_ns: int = -1
+    inode: int = -1
+
+    @classmethod
+    def from_stat(cls, st: os.stat_result, content_hash: str) -> FileRecord:
+        return cls(
+            content_hash=content_hash,
+            size=st.st_size,
+            mtime_ns=st.st_mtime_ns,
+            inode=st.st_ino,
+        )
+
+    def matches_stat(self, st: os.stat_result) -> bool:
+        """Check whether a stat result has the same signature as this record."""
+        return (
+            self.size == st.st_size
+            and self.mtime_ns == st.st_mtime_ns
+            and self.inode == st.st_ino
+        )
+
+
+class IndexManifest:
+    """
+    Transactional manifest stored in the persist directory.
+
+    The database is opened lazily, so constructing an indexer for a query
+    (e.g. ``obsidian-rag search``) never touches it. Writes are per-file
+    upserts inside a transaction, so a crash can't leave a truncated file.
+    """
+
+    FILENAME = "manifest.sqlite3"
+
+    # Legacy JSON files imported on first open
+    LEGACY_HASH_FILE = "file_hashes.json"
+    LEGACY_EXTRACTION_FILE = "extraction_cache.json"
+
+    def __init__(self, persist_dir: str | Path):
+        self.persist_dir = Path(persist_dir)
+        self.path = self.persist_dir / self.FILENAME
+        self._conn: sqlite3.Connection | None = None
+        # The connection is shared with read/hash worker threads
+        self._lock = threading.RLock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Open the database on first use."""
+        if self._conn is None:
+            with self._lock:
+                if self._conn is None:
+                    self._conn = self._open()
+        return self._conn
+
+    def _open(self) -> sqlite3.Connection:
+        self.persist_dir.mkdir(parents=True, exist_ok=True)
+        is_new = not self.path.exists()
+
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+
+        if is_new:
+            self._import_legacy(conn)
+
+        logger.debug(f"Opened index manifest at {self.path}")
+        return conn
+
+    def _import_legacy(self, conn: sqlite3.Connection) -> None:
+        """Import file_hashes.json and extraction_cache.json, if present."""
+        hash_file = self.persist_dir / self.LEGACY_HASH_FILE
+        extraction_file = self.persist_dir / self.LEGACY_EXTRACTION_FILE
+
+        for legacy in (hash_file, extraction_file):
+            if not legacy.exists():
+                continue
+            try:
+                with open(legacy) as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Failed to import {legacy.name}: {e}")
+                continue
+
+            with conn:
+                if legacy is hash_file:
+                    # Values were either a bare hash or a dict with a stat signature
+                    rows = []
+                    for path, rec in data.items():
+                        if isinstance(rec, str):
+                            rec = {"content_hash": rec}
+                        rows.append(
+                            (
+                                path,
+                                rec["content_hash"],
+                                rec.get("size", -1),
+                                rec.get("mtime_ns", -1),
+                                rec.get("inode", -1),
+                            )
+                        )
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", rows
+                    )
+                else:
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO extracted_chunks VALUES (?)",
+                        [(h,) for h in data],
+                    )
+
+            legacy.rename(legacy.with_name(legacy.name + ".migrated"))
+            logger.info(f"Imported {len(data)} entries from {legacy.name}")
+
+    # -- Files -----------------------------------------------------------
+
+    def file_records(self) -> dict[str, FileRecord]:
+        """Load all file records (used once per full indexing run)."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT path, content_hash, size, mtime_ns, inode FROM files"
+            ).fetchall()
+        return {row[0]: FileRecord(*row[1:]) for row in rows}
+
+    def get_file(self, path: str) -> FileRecord | None:
+        """Look up the record for a single file."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT content_hash, size, mtime_ns, inode FROM files WHERE path = ?",
+                (path,),
+            ).fetchone()
+        return FileRecord(*row) if row else None
+
+    def set_files(
+        self, records: Iterable[tuple[str, FileRecord]], force_run: bool = False
+    ) -> None:
+        """Upsert file records in a single transaction.
+
+        Args:
+            records: (path, record) pairs to store
+            force_run: Record the files as built by the current force reindex
+                instead; they replace the live records when the run ends
+        """
+        rows = [
+            (path, rec.content_hash, rec.size, rec.mtime_ns, rec.inode)
+            for path, rec in records
+        ]
+        if not rows:
+            return
+        table = "build_files" if force_run else "files"
+        with self._lock, self.conn:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO {table} VALUES (?, ?, ?, ?, ?)", rows
+            )
+
+    def set_file(self, path: str, record: FileRecord) -> None:
+        """Upsert a single file record."""
+        self.set_files([(path, record)])
+
+    def delete_files(self, paths: Iterable[str], force_run: bool = False) -> None:
+        """Remove file records (from the current force reindex with ``force_run``)."""
+        paths = list(paths)
+        table = "build_files" if force_run else "files"
+        with self._lock, self.conn:
+            for i in range(0, len(paths), _SQL_BATCH):
+                batch = paths[i : i + _SQL_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                self.conn.execute(
+                    f"DELETE FROM {table} WHERE path IN ({placeholders})", batch
+                )
+
+    def rename_file(self, old_path: str, new_path: str, record: FileRecord) -> None:
+        """Move a file's record to a new path in a single transaction."""
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM files WHERE path = ?", (old_path,))
+            self.conn.execute("DELETE FROM skipped_chunks WHERE path = ?", (old_path,))
+            self.conn.execute(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+                (
+                    new_path,
+                    record.content_hash,
+                    record.size,
+                    record.mtime_ns,
+                    record.inode,
+                ),
+            )
+
+    def paths_under(self, directory: str) -> list[str]:
+        """Recorded file paths inside a directory (relative to the vault)."""
+        prefix = directory.rstrip(os.sep) + os.sep
+        # Range scan on the primary key: every path starting with the prefix
+        upper = prefix[:-1] + chr(ord(os.sep) + 1)
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT path FROM files WHERE path >= ? AND path < ?",
+                (prefix, upper),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def file_count(self) -> int:
+        """Number of files recorded as indexed."""
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    # -- Extraction cache ------------------------------------------------
+
+    def extracted_hashes(self, chunk_hashes: Iterable[str]) -> set[str]:
+        """Return the subset of chunk hashes already processed for conclusions."""
+        hashes = list(chunk_hashes)
+        found: set[str] = set()
+        with self._lock:
+            for i in range(0, len(hashes), _SQL_BATCH):
+                batch = hashes[i : i + _SQL_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self.conn.execute(
+                    "SELECT chunk_hash FROM extracted_chunks "
+                    f"WHERE chunk_hash IN ({placeholders})",
+                    batch,
+                ).fetchall()
+                found.update(row[0] for row in rows)
+        return found
+
+    def mark_extracted(self, chunk_hashes: Iterable[str]) -> None:
+        """Record chunk hashes as processed for conclusions."""
+        rows = [(h,) for h in chunk_hashes]
+        if not rows:
+            return
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO extracted_chunks VALUES (?)", rows
+            )
+
+    def extracted_count(self) -> int:
+        """Number of chunks recorded as processed for conclusions."""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT COUNT(*) FROM extracted_chunks"
+            ).fetchone()[0]
+
+    # -- Skipped chunks --------------------------------------------------
+
+    def add_skipped(self, chunks: Iterable[tuple[str, str, str]]) -> None:
+        """Record chunks that couldn't be embedded.
+
+        Args:
+            chunks: (chunk ID, file path, reason) for each skipped chunk
+        """
+        now = datetime.now().isoformat()
+        rows = [(chunk_id, path, reason, now) for chunk_id, path, reason in chunks]
+        if not rows:
+            return
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO skipped_chunks VALUES (?, ?, ?, ?)", rows
+            )
+
+    def skipped_chunks(self) -> list[tuple[str, str, str]]:
+        """(chunk ID, file path, reason) of every skipped chunk, by path."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT chunk_id, path, reason FROM skipped_chunks "
+                "ORDER BY path, chunk_id"
+            ).fetchall()
+        return [tuple(row) for row in rows]
+
+    def clear_skipped(self, paths: Iterable[str]) -> None:
+        """Forget skipped chunks of files that are being reindexed or removed."""
+        paths = list(paths)
+        with self._lock, self.conn:
+            for i in range(0, len(paths), _SQL_BATCH):
+                batch = paths[i : i + _SQL_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                self.conn.execute(
+                    f"DELETE FROM skipped_chunks WHERE path IN ({placeholders})",
+                    batch,
+                )
+
+    # -- Force reindex checkpoints ---------------------------------------
+
+    def begin_force_run(self) -> None:
+        """Start tracking a force reindex, discarding any earlier progress."""
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM build_files")
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                (_FORCE_RUN_KEY, datetime.now().isoformat()),
+            )
+
+    def force_run_started_at(self) -> str | None:
+        """Start time of an unfinished force reindex, or None."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT value FROM meta WHERE key = ?", (_FORCE_RUN_KEY,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def force_run_records(self) -> dict[str, FileRecord]:
+        """Records of the files already reindexed by the unfinished force reindex."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT path, content_hash, size, mtime_ns, inode FROM build_files"
+            ).fetchall()
+        return {row[0]: FileRecord(*row[1:]) for row in rows}
+
+    def end_force_run(self) -> None:
+        """Mark the current force reindex (and its swap) as complete.
+
+        The records it built replace all file records in one transaction,
+        and chunks skipped before it started, which belong to the index it
+        replaced, are forgotten.
+        """
+        with self._lock, self.conn:
+            self.conn.execute(
+                "DELETE FROM skipped_chunks WHERE skipped_at < "
+                "(SELECT value FROM meta WHERE key = ?)",
+                (_FORCE_RUN_KEY,),
+            )
+            self.conn.execute("DELETE FROM files")
+            self.conn.execute(
+                "INSERT INTO files SELECT path, content_hash, size, mtime_ns, inode "
+                "FROM build_files"
+            )
+            self.conn.execute("DELETE FROM build_files")
+            self.conn.execute(
+                "DELETE FROM meta WHERE key IN (?, ?)", (_FORCE_RUN_KEY, _SWAP_KEY)
+            )
+
+    def begin_swap(self) -> None:
+        """Record that the force reindex is about to swap its build in."""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                (_SWAP_KEY, datetime.now().isoformat()),
+            )
+
+    def swap_in_progress(self) -> bool:
+        """Whether a swap was started and not completed (or undone)."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT 1 FROM meta WHERE key = ?", (_SWAP_KEY,)
+            ).fetchone()
+        return row is not None
+
+    def end_swap(self) -> None:
+        """Forget an interrupted swap once it has been undone."""
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM meta WHERE key = ?", (_SWAP_KEY,))
+
+    # -- Lifecycle -------------------------------------------------------
+
+    def clear(self) -> None:
+        """Forget all files, extraction state, skipped chunks and force reindex progress."""
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM files")
+            self.conn.execute("DELETE FROM extracted_chunks")
+            self.conn.execute("DELETE FROM skipped_chunks")
+            self.conn.execute("DELETE FROM build_files")
+            self.conn.execute(
+                "DELETE FROM meta WHERE key IN (?, ?)", (_FORCE_RUN_KEY, _SWAP_KEY)
+            )
+
+    def close(self) -> None:
+        """Close the database connection, if open."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,214 @@
+"""
+Vault scanning: a pruning directory walker and a precompiled ignore matcher.
+
+Ignore patterns follow .gitignore semantics:
+- ``*`` and ``?`` don't cross ``/``; ``**`` matches any number of directories
+- A pattern without a ``/`` (other than a trailing one) matches at any depth
+- A pattern containing ``/`` is anchored at the vault root
+- A trailing ``/`` matches directories only; ``!`` re-includes a path
+- Once a directory is ignored, nothing below it is visited
+
+For compatibility with earlier configs, ``name/*`` (a single path component
+followed by ``/*``) ignores a directory called ``name`` at any depth, as
+``name/`` would in a .gitignore file.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Rule:
+    regex: re.Pattern
+    negate: bool
+    dir_only: bool
+
+
+def _translate(glob: str) -> str:
+    """Translate a gitignore glob (without anchoring) into a regex body."""
+    out = []
+    i, n = 0, len(glob)
+    while i < n:
+        c = glob[i]
+        if c == "*":
+            if glob.startswith("**", i):
+                i += 2
+                if i < n and glob[i] == "/":
+                    # "**/" matches zero or more directories
+                    out.append("(?:.*/)?")
+                    i += 1
+                else:
+                    out.append(".*")
+                continue
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            end = glob.find("]", i + 2)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = glob[i + 1 : end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append("[" + body.replace("\\", "\\\\") + "]")
+                i = end
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+class IgnoreMatcher:
+    """
+    Compiled set of ignore patterns.
+
+    Without negated patterns, all rules are folded into one regex per path
+    kind, so a check costs a single regex match.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.rules: list[_Rule] = []
+        for raw in patterns:
+            rule = self._compile(raw)
+            if rule is not None:
+                self.rules.append(rule)
+
+        self._has_negation = any(rule.negate for rule in self.rules)
+        self._dir_regex = self._combine(self.rules)
+        self._file_regex = self._combine([r for r in self.rules if not r.dir_only])
+
+    @staticmethod
+    def _compile(pattern: str) -> _Rule | None:
+        pattern = pattern.strip()
+        if not pattern or pattern.startswith("#"):
+            return None
+
+        negate = pattern.startswith("!")
+        if negate:
+            pattern = pattern[1:]
+
+        # Legacy "name/*": a directory with that name anywhere
+        if pattern.endswith("/*") and "/" not in pattern[:-2]:
+            pattern = pattern[:-2] + "/"
+
+        dir_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        anchored = "/" in pattern
+        pattern = pattern.lstrip("/")
+        if not pattern:
+            return None
+
+        prefix = "" if anchored else "(?:.*/)?"
+        regex = re.compile(f"{prefix}{_translate(pattern)}", re.DOTALL)
+        return _Rule(regex=regex, negate=negate, dir_only=dir_only)
+
+    @staticmethod
+    def _combine(rules: list[_Rule]) -> re.Pattern | None:
+        if not rules:
+            return None
+        return re.compile(
+            "|".join(f"(?:{rule.regex.pattern})" for rule in rules), re.DOTALL
+        )
+
+    def match(self, rel_path: str, is_dir: bool = False) -> bool:
+        """Check a single path (using ``/`` separators) against the patterns.
+
+        Parent directories are not checked; see ``ignores``.
+        """
+        if not self._has_negation:
+            regex = self._dir_regex if is_dir else self._file_regex
+            return regex is not None and regex.fullmatch(rel_path) is not None
+
+        # Last matching rule wins
+        for rule in reversed(self.rules):
+            if rule.dir_only and not is_dir:
+                continue
+            if rule.regex.fullmatch(rel_path):
+                return not rule.negate
+        return False
+
+    def ignores(self, rel_path: str, is_dir: bool = False) -> bool:
+        """Check a path, including whether any parent directory is ignored."""
+        parts = rel_path.replace(os.sep, "/").split("/")
+        for i in range(1, len(parts)):
+            if self.match("/".join(parts[:i]), is_dir=True):
+                return True
+        return self.match("/".join(parts), is_dir=is_dir)
+
+
+@dataclass
+class ScanResult:
+    """Markdown files found by a scan, with timing for diagnostics."""
+
+    files: list[Path]
+    seconds: float
+    dirs_visited: int
+    dirs_pruned: int
+
+
+def scan_markdown(root: Path, matcher: IgnoreMatcher, subdir: str = "") -> ScanResult:
+    """
+    Find markdown files under ``root``, pruning ignored directories.
+
+    Symlinks (files and directories) are skipped so the scan never reads
+    outside the vault.
+
+    Args:
+        root: Vault root; patterns are matched relative to it
+        matcher: Compiled ignore patterns
+        subdir: Only scan this directory (relative to ``root``), which the
+            caller has already checked is not ignored
+    """
+    started = time.perf_counter()
+    files: list[Path] = []
+    dirs_visited = 0
+    dirs_pruned = 0
+
+    # (absolute dir, relative prefix with trailing "/")
+    subdir = subdir.replace(os.sep, "/").strip("/")
+    if subdir:
+        stack = [(str(root / subdir), subdir + "/")]
+    else:
+        stack = [(str(root), "")]
+    while stack:
+        dir_path, prefix = stack.pop()
+        dirs_visited += 1
+        try:
+            entries = list(os.scandir(dir_path))
+        except OSError as e:
+            logger.warning(f"Failed to scan {dir_path}: {e}")
+            continue
+
+        for entry in entries:
+            try:
+                if entry.is_symlink():
+                    logger.debug(f"Skipping symlink: {entry.path}")
+                    continue
+                rel_path = prefix + entry.name
+                if entry.is_dir():
+                    if matcher.match(rel_path, is_dir=True):
+                        dirs_pruned += 1
+                    else:
+                        stack.append((entry.path, rel_path + "/"))
+                elif entry.name.endswith(".md") and not matcher.match(rel_path):
+                    files.append(Path(entry.path))
+            except OSError as e:
+                logger.debug(f"Skipping {entry.path}: {e}")
+
+    files.sort()
+    return ScanResult(
+        files=files,
+        seconds=time.perf_counter() - started,
+        dirs_visited=dirs_visited,
+        dirs_pruned=dirs_pruned,
+    )
@@ -0,0 +1,194 @@
+"""
+Filesystem watcher that keeps the index up to date.
+
+Uses native file events (inotify, FSEvents, ReadDirectoryChangesW) through
+the optional ``watchfiles`` package (``pip install obsidian-rag-mcp[watch]``)
+and falls back to polling the vault when it isn't installed. Events are
+debounced and only the touched paths are passed to
+``VaultIndexer.index_paths``, so updates never rescan the whole vault.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from .indexer import IndexStats, VaultIndexer
+from .scanner import scan_markdown
+
+try:
+    import watchfiles
+
+    HAVE_WATCHFILES = True
+except ImportError:  # Optional: pip install obsidian-rag-mcp[watch]
+    HAVE_WATCHFILES = False
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WatcherConfig:
+    """Configuration for the vault watcher."""
+
+    debounce_ms: int = 1000  # Wait for changes to settle before indexing
+    poll_interval: float = 2.0  # Seconds between scans when polling
+    force_polling: bool = False  # Poll even if native events are available
+
+    def __post_init__(self):
+        if self.debounce_ms < 0:
+            raise ValueError(
+                f"debounce_ms must be non-negative, got {self.debounce_ms}"
+            )
+        if self.poll_interval <= 0:
+            raise ValueError(
+                f"poll_interval must be positive, got {self.poll_interval}"
+            )
+
+
+class VaultWatcher:
+    """
+    Watches a vault and incrementally reindexes changed notes.
+
+    Indexing errors are logged and the watcher keeps running; the affected
+    files stay out of date in the manifest and are retried by the next
+    event or full index run.
+    """
+
+    def __init__(
+        self,
+        indexer: VaultIndexer,
+        config: WatcherConfig | None = None,
+        on_update: Callable[[IndexStats], None] | None = None,
+    ):
+        self.indexer = indexer
+        self.config = config or WatcherConfig()
+        self.on_update = on_update
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def backend(self) -> str:
+        """Name of the change detection mechanism in use."""
+        if HAVE_WATCHFILES and not self.config.force_polling:
+            return "native"
+        return "polling"
+
+    def start(self, sync_first: bool = False) -> threading.Thread:
+        """Run the watcher on a background daemon thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self.run,
+            kwargs={"sync_first": sync_first},
+            name="vault-watcher",
+            daemon=True,
+        )
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop watching and wait for the background thread, if any."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run(self, sync_first: bool = False) -> None:
+        """
+        Watch until ``stop`` is called (blocking).
+
+        Args:
+            sync_first: Run an incremental ``index_vault`` before watching to
+                pick up changes made while nothing was watching
+        """
+        if sync_first:
+            try:
+                self._report(self.indexer.index_vault())
+            except Exception as e:
+                logger.warning(f"Initial index failed: {e}")
+
+        logger.info(f"Watching {self.indexer.vault_path} ({self.backend})")
+        if self.backend == "native":
+            self._watch_native()
+        else:
+            self._watch_polling()
+
+    def is_relevant(self, path: str | Path) -> bool:
+        """Check whether a changed path can affect the index."""
+        path = Path(path)
+        try:
+            rel_path = str(path.relative_to(self.indexer.vault_path))
+        except ValueError:
+            return False
+
+        matcher = self.indexer.ignore_matcher
+        if rel_path.endswith(".md"):
+            return not matcher.ignores(rel_path)
+        # Directories matter for moves and deletions; other files never do.
+        # A deleted path could have been either, so it's passed on.
+        if path.exists() and not path.is_dir():
+            return False
+        return not matcher.ignores(rel_path, is_dir=True)
+
+    def flush(self, paths: set[str]) -> IndexStats | None:
+        """Index a set of changed paths, logging (not raising) failures."""
+        if not paths:
+            return None
+        logger.info(f"Reindexing {len(paths)} changed paths...")
+        try:
+            stats = self.indexer.index_paths(sorted(paths))
+        except Exception as e:
+            logger.warning(f"Failed to index changes: {e}")
+            return None
+        self._report(stats)
+        return stats
+
+    def _report(self, stats: IndexStats) -> None:
+        if self.on_update is not None:
+            self.on_update(stats)
+
+    def _watch_native(self) -> None:
+        for changes in watchfiles.watch(
+            self.indexer.vault_path,
+            watch_filter=lambda _change, path: self.is_relevant(path),
+            debounce=self.config.debounce_ms,
+            stop_event=self._stop,
+        ):
+            self.flush({path for _change, path in changes})
+
+    def _snapshot(self) -> dict[str, tuple[int, int, int]]:
+        """Stat signature of every indexable file in the vault."""
+        scan = scan_markdown(self.indexer.vault_path, self.indexer.ignore_matcher)
+        snapshot = {}
+        for file_path in scan.files:
+            try:
+                st = file_path.stat()
+            except OSError:
+                continue
+            snapshot[str(file_path)] = (st.st_size, st.st_mtime_ns, st.st_ino)
+        return snapshot
+
+    def _watch_polling(self) -> None:
+        previous = self._snapshot()
+        pending: set[str] = set()
+        last_change = 0.0
+        debounce = self.config.debounce_ms / 1000
+
+        while not self._stop.wait(self.config.poll_interval):
+            current = self._snapshot()
+            changed = {
+                path
+                for path in previous.keys() | current.keys()
+                if previous.get(path) != current.get(path)
+            }
+            previous = current
+
+            if changed:
+                pending |= changed
+                last_change = time.monotonic()
+            if pending and time.monotonic() - last_change >= debounce:
+                self.flush(pending)
+                pending = set()
@@ -11,6 +11,8 @@ from pathlib import Path
 import chromadb
 from chromadb.config import Settings
 
+from obsidian_rag_mcp.rag.chunker import title_from_path
+
 from .models import ChunkContext, Conclusion, ConclusionType
 
 logger = logging.getLogger(__name__)
@@ -254,6 +256,78 @@ class ConclusionStore:
         self.collection.delete(ids=results["ids"])
         return len(results["ids"])
 
+    def delete_by_sources(self, source_paths: list[str]) -> int:
+        """Delete all conclusions from several source files at once."""
+        if not source_paths:
+            return 0
+
+        results = self.collection.get(
+            where={"source_path": {"$in": source_paths}},
+            include=[],
+        )
+
+        if not results["ids"]:
+            return 0
+
+        self.collection.delete(ids=results["ids"])
+        return len(results["ids"])
+
+    def delete_by_source_chunks(self, source_chunk_ids: list[str]) -> int:
+        """Delete all conclusions derived from the given source chunks."""
+        if not source_chunk_ids:
+            return 0
+
+        results = self.collection.get(
+            where={"source_chunk_id": {"$in": source_chunk_ids}},
+            include=[],
+        )
+
+        if not results["ids"]:
+            return 0
+
+        self.collection.delete(ids=results["ids"])
+        return len(results["ids"])
+
+    def move_source(
+        self, old_path: str, new_path: str, chunk_ids: dict[str, str]
+    ) -> int:
+        """
+        Repoint conclusions from a moved file at its new path.
+
+        Only metadata changes, so nothing is re-embedded or re-extracted.
+
+        Args:
+            old_path: Previous source path
+            new_path: New source path
+            chunk_ids: Mapping of old to new source chunk IDs
+
+        Returns:
+            Number of conclusions moved
+        """
+        results = self.collection.get(
+            where={"source_path": old_path},
+            include=["metadatas"],
+        )
+
+        if not results["ids"]:
+            return 0
+
+        metadatas = []
+        for metadata in results["metadatas"]:
+            chunk_id = metadata["source_chunk_id"]
+            moved = {
+                **metadata,
+                "source_path": new_path,
+                "source_chunk_id": chunk_ids.get(chunk_id, chunk_id),
+            }
+            # Titles taken from the file name follow the rename
+            if metadata.get("title") == title_from_path(old_path):
+                moved["title"] = title_from_path(new_path)
+            metadatas.append(moved)
+
+        self.collection.update(ids=results["ids"], metadatas=metadatas)
+        return len(results["ids"])
+
     def count(self) -> int:
         """Get total number of conclusions."""
         return self.collection.count()
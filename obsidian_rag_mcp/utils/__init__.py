@@ -1,5 +1,15 @@
 """Utility modules for obsidian-rag-mcp."""
 
-from .tokens import count_tokens
+from .tokens import (
+    count_tokens,
+    count_tokens_batch,
+    encode_with_offsets,
+    truncate_tokens,
+)
 
-__all__ = ["count_tokens"]
+__all__ = [
+    "count_tokens",
+    "count_tokens_batch",
+    "encode_with_offsets",
+    "truncate_tokens",
+]
@@ -0,0 +1,123 @@
+"""Shared, pooled HTTP client for API clients in this process.
+
+The embedder and the conclusion extractor talk to the same provider, so
+they share one ``httpx.Client``: connections are kept alive and reused
+across components and threads instead of each opening (and TLS-handshaking)
+its own. HTTP/2 is used when the optional ``h2`` package is installed.
+"""
+
+import importlib.util
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class HTTPConfig:
+    """Connection pool and timeout settings for the shared client."""
+
+    # Should be at least the embedder's max_concurrency plus a few for queries
+    max_connections: int = 20
+    max_keepalive_connections: int | None = None  # Default: max_connections
+    keepalive_expiry: float = 30.0  # Seconds an idle connection is kept
+    connect_timeout: float = 10.0
+    # Read/write/pool timeout per request. The OpenAI SDK's default, as the
+    # extractor's batched chat completions can take minutes to generate.
+    timeout: float = 600.0
+    http2: bool = True  # Only takes effect when h2 is installed
+
+    def __post_init__(self):
+        if self.max_connections < 1:
+            raise ValueError(
+                f"max_connections must be at least 1, got {self.max_connections}"
+            )
+        keepalive = self.max_keepalive_connections
+        if keepalive is not None and not 0 <= keepalive <= self.max_connections:
+            raise ValueError(
+                "max_keepalive_connections must be between 0 and max_connections, "
+                f"got {keepalive}"
+            )
+        for name in ("keepalive_expiry", "connect_timeout", "timeout"):
+            if getattr(self, name) <= 0:
+                raise ValueError(f"{name} must be positive, got {getattr(self, name)}")
+
+    @classmethod
+    def from_env(cls) -> "HTTPConfig":
+        """
+        Create config from environment variables.
+
+        Environment variables:
+        - HTTP_MAX_CONNECTIONS: Connection pool size
+        - HTTP_CONNECT_TIMEOUT: Seconds to establish a connection
+        - HTTP_TIMEOUT: Seconds to wait on a request once connected
+        """
+        kwargs: dict[str, Any] = {}
+        for field, name, parse in (
+            ("max_connections", "HTTP_MAX_CONNECTIONS", int),
+            ("connect_timeout", "HTTP_CONNECT_TIMEOUT", float),
+            ("timeout", "HTTP_TIMEOUT", float),
+        ):
+            value = os.getenv(name, "").strip()
+            if value:
+                try:
+                    kwargs[field] = parse(value)
+                except ValueError:
+                    raise ValueError(
+                        f"{name} must be a number, got {value!r}"
+                    ) from None
+        return cls(**kwargs)
+
+    @property
+    def httpx_timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(self.timeout, connect=self.connect_timeout)
+
+
+_clients: dict[HTTPConfig, httpx.Client] = {}
+_lock = threading.Lock()
+
+
+def get_http_client(config: HTTPConfig | None = None) -> httpx.Client:
+    """
+    Return the process-wide client for ``config``, creating it on first use.
+
+    Args:
+        config: Pool and timeout settings (default: from environment variables)
+    """
+    config = config or HTTPConfig.from_env()
+    with _lock:
+        client = _clients.get(config)
+        if client is None or client.is_closed:
+            http2 = config.http2 and importlib.util.find_spec("h2") is not None
+            client = httpx.Client(
+                http2=http2,
+                timeout=config.httpx_timeout,
+                limits=httpx.Limits(
+                    max_connections=config.max_connections,
+                    max_keepalive_connections=(
+                        config.max_keepalive_connections
+                        if config.max_keepalive_connections is not None
+                        else config.max_connections
+                    ),
+                    keepalive_expiry=config.keepalive_expiry,
+                ),
+            )
+            _clients[config] = client
+            logger.debug(
+                f"Created shared HTTP client (pool={config.max_connections}, "
+                f"http2={http2})"
+            )
+        return client
+
+
+def close_http_clients() -> None:
+    """Close all shared clients; later calls to get_http_client open new ones."""
+    with _lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
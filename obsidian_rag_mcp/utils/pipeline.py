@@ -0,0 +1,91 @@
+"""Bounded, threaded pipeline stages.
+
+Chaining ``prefetch`` calls turns a sequence of generators into a pipeline
+where each stage runs on its own thread and at most ``maxsize`` items are
+buffered between stages, so stages overlap in time while peak memory stays
+proportional to the item (batch) size.
+"""
+
+import queue
+import threading
+from collections.abc import Iterable, Iterator
+from typing import TypeVar
+
+T = TypeVar("T")
+
+# Sentinel marking the end of a stage's output
+_DONE = object()
+
+# How often blocked producers re-check whether the consumer has gone away
+_POLL_SECONDS = 0.1
+
+
+class _Failure:
+    """Carries an exception from a stage thread to its consumer."""
+
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+def prefetch(
+    iterable: Iterable[T], maxsize: int = 2, name: str = "stage"
+) -> Iterator[T]:
+    """
+    Iterate ``iterable`` on a background thread, buffering up to ``maxsize`` items.
+
+    Exceptions raised by the stage are re-raised in the consumer. If the
+    consumer stops early (break, exception, or generator close), the stage
+    thread stops after its current item and closes its upstream iterator.
+
+    Args:
+        iterable: Source of items; typically a generator doing the stage's work
+        maxsize: Maximum number of items buffered ahead of the consumer
+        name: Thread name suffix, for debugging
+
+    Yields:
+        Items from ``iterable``, in order
+    """
+    if maxsize < 1:
+        raise ValueError(f"maxsize must be at least 1, got {maxsize}")
+
+    buffer: queue.Queue = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def put(item: object) -> bool:
+        """Put an item, giving up if the consumer has stopped."""
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run() -> None:
+        iterator = iter(iterable)
+        try:
+            for item in iterator:
+                if not put(item):
+                    return
+            put(_DONE)
+        except BaseException as e:  # Re-raised in the consumer
+            put(_Failure(e))
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    thread = threading.Thread(target=run, name=f"pipeline-{name}", daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.exc
+            yield item
+    finally:
+        stop.set()
+        thread.join()
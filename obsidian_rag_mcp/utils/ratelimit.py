@@ -0,0 +1,111 @@
+"""Token-bucket rate limiting for API clients shared across threads.
+
+Providers quote limits per minute, both in requests and in tokens. Each
+limit is a bucket holding up to one minute's allowance that refills
+continuously, so a burst can use the full quota and steady use settles at
+the quoted rate.
+"""
+
+import threading
+import time
+from collections.abc import Callable
+
+
+class _Bucket:
+    """A single token bucket; not thread-safe on its own."""
+
+    def __init__(self, per_minute: int, now: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0  # Units per second
+        self.level = self.capacity
+        self.updated = now
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` is available (0 if it already is)."""
+        return max(0.0, (amount - self.level) / self.rate)
+
+
+class RateLimiter:
+    """
+    Blocks callers until a request fits within requests- and tokens-per-minute.
+
+    Either limit may be None (unlimited). A request needing more tokens
+    than a full minute's allowance is let through once the bucket is full,
+    rather than waiting forever.
+
+    Args:
+        requests_per_minute: Maximum requests per minute
+        tokens_per_minute: Maximum tokens per minute
+        clock: Monotonic time source (for tests)
+        sleep: Sleep function (for tests)
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int | None = None,
+        tokens_per_minute: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        for name, value in (
+            ("requests_per_minute", requests_per_minute),
+            ("tokens_per_minute", tokens_per_minute),
+        ):
+            if value is not None and value < 1:
+                raise ValueError(f"{name} must be at least 1, got {value}")
+
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        now = clock()
+        self._requests = (
+            _Bucket(requests_per_minute, now) if requests_per_minute else None
+        )
+        self._tokens = _Bucket(tokens_per_minute, now) if tokens_per_minute else None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any limit is configured."""
+        return self._requests is not None or self._tokens is not None
+
+    def acquire(self, tokens: int = 0) -> float:
+        """
+        Wait until one request using ``tokens`` tokens is allowed, then take it.
+
+        Callers are served roughly first come, first served: the lock is
+        held while waiting, so later callers can't overtake a large request.
+
+        Returns:
+            Seconds spent waiting
+        """
+        if not self.enabled:
+            return 0.0
+
+        waited = 0.0
+        with self._lock:
+            while True:
+                now = self._clock()
+                delay = 0.0
+                for bucket, amount in (
+                    (self._requests, 1),
+                    (self._tokens, tokens),
+                ):
+                    if bucket is None:
+                        continue
+                    bucket.refill(now)
+                    delay = max(delay, bucket.wait_time(min(amount, bucket.capacity)))
+                if delay <= 0:
+                    break
+                self._sleep(delay)
+                waited += delay
+
+            if self._requests is not None:
+                self._requests.level -= 1
+            if self._tokens is not None:
+                # May go negative for oversized requests; later callers wait
+                self._tokens.level -= tokens
+        return waited
@@ -2,8 +2,14 @@
 
 Provides accurate token counting for OpenAI models, with lazy-loading
 of the encoder to avoid import-time overhead.
+
+Texts are encoded as ordinary text everywhere, so special-token strings
+such as ``<|endoftext|>`` in a note are counted like any other text
+instead of raising, and every function agrees on the count.
 """
 
+import os
+
 import tiktoken
 
 # Lazy-loaded encoder instance
@@ -35,4 +41,81 @@ def count_tokens(text: str) -> int:
     if not text:
         return 0
     encoder = _get_encoder()
-    return len(encoder.encode(text))
+    return len(encoder.encode_ordinary(text))
+
+
+def count_tokens_batch(texts: list[str], num_threads: int | None = None) -> list[int]:
+    """
+    Count the tokens in many texts at once.
+
+    Encoding runs on tiktoken's thread pool, which releases the GIL, so
+    large batches use several cores.
+
+    Args:
+        texts: The texts to count tokens for.
+        num_threads: Encoding threads (default: CPU count).
+
+    Returns:
+        The number of tokens in each text, in order.
+    """
+    if not texts:
+        return []
+    encoder = _get_encoder()
+    threads = num_threads or os.cpu_count() or 1
+    return [
+        len(tokens)
+        for tokens in encoder.encode_ordinary_batch(texts, num_threads=threads)
+    ]
+
+
+def truncate_tokens(text: str, max_tokens: int) -> tuple[str, int]:
+    """
+    Truncate a text to at most ``max_tokens`` tokens.
+
+    The cut is made on a character boundary, so a token split across a
+    multi-byte character is dropped rather than decoded as garbage.
+
+    Args:
+        text: The text to truncate.
+        max_tokens: Maximum number of tokens to keep.
+
+    Returns:
+        The (possibly truncated) text and its token count.
+    """
+    if not text:
+        return text, 0
+    encoder = _get_encoder()
+    tokens = encoder.encode_ordinary(text)
+    if len(tokens) <= max_tokens:
+        return text, len(tokens)
+    keep = max_tokens
+    while True:
+        truncated = encoder.decode_bytes(tokens[:keep]).decode("utf-8", errors="ignore")
+        # Re-encoding the cut text can merge differently at the boundary
+        count = len(encoder.encode_ordinary(truncated))
+        if count <= max_tokens:
+            return truncated, count
+        keep -= count - max_tokens
+
+
+def encode_with_offsets(text: str) -> tuple[list[int], list[int]]:
+    """
+    Encode a text once, along with where each token starts in it.
+
+    Slicing the text at token offsets splits it on token boundaries, so a
+    span of tokens can be mapped back to a substring without re-encoding.
+
+    Args:
+        text: The text to encode.
+
+    Returns:
+        The tokens, and the character offset at which each token starts.
+        A token starting inside a multi-byte character gets that
+        character's offset.
+    """
+    if not text:
+        return [], []
+    encoder = _get_encoder()
+    tokens = encoder.encode_ordinary(text)
+    _, offsets = encoder.decode_with_offsets(tokens)
+    return tokens, offsets
@@ -1,6 +1,18 @@
 """Tests for the markdown chunker."""
 
-from obsidian_rag_mcp.rag.chunker import Chunk, ChunkerConfig, MarkdownChunker
+from unittest.mock import patch
+
+import pytest
+
+from obsidian_rag_mcp.rag.chunker import (
+    Chunk,
+    ChunkerConfig,
+    MarkdownChunker,
+    _load_frontmatter,
+    count_chunk_tokens,
+    parse_frontmatter,
+)
+from obsidian_rag_mcp.utils.tokens import count_tokens
 
 
 class TestMarkdownChunker:
@@ -66,6 +78,29 @@ Some text after code.
         assert "```python" in chunks[0].content
         assert 'print("Hello, World!")' in chunks[0].content
 
+    def test_split_paragraphs_keeps_fences_whole(self):
+        """Test blank lines inside ``` and ~~~ fences don't split paragraphs."""
+        content = (
+            "Intro.\n\n"
+            "~~~ js title=example.js\nlet a;\n\n~~~~ not a close\n\nlet b;\n~~~\n\n"
+            "  ```python\n  x = 1\n\n  ```  \n\n"
+            "```\nunclosed\n\nto the end"
+        )
+        assert self.chunker._split_paragraphs(content) == [
+            "Intro.",
+            "~~~ js title=example.js\nlet a;\n\n~~~~ not a close\n\nlet b;\n~~~",
+            "```python\n  x = 1\n\n  ```",
+            "```\nunclosed\n\nto the end",
+        ]
+
+    def test_split_paragraphs_ignores_inline_backticks(self):
+        """Test triple backticks inside a line don't open a code block."""
+        content = "Use ```code``` inline.\n\nNext paragraph."
+        assert self.chunker._split_paragraphs(content) == [
+            "Use ```code``` inline.",
+            "Next paragraph.",
+        ]
+
     def test_inline_tag_extraction(self):
         """Test extraction of inline tags."""
         content = """# Document
@@ -124,6 +159,69 @@ Content here.
         # Should have multiple chunks
         assert len(chunks) > 1
 
+    def test_token_sizing_respects_budget(self):
+        """Test token-sized chunks stay within max_chunk_tokens exactly."""
+        paragraphs = [f"Paragraph {i} covers the rollout plan. " * 2 for i in range(40)]
+        paragraphs.append(
+            "長い段落の例です。" * 100
+        )  # One oversized non-English paragraph
+        content = "\n\n".join(paragraphs)
+
+        config = ChunkerConfig(
+            max_chunk_tokens=200, min_chunk_tokens=20, token_sizing=True
+        )
+        chunks = MarkdownChunker(config).chunk_document(content, "plan.md")
+
+        assert len(chunks) > 2
+        assert all(chunk.token_estimate <= 200 for chunk in chunks)
+        assert [c.chunk_index for c in chunks] == list(range(len(chunks)))
+        assert "\ufffd" not in "".join(c.content for c in chunks)
+        # Consecutive chunks overlap
+        assert chunks[1].content[:20] in chunks[0].content
+
+    def test_token_sizing_small_section_unchanged(self):
+        """Test a section within budget is one chunk, as with char sizing."""
+        content = "## Notes\n\nShort section.\n\nSecond paragraph."
+        config = ChunkerConfig(token_sizing=True)
+        token_chunks = MarkdownChunker(config).chunk_document(content, "a.md")
+        char_chunks = self.chunker.chunk_document(content, "a.md")
+
+        assert [c.content for c in token_chunks] == [c.content for c in char_chunks]
+
+    def test_token_sizing_keeps_code_blocks(self):
+        """Test oversized code blocks are not cut with preserve_code_blocks."""
+        code = "```python\n" + "\n".join(f"x_{i} = {i}" for i in range(200)) + "\n```"
+        content = "Intro paragraph.\n\n" + code + "\n\nOutro paragraph."
+
+        config = ChunkerConfig(
+            max_chunk_tokens=100, min_chunk_tokens=1, token_sizing=True
+        )
+        chunks = MarkdownChunker(config).chunk_document(content, "code.md")
+
+        assert any(chunk.content == code for chunk in chunks)
+
+    def test_token_sizing_multi_token_characters(self):
+        """Test small windows over multi-token characters never split them."""
+        bodies = ["😀😀 -", "😀" * 7, "a😀b😀c😀 😀😀 x😀😀😀"]
+        for max_tokens, overlap in [(5, 0), (6, 1), (8, 3)]:
+            config = ChunkerConfig(
+                max_chunk_tokens=max_tokens,
+                min_chunk_tokens=1,
+                overlap_tokens=overlap,
+                token_sizing=True,
+            )
+            chunker = MarkdownChunker(config)
+            for body in bodies:
+                chunks = chunker.chunk_document(body, "emoji.md")
+                text = "".join(c.content for c in chunks)
+                assert "\ufffd" not in text
+                assert text.count("😀") >= body.count("😀")
+
+    def test_overlap_must_leave_room(self):
+        """Test max_chunk_tokens must fit the overlap plus a whole character."""
+        with pytest.raises(ValueError, match="overlap_tokens"):
+            ChunkerConfig(max_chunk_tokens=5, overlap_tokens=3)
+
     def test_token_estimate(self):
         """Test token estimation property."""
         chunk = Chunk(
@@ -136,6 +234,24 @@ Content here.
         assert chunk.token_estimate >= 5
         assert chunk.token_estimate <= 10
 
+    def test_token_estimate_computed_once(self):
+        """Test token counts are memoized and can be filled in a batch."""
+        chunks = [
+            Chunk(content=f"Chunk number {i} text", source_path="a.md", chunk_index=i)
+            for i in range(3)
+        ]
+        with patch(
+            "obsidian_rag_mcp.rag.chunker.count_tokens", wraps=count_tokens
+        ) as counter:
+            assert chunks[0].token_estimate == chunks[0].token_estimate
+            assert counter.call_count == 1
+
+            count_chunk_tokens(chunks)
+            assert [c.token_estimate for c in chunks] == [
+                count_tokens(c.content) for c in chunks
+            ]
+            assert counter.call_count == 1
+
     def test_empty_document(self):
         """Test handling of empty document."""
         content = ""
@@ -153,6 +269,62 @@ Content here.
 
         assert chunks[0].source_path == path
 
+    def test_chunk_ids_stable_across_insertions(self):
+        """Test chunk IDs don't shift when a section is inserted above."""
+        before = "## Alpha\n\nFirst.\n\n## Beta\n\nSecond."
+        after = "## New\n\nInserted.\n\n" + before
+
+        old_ids = [c.chunk_id for c in self.chunker.chunk_document(before, "n.md")]
+        new_chunks = self.chunker.chunk_document(after, "n.md")
+
+        assert [c.chunk_id for c in new_chunks[1:]] == old_ids
+        assert [c.chunk_index for c in new_chunks] == [0, 1, 2]
+        assert all(cid.startswith("n.md#") for cid in old_ids)
+
+    def test_chunk_ids_depend_on_heading(self):
+        """Test identical content under different headings gets distinct IDs."""
+        content = "## One\n\nSame text.\n\n## Two\n\nSame text."
+        chunks = self.chunker.chunk_document(content, "n.md")
+
+        assert chunks[0].chunk_id != chunks[1].chunk_id
+
+    def test_duplicate_chunks_get_unique_ids(self):
+        """Test repeated identical sections still get unique IDs."""
+        content = "## Log\n\nNothing.\n\n## Log\n\nNothing."
+        chunks = self.chunker.chunk_document(content, "n.md")
+
+        assert len(chunks) == 2
+        assert chunks[1].chunk_id == chunks[0].chunk_id + "-1"
+
+
+class TestParseFrontmatter:
+    """Test the frontmatter fast path."""
+
+    def test_matches_frontmatter_loads(self):
+        """Test metadata and body match python-frontmatter's parse."""
+        assert parse_frontmatter("---\ntitle: A\ntags: [x]\n---\n\nBody\n") == (
+            {"title": "A", "tags": ["x"]},
+            "Body",
+        )
+        assert parse_frontmatter("---\n- a list\n---\nBody") == ({}, "Body")
+        assert parse_frontmatter("\n# No frontmatter\n\n") == ({}, "# No frontmatter")
+
+    def test_no_frontmatter_skips_parsing(self):
+        """Test notes without frontmatter never reach the YAML loader."""
+        with patch("obsidian_rag_mcp.rag.chunker._load_frontmatter") as load:
+            parse_frontmatter("# Title\n\n---\n\nText after a rule.")
+        load.assert_not_called()
+
+    def test_frontmatter_cached(self):
+        """Test repeated frontmatter is parsed once and returned as a copy."""
+        _load_frontmatter.cache_clear()
+        first, _ = parse_frontmatter("---\ntitle: A\n---\nOne")
+        first["title"] = "changed"
+        second, _ = parse_frontmatter("---\ntitle: A\n---\nTwo")
+
+        assert second == {"title": "A"}
+        assert _load_frontmatter.cache_info().hits == 1
+
 
 class TestChunkerConfig:
     """Test ChunkerConfig defaults and behavior."""
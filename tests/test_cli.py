@@ -1,11 +1,13 @@
 """Tests for the CLI module."""
 
 import tempfile
+from pathlib import Path
 
 from click.testing import CliRunner
 
 from obsidian_rag_mcp import __version__
 from obsidian_rag_mcp.cli.main import cli
+from obsidian_rag_mcp.rag.manifest import IndexManifest
 
 
 class TestCLI:
@@ -25,6 +27,40 @@ class TestCLI:
         assert result.exit_code == 0
         assert __version__ in result.output
 
+    def test_index_jobs_option(self):
+        """Test index exposes --jobs and --chunk-workers and validates them."""
+        runner = CliRunner()
+        result = runner.invoke(cli, ["index", "--help"])
+        assert result.exit_code == 0
+        assert "--jobs" in result.output
+        assert "--chunk-workers" in result.output
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result = runner.invoke(cli, ["index", "--vault", tmpdir, "--jobs", "0"])
+            assert result.exit_code != 0
+            result = runner.invoke(
+                cli, ["index", "--vault", tmpdir, "--chunk-workers", "-1"]
+            )
+            assert result.exit_code != 0
+
+    def test_stats_lists_skipped_chunks(self):
+        """Test stats --skipped lists rejected chunks with their reasons."""
+        runner = CliRunner()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            persist_dir = str(Path(tmpdir) / ".vault")
+            manifest = IndexManifest(persist_dir)
+            manifest.add_skipped([("a.md#123", "a.md", "content_filter")])
+            manifest.close()
+
+            result = runner.invoke(
+                cli,
+                ["stats", "--vault", tmpdir, "-p", persist_dir, "--skipped"],
+                env={"EMBEDDING_BACKEND": "hashing"},
+            )
+            assert result.exit_code == 0, result.output
+            assert "Skipped chunks: 1" in result.output
+            assert "a.md#123: content_filter" in result.output
+
 
 class TestSearchValidation:
     """Test search command input validation."""
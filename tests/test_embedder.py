@@ -1,10 +1,22 @@
 """Tests for the OpenAI embedder."""
 
+import base64
+import threading
+import time
 from unittest.mock import Mock, patch
 
+import httpx
+import numpy as np
 import pytest
+from openai import BadRequestError
 
-from obsidian_rag_mcp.rag.embedder import EmbedderConfig, OpenAIEmbedder
+from obsidian_rag_mcp.rag.embedder import (
+    EmbedderConfig,
+    EmbeddingCountError,
+    OpenAIEmbedder,
+)
+from obsidian_rag_mcp.rag.embedding_cache import EmbeddingCache
+from obsidian_rag_mcp.utils.tokens import count_tokens
 
 
 class TestEmbedderConfig:
@@ -15,7 +27,9 @@ class TestEmbedderConfig:
         config = EmbedderConfig()
 
         assert config.model == "text-embedding-3-small"
-        assert config.batch_size == 100
+        assert config.batch_size == 2048
+        assert config.max_batch_tokens == 300_000
+        assert config.max_input_tokens == 8191
         assert config.dimensions is None
 
     def test_custom_values(self):
@@ -30,6 +44,42 @@ class TestEmbedderConfig:
         assert config.batch_size == 50
         assert config.dimensions == 512
 
+    def test_token_limit_validation(self):
+        """Test a batch must be able to hold at least one full input."""
+        with pytest.raises(ValueError, match="max_input_tokens"):
+            EmbedderConfig(max_input_tokens=0)
+        with pytest.raises(ValueError, match="max_batch_tokens"):
+            EmbedderConfig(max_batch_tokens=100, max_input_tokens=200)
+
+    def test_concurrency_validation(self):
+        """Test concurrency and rate limits must be positive."""
+        assert EmbedderConfig().max_concurrency == 1
+        with pytest.raises(ValueError, match="max_concurrency"):
+            EmbedderConfig(max_concurrency=0)
+        with pytest.raises(ValueError, match="requests_per_minute"):
+            EmbedderConfig(requests_per_minute=0)
+        with pytest.raises(ValueError, match="tokens_per_minute"):
+            EmbedderConfig(tokens_per_minute=0)
+
+    def test_from_env(self, monkeypatch):
+        """Test concurrency and rate limits can be set from the environment."""
+        monkeypatch.setenv("EMBEDDING_MAX_CONCURRENCY", "8")
+        monkeypatch.setenv("EMBEDDING_TPM", "1000000")
+        monkeypatch.delenv("EMBEDDING_RPM", raising=False)
+
+        config = EmbedderConfig.from_env()
+        assert config.max_concurrency == 8
+        assert config.requests_per_minute is None
+        assert config.tokens_per_minute == 1_000_000
+
+        assert config.backend == "openai"
+        monkeypatch.setenv("EMBEDDING_BACKEND", "Hashing")
+        assert EmbedderConfig.from_env().backend == "hashing"
+
+        monkeypatch.setenv("EMBEDDING_RPM", "lots")
+        with pytest.raises(ValueError, match="EMBEDDING_RPM"):
+            EmbedderConfig.from_env()
+
 
 class TestOpenAIEmbedder:
     """Test OpenAIEmbedder with mocked OpenAI client."""
@@ -50,8 +100,9 @@ class TestOpenAIEmbedder:
         embedder = OpenAIEmbedder(api_key="test-key")
         result = embedder.embed_text("Hello world")
 
-        assert len(result) == 1536
-        assert result == [0.1] * 1536
+        assert result.shape == (1536,)
+        assert result.dtype == np.float32
+        assert result.tolist() == pytest.approx([0.1] * 1536)
         mock_client.embeddings.create.assert_called_once()
 
     @patch("obsidian_rag_mcp.rag.embedder.OpenAI")
@@ -71,9 +122,9 @@ class TestOpenAIEmbedder:
         embedder = OpenAIEmbedder(api_key="test-key")
         results = embedder.embed_texts(["Hello", "World"])
 
-        assert len(results) == 2
-        assert results[0] == [0.1] * 1536
-        assert results[1] == [0.2] * 1536
+        assert results.shape == (2, 1536)
+        assert results[0].tolist() == pytest.approx([0.1] * 1536)
+        assert results[1].tolist() == pytest.approx([0.2] * 1536)
 
     @patch("obsidian_rag_mcp.rag.embedder.OpenAI")
     def test_empty_input(self, mock_openai_class):
@@ -85,7 +136,7 @@ class TestOpenAIEmbedder:
         embedder = OpenAIEmbedder(api_key="test-key")
         results = embedder.embed_texts([])
 
-        assert results == []
+        assert results.shape == (0, 1536)
         mock_client.embeddings.create.assert_not_called()
 
     @patch("obsidian_rag_mcp.rag.embedder.OpenAI")
@@ -120,6 +171,251 @@ class TestOpenAIEmbedder:
         assert len(results) == 12
         assert mock_client.embeddings.create.call_count == 3
 
+    @patch("obsidian_rag_mcp.rag.embedder.OpenAI")
+    def test_concurrent_batches_keep_order(self, mock_openai_class):
+        """Test batches sent concurrently are returned in input order."""
+        mock_client = Mock()
+        mock_openai_class.return_value = mock_client
+        mock_client.api_key = "test-key"
+
+        in_flight = [0]
+        peak = [0]
+        lock = threading.Lock()
+
+        def create_side_effect(**kwargs):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            batch = kwargs["input"]
+            # Later batches finish first
+            time.sleep(0.05 / (1 + int(batch[0].split()[1])))
+            with lock:
+                in_flight[0] -= 1
+            response = Mock()
+            response.data = [
+                Mock(index=i, embedding=[float(text.split()[1])])
+                for i, text in enumerate(batch)
+            ]
+            return response
+
+        mock_client.embeddings.create.side_effect = create_side_effect
+
+        config = EmbedderConfig(batch_size=2, max_concurrency=3)
+        embedder = OpenAIEmbedder(api_key="test-key", config=config)
+
+        texts = [f"Text {i}" for i in range(12)]
+        results = embedder.embed_texts(texts)
+
+        assert results.tolist() == [[float(i)] for i in range(12)]
+        assert mock_client.embeddings.create.call_count == 6
+        assert 1 < peak[0] <= 3
+
+    @patch("obsidian_rag_mcp.rag.embedder.OpenAI")
+    def test_pipeline_batch_sent_concurrently(self, mock_openai_class):
+        """Test a default-sized pipeline batch fills every concurrent slot."""
+        mock_client = Mock()
+        mock_openai_class.return_value = mock_client
+        mock_client.api_key = "test-key"
+
+        # Every request waits until all four are in flight
+        barrier = threading.Barrier(4, timeout=5)
+
+        def create_side_effect(**kwargs):
+            barrier.wait()
+            return Mock(
+                data=[
+                    Mock(index=i, embedding=[0.1]) for i in range(len(kwargs["input"]))
+                ]
+            )
+
+        mock_client.embeddings.create.side_effect = create_side_effect
+
+        # Default batch limits, and the indexer's default pipeline batch size
+        config = EmbedderConfig(max_concurrency=4)
+        embedder = OpenAIEmbedder(api_key="test-key", config=config)
+        results = embedder.embed_texts([f"Text {i}" for i in range(500)])
+
+        assert len(results) == 500
+        assert mock_client.embeddings.create.call_count == 4
+
+    @staticmethod
+    def _echo_client(mock_openai_class) -> Mock:
+        """Mock client returning one embedding per input."""
+        mock_client = Mock()
+        mock_openai_class.return_value = mock_client
+        mock_client.api_key = "test-key"
+        mock_client.embeddings.create.side_effect = lambda **kwargs: Mock(
+            data=[Mock(index=i, embedding=[0.1]) for i in range(len(kwargs["input"]))]
+        )
+        return mock_client
+
+    @patch("obsidian_rag_mcp.rag.embedder.OpenAI")
+    def test_batches_packed_by_tokens(self, mock_openai_class):
+        """Test batches are split at the token limit, not just the input count."""
+        mock_client = self._echo_client(mock_openai_class)
+
+        texts = [" ".join(["word"] * n) for n in (40, 40, 40, 5, 5)]
+        counts = [count_tokens(t) for t in texts]
+        limit = counts[0] * 2 + counts[3] - 1
+
+        config = EmbedderConfig(max_batch_tokens=limit, max_input_tokens=counts[0])
+        embedder = OpenAIEmbedder(api_key="test-key", config=config)
+        results = embedder.embed_texts(texts)
+
+        assert len(results) == 5
+        batches = [
+            c.kwargs["input"] for c in mock_client.embeddings.create.call_args_list
+        ]
+        # Greedy packing: each batch is as full as the next text allows
+        assert [len(batch) for batch in batches] == [2, 3]
+        for batch in batches:
+            assert sum(count_tokens(t) for t in batch) <= limit
+
+    @patch("obsidian_rag_mcp.rag.embedder.OpenAI")
+    def test_long_inputs_truncated_by_tokens(self, mock_openai_class):
+        """Test inputs over max_input_tokens are cut to fit."""
+        mock_client = self._echo_client(mock_openai_class)
+
+        config = EmbedderConfig(max_batch_tokens=1000, max_input_tokens=50)
+        embedder = OpenAIEmbedder(api_key="test-key", config=config)
+        embedder.embed_texts(["token " * 500, "short"])
+
+        sent = mock_client.embeddings.create.call_args.kwargs["input"]
+        assert count_tokens(sent[0]) <= 50
+        assert "token " * 500 != sent[0]
+        assert sent[0] and ("token " * 500).startswith(sent[0])
+        assert sent[1] == "short"
+
+    @patch("obsidian_rag_mcp.rag.embedder.OpenAI")
+    def test_rate_limiter_counts_tokens(self, mock_openai_class):
+        """Test each request takes its batch's tokens from the limiter."""
+        self._echo_client(mock_openai_class)
+
+        config = EmbedderConfig(batch_size=2, tokens_per_minute=100_000)
+        embedder = OpenAIEmbedder(api_key="test-key", config=config)
+
+        texts = ["first text", "second text here", "third"]
+        with patch.object(embedder.rate_limiter, "acquire", return_value=0.0) as acq:
+            embedder.embed_texts(texts)
+
+        assert [c.args[0] for c in acq.call_args_list] == [
+            count_tokens(texts[0]) + count_tokens(texts[1]),
+            count_tokens(texts[2]),
+        ]
+
+    @patch("obsidian_rag_mcp.rag.embedder.OpenAI")
+    def test_partial_isolates_rejected_inputs(self, mock_openai_class):
+        """Test failing batches are bisected down to the offending inputs."""
+        mock_client = Mock()
+        mock_openai_class.return_value = mock_client
+        mock_client.api_key = "test-key"
+
+        def create_side_effect(**kwargs):
+            # Content filtering drops the poisoned input from the response
+            return Mock(
+                data=[
+                    Mock(index=i, embedding=[float(i + 1)])
+                    for i, text in enumerate(kwargs["input"])
+                    if "poison" not in text
+                ]
+            )
+
+        mock_client.embeddings.create.side_effect = create_side_effect
+        embedder = OpenAIEmbedder(api_key="test-key")
+
+        texts = [f"text {i}" for i in range(8)]
+        texts[5] = "poison"
+        embeddings, errors = embedder.embed_texts_partial(texts)
+
+        assert list(errors) == [5]
+        assert "0 embeddings for 1 inputs" in errors[5]
+        assert not embeddings[5].any()
+        assert all(e.any() for i, e in enumerate(embeddings) if i != 5)
+        # One full batch, then halves down to the single poisoned input
+        assert mock_client.embeddings.create.call_count == 1 + 2 + 2 + 2
+
+        # The strict variant still fails the whole call
+        with pytest.raises(EmbeddingCountError):
+            embedder.embed_texts(texts)
+
+    @staticmethod
+    def _bad_request(code: str | None = None, param: str | None = None):
+        return BadRequestError(
+            "Bad request",
+            response=httpx.Response(
+                400, request=httpx.Request("POST", "https://api.openai.com")
+            ),
+            body={"code": code, "param": param},
+        )
+
+    @patch("obsidian_rag_mcp.rag.embedder.OpenAI")
+    def test_partial_isolates_rejected_request_errors(self, mock_openai_class):
+        """Test request errors that blame an input are bisected too."""
+        mock_client = Mock()
+        mock_openai_class.return_value = mock_client
+        mock_client.api_key = "test-key"
+
+        def create_side_effect(**kwargs):
+            if any("poison" in text for text in kwargs["input"]):
+                raise self._bad_request(code="content_filter", param="input")
+            return Mock(
+                data=[
+                    Mock(index=i, embedding=[1.0]) for i in range(len(kwargs["input"]))
+                ]
+            )
+
+        mock_client.embeddings.create.side_effect = create_side_effect
+        embedder = OpenAIEmbedder(api_key="test-key")
+
+        _, errors = embedder.embed_texts_partial(["a", "poison", "c", "d"])
+        assert list(errors) == [1]
+
+    @patch("obsidian_rag_mcp.rag.embedder.OpenAI")
+    def test_partial_raises_request_errors(self, mock_openai_class):
+        """Test errors about the request, not its inputs, are not bisected."""
+        mock_client = Mock()
+        mock_openai_class.return_value = mock_client
+        mock_client.api_key = "test-key"
+        mock_client.embeddings.create.side_effect = self._bad_request(
+            param="dimensions"
+        )
+
+        embedder = OpenAIEmbedder(api_key="test-key")
+        with pytest.raises(BadRequestError):
+            embedder.embed_texts_partial(["a", "b", "c", "d"])
+        assert mock_client.embeddings.create.call_count == 1
+
+    @patch("obsidian_rag_mcp.rag.embedder.OpenAI")
+    def test_partial_raises_when_every_input_rejected(self, mock_openai_class):
+        """Test a batch whose inputs are all rejected fails instead of skipping."""
+        mock_client = Mock()
+        mock_openai_class.return_value = mock_client
+        mock_client.api_key = "test-key"
+        mock_client.embeddings.create.side_effect = self._bad_request(
+            code="content_filter"
+        )
+
+        embedder = OpenAIEmbedder(api_key="test-key")
+        with pytest.raises(BadRequestError):
+            embedder.embed_texts_partial(["a", "b", "c", "d"])
+
+        # A single rejected input is still just skipped
+        _, errors = embedder.embed_texts_partial(["a"])
+        assert list(errors) == [0]
+
+    @patch("obsidian_rag_mcp.rag.embedder.OpenAI")
+    def test_partial_raises_other_errors(self, mock_openai_class):
+        """Test errors unrelated to the inputs are not bisected."""
+        mock_client = Mock()
+        mock_openai_class.return_value = mock_client
+        mock_client.api_key = "test-key"
+        mock_client.embeddings.create.side_effect = RuntimeError("service down")
+
+        embedder = OpenAIEmbedder(api_key="test-key")
+        with pytest.raises(RuntimeError, match="service down"):
+            embedder.embed_texts_partial(["a", "b", "c"])
+        assert mock_client.embeddings.create.call_count == 1
+
     @patch("obsidian_rag_mcp.rag.embedder.OpenAI")
     def test_text_cleaning(self, mock_openai_class):
         """Test that text is cleaned before embedding."""
@@ -200,3 +496,160 @@ class TestOpenAIEmbedder:
 
         with pytest.raises(RuntimeError, match="returned 1 embeddings for 2 inputs"):
             embedder.embed_texts(["Hello", "World"])
+
+    @patch("obsidian_rag_mcp.rag.embedder.OpenAI")
+    def test_cache_skips_known_texts(self, mock_openai_class, tmp_path):
+        """Test cached document embeddings are not requested again."""
+        mock_client = Mock()
+        mock_openai_class.return_value = mock_client
+        mock_client.api_key = "test-key"
+
+        def create_side_effect(**kwargs):
+            response = Mock()
+            response.data = [
+                Mock(index=i, embedding=[float(len(text))] * 4)
+                for i, text in enumerate(kwargs["input"])
+            ]
+            return response
+
+        mock_client.embeddings.create.side_effect = create_side_effect
+
+        cache = EmbeddingCache(tmp_path / EmbeddingCache.FILENAME)
+        embedder = OpenAIEmbedder(api_key="test-key", cache=cache)
+
+        first = embedder.embed_texts(["one", "three"])
+        second = embedder.embed_texts(["three", "fourteen", "one"])
+
+        assert first.tolist() == [[3.0] * 4, [5.0] * 4]
+        assert second.tolist() == [[5.0] * 4, [8.0] * 4, [3.0] * 4]
+        # Only the new text was sent the second time
+        assert mock_client.embeddings.create.call_count == 2
+        last_call = mock_client.embeddings.create.call_args
+        assert last_call.kwargs["input"] == ["fourteen"]
+
+        # Queries bypass the cache
+        embedder.embed_text("one")
+        assert mock_client.embeddings.create.call_count == 3
+
+    @patch("obsidian_rag_mcp.rag.embedder.OpenAI")
+    def test_query_cache_serves_repeats(self, mock_openai_class):
+        """Test repeat queries are answered from the in-memory LRU."""
+        mock_client = Mock()
+        mock_openai_class.return_value = mock_client
+        mock_client.api_key = "test-key"
+
+        def create_side_effect(**kwargs):
+            response = Mock()
+            response.data = [
+                Mock(index=i, embedding=[float(len(text))] * 4)
+                for i, text in enumerate(kwargs["input"])
+            ]
+            return response
+
+        mock_client.embeddings.create.side_effect = create_side_effect
+
+        embedder = OpenAIEmbedder(
+            api_key="test-key", config=EmbedderConfig(query_cache_size=2)
+        )
+
+        first = embedder.embed_text("alpha")
+        first[0] = 99.0  # Mutating a result must not corrupt the cache
+        assert embedder.embed_text("alpha").tolist() == [5.0] * 4
+        assert mock_client.embeddings.create.call_count == 1
+        assert embedder.stats.to_dict() == {
+            "query_cache_hits": 1,
+            "query_cache_misses": 1,
+        }
+
+        # Least recently used entry is evicted
+        embedder.embed_text("beta")
+        embedder.embed_text("gamma")
+        embedder.embed_text("alpha")
+        assert mock_client.embeddings.create.call_count == 4
+
+        # Documents never go through the query cache
+        embedder.embed_texts(["gamma"])
+        assert mock_client.embeddings.create.call_count == 5
+
+    @patch("obsidian_rag_mcp.rag.embedder.OpenAI")
+    def test_query_cache_disabled(self, mock_openai_class):
+        """Test a zero-size query cache always calls the API."""
+        mock_client = Mock()
+        mock_openai_class.return_value = mock_client
+        mock_client.api_key = "test-key"
+        mock_response = Mock()
+        mock_response.data = [Mock(index=0, embedding=[0.1, 0.2])]
+        mock_client.embeddings.create.return_value = mock_response
+
+        embedder = OpenAIEmbedder(
+            api_key="test-key", config=EmbedderConfig(query_cache_size=0)
+        )
+        embedder.embed_text("same")
+        embedder.embed_text("same")
+
+        assert mock_client.embeddings.create.call_count == 2
+        assert embedder.stats.query_cache_misses == 2
+        with pytest.raises(ValueError, match="query_cache_size"):
+            EmbedderConfig(query_cache_size=-1)
+
+    @patch("obsidian_rag_mcp.rag.embedder.OpenAI")
+    def test_query_cache_persisted(self, mock_openai_class, tmp_path):
+        """Test persisted query embeddings survive a new embedder."""
+        mock_client = Mock()
+        mock_openai_class.return_value = mock_client
+        mock_client.api_key = "test-key"
+        mock_response = Mock()
+        mock_response.data = [Mock(index=0, embedding=[0.1, 0.2])]
+        mock_client.embeddings.create.return_value = mock_response
+
+        config = EmbedderConfig(persist_query_cache=True)
+        cache_path = tmp_path / EmbeddingCache.FILENAME
+        OpenAIEmbedder(
+            api_key="test-key", config=config, cache=EmbeddingCache(cache_path)
+        ).embed_text("query")
+
+        embedder = OpenAIEmbedder(
+            api_key="test-key", config=config, cache=EmbeddingCache(cache_path)
+        )
+        assert embedder.embed_text("query").tolist() == pytest.approx([0.1, 0.2])
+        assert mock_client.embeddings.create.call_count == 1
+        assert embedder.stats.query_cache_misses == 1
+
+    def test_cache_keys_follow_azure_deployment(self, monkeypatch):
+        """Test each Azure deployment gets its own cache namespace."""
+        monkeypatch.delenv("OPENAI_BASE_URL", raising=False)
+        config = EmbedderConfig()
+        assert OpenAIEmbedder("test-key", config)._cache_model == config.model
+
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://example.azure.com")
+        monkeypatch.setenv("AZURE_API_KEY", "azure-key")
+        monkeypatch.setenv("AZURE_EMBEDDING_DEPLOYMENT", "small")
+        small = OpenAIEmbedder(config=config)._cache_model
+        monkeypatch.setenv("AZURE_EMBEDDING_DEPLOYMENT", "large")
+        large = OpenAIEmbedder(config=config)._cache_model
+
+        assert len({config.model, small, large}) == 3
+
+    @patch("obsidian_rag_mcp.rag.embedder.OpenAI")
+    def test_base64_embeddings_decoded(self, mock_openai_class):
+        """Test embeddings are requested as base64 and decoded to float32."""
+        mock_client = Mock()
+        mock_openai_class.return_value = mock_client
+        mock_client.api_key = "test-key"
+
+        vectors = np.array([[0.5, -1.0, 2.0], [0.25, 0.0, -3.5]], dtype="<f4")
+        mock_response = Mock()
+        mock_response.data = [
+            Mock(index=i, embedding=base64.b64encode(v.tobytes()).decode())
+            for i, v in enumerate(vectors)
+        ]
+        mock_client.embeddings.create.return_value = mock_response
+
+        embedder = OpenAIEmbedder(api_key="test-key")
+        results = embedder.embed_texts(["one", "two"])
+
+        assert results.dtype == np.float32
+        assert results.flags.c_contiguous
+        assert np.array_equal(results, vectors)
+        call = mock_client.embeddings.create.call_args
+        assert call.kwargs["encoding_format"] == "base64"
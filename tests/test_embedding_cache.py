@@ -0,0 +1,99 @@
+"""Tests for the persistent embedding cache."""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from obsidian_rag_mcp.rag.embedding_cache import EmbeddingCache
+
+
+class TestEmbeddingCache:
+    """Test EmbeddingCache storage and eviction."""
+
+    def test_lazy_open(self):
+        """Test the database is not created until first use."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / EmbeddingCache.FILENAME
+            cache = EmbeddingCache(path)
+            assert not path.exists()
+
+            assert cache.get_many(["missing"]) == {}
+            assert path.exists()
+            cache.close()
+
+    def test_key_includes_model_and_dimensions(self):
+        """Test keys differ by model, dimensions and text."""
+        key = EmbeddingCache.make_key("small", None, "text")
+
+        assert key == EmbeddingCache.make_key("small", None, "text")
+        assert key != EmbeddingCache.make_key("large", None, "text")
+        assert key != EmbeddingCache.make_key("small", 512, "text")
+        assert key != EmbeddingCache.make_key("small", None, "other")
+
+    def test_roundtrip_persists(self):
+        """Test vectors survive reopening as float32 values."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / EmbeddingCache.FILENAME
+            cache = EmbeddingCache(path)
+            cache.put_many({"a": [0.5, -1.0, 2.0], "b": [0.25] * 3})
+            cache.close()
+
+            reopened = EmbeddingCache(path)
+            found = reopened.get_many(["a", "b", "c"])
+            assert {k: v.tolist() for k, v in found.items()} == {
+                "a": [0.5, -1.0, 2.0],
+                "b": [0.25] * 3,
+            }
+            assert len(reopened) == 2
+            reopened.close()
+
+    def test_evicts_least_recently_used(self):
+        """Test eviction drops the entries used longest ago."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = EmbeddingCache(Path(tmpdir) / "cache.sqlite3", max_entries=10)
+            cache.put_many({f"k{i}": [float(i)] for i in range(10)})
+
+            # Touch k0 so it's more recent than k1..k9
+            cache.get_many(["k0"])
+            cache.put_many({"new": [1.0]})
+
+            assert len(cache) <= 10
+            found = cache.get_many(["k0", "k1", "new"])
+            assert "k0" in found
+            assert "new" in found
+            assert "k1" not in found
+            cache.close()
+
+    def test_count_kept_without_rescanning(self):
+        """Test puts update the entry count without running COUNT(*)."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = EmbeddingCache(Path(tmpdir) / "cache.sqlite3")
+            cache.put_many({"a": [1.0], "b": [2.0]})
+            assert len(cache) == 2
+
+            statements: list[str] = []
+            cache.conn.set_trace_callback(statements.append)
+            cache.put_many({"b": [3.0], "c": [4.0]})
+
+            assert len(cache) == 3
+            assert not any("COUNT(*)" in s for s in statements)
+            # Existing keys are overwritten
+            assert cache.get_many(["b"])["b"].tolist() == [3.0]
+            cache.close()
+
+    def test_clear(self):
+        """Test clear removes all entries."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = EmbeddingCache(Path(tmpdir) / "cache.sqlite3")
+            cache.put_many({"a": [1.0]})
+            cache.clear()
+
+            assert len(cache) == 0
+            assert cache.get_many(["a"]) == {}
+            cache.close()
+
+    def test_invalid_size(self):
+        """Test max_entries must be positive."""
+        with pytest.raises(ValueError, match="max_entries"):
+            EmbeddingCache("cache.sqlite3", max_entries=0)
@@ -4,6 +4,8 @@ import tempfile
 from pathlib import Path
 from unittest.mock import Mock, patch
 
+from chromadb.errors import NotFoundError
+
 from obsidian_rag_mcp.rag.engine import (
     ConclusionResult,
     RAGEngine,
@@ -168,6 +170,53 @@ class TestRAGEngine:
             assert response.results[1].source_path == "ml.md"
             assert response.query == "python programming"
 
+    @patch("obsidian_rag_mcp.rag.engine.VaultIndexer")
+    def test_reads_reopen_swapped_collection(self, mock_indexer_class):
+        """Test every collection read retries on the new collection after a swap."""
+        mock_indexer = Mock()
+        mock_indexer_class.return_value = mock_indexer
+        mock_indexer.embedder = Mock()
+        mock_indexer.embedder.embed_text.return_value = [0.1] * 1536
+
+        stale = Mock()
+        stale.query.side_effect = NotFoundError("gone")
+        stale.get.side_effect = NotFoundError("gone")
+        stale.count.side_effect = NotFoundError("gone")
+        live = Mock()
+        live.query.return_value = {"ids": [[]]}
+        live.get.return_value = {
+            "ids": ["a.md#1"],
+            "documents": ["Body"],
+            "metadatas": [{"source_path": "a.md", "title": "A"}],
+        }
+        live.count.return_value = 3
+
+        def reopen():
+            mock_indexer.collection = live
+
+        mock_indexer.reopen_collection.side_effect = reopen
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = RAGEngine(
+                vault_path=tmpdir,
+                persist_dir=tmpdir,
+                api_key="test-key",
+            )
+
+            mock_indexer.collection = stale
+            evidence = engine._get_source_chunk("a.md#1")
+            assert evidence is not None
+            assert evidence.content == "Body"
+
+            mock_indexer.collection = stale
+            assert engine.search("query").total_chunks_searched == 3
+
+            stale.query.side_effect = None
+            stale.query.return_value = {"ids": [[]]}
+            mock_indexer.collection = stale
+            assert engine.search("query").total_chunks_searched == 3
+            assert mock_indexer.reopen_collection.call_count == 3
+
     @patch("obsidian_rag_mcp.rag.engine.VaultIndexer")
     def test_search_with_tag_filter(self, mock_indexer_class):
         """Test search with tag filtering."""
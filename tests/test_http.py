@@ -0,0 +1,84 @@
+"""Tests for the shared HTTP client."""
+
+import pytest
+from openai import DEFAULT_TIMEOUT
+
+from obsidian_rag_mcp.rag.embedder import _create_openai_client
+from obsidian_rag_mcp.utils.http import (
+    HTTPConfig,
+    close_http_clients,
+    get_http_client,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_clients():
+    close_http_clients()
+    yield
+    close_http_clients()
+
+
+class TestHTTPConfig:
+    """Tests for HTTPConfig."""
+
+    def test_default_timeout_matches_sdk(self):
+        """The read timeout defaults to the OpenAI SDK's own."""
+        assert HTTPConfig().httpx_timeout.read == DEFAULT_TIMEOUT.read
+
+    def test_validation(self):
+        """Pool sizes and timeouts must be positive and consistent."""
+        with pytest.raises(ValueError, match="max_connections"):
+            HTTPConfig(max_connections=0)
+        with pytest.raises(ValueError, match="max_keepalive_connections"):
+            HTTPConfig(max_connections=4, max_keepalive_connections=5)
+        with pytest.raises(ValueError, match="timeout"):
+            HTTPConfig(timeout=0)
+
+    def test_from_env(self, monkeypatch):
+        """Pool size and timeouts can be set from the environment."""
+        monkeypatch.setenv("HTTP_MAX_CONNECTIONS", "64")
+        monkeypatch.setenv("HTTP_TIMEOUT", "30.5")
+        monkeypatch.delenv("HTTP_CONNECT_TIMEOUT", raising=False)
+
+        config = HTTPConfig.from_env()
+        assert config.max_connections == 64
+        assert config.timeout == 30.5
+        assert config.connect_timeout == HTTPConfig().connect_timeout
+
+        monkeypatch.setenv("HTTP_TIMEOUT", "soon")
+        with pytest.raises(ValueError, match="HTTP_TIMEOUT"):
+            HTTPConfig.from_env()
+
+
+class TestSharedClient:
+    """Tests for get_http_client."""
+
+    def test_one_client_per_config(self):
+        """Equal configs share a client; closed clients are replaced."""
+        client = get_http_client(HTTPConfig())
+        assert get_http_client(HTTPConfig()) is client
+        assert get_http_client(HTTPConfig(max_connections=5)) is not client
+
+        client.close()
+        assert get_http_client(HTTPConfig()) is not client
+
+    def test_limits_and_timeouts_applied(self):
+        """The pool and timeouts come from the config."""
+        client = get_http_client(HTTPConfig(connect_timeout=3.0, timeout=45.0))
+        assert client.timeout.connect == 3.0
+        assert client.timeout.read == 45.0
+
+    def test_openai_clients_share_pool(self, monkeypatch):
+        """OpenAI and Azure clients reuse one pool, keeping their own headers."""
+        config = HTTPConfig(timeout=45.0)
+        openai_client = _create_openai_client("test-key", http_config=config)
+
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://example.azure.com/")
+        monkeypatch.setenv("AZURE_API_KEY", "azure-key")
+        azure_client = _create_openai_client(http_config=config)
+
+        assert openai_client._client is get_http_client(config)
+        assert azure_client._client is get_http_client(config)
+        assert openai_client.timeout.read == 45.0
+        assert azure_client.default_headers["api-key"] == "azure-key"
+        assert "api-key" not in get_http_client(config).headers
@@ -12,7 +12,7 @@ from obsidian_rag_mcp.rag.indexer import IndexerConfig, VaultIndexer
 class TestVaultIndexer:
     """Test suite for VaultIndexer."""
 
-    @patch("obsidian_rag_mcp.rag.indexer.OpenAIEmbedder")
+    @patch("obsidian_rag_mcp.rag.indexer.create_embedder")
     @patch("obsidian_rag_mcp.rag.indexer.chromadb.PersistentClient")
     def test_symlinks_are_skipped(self, mock_chroma, mock_embedder):
         """Test that symlinks are not indexed (security feature)."""
@@ -20,6 +20,7 @@ class TestVaultIndexer:
         mock_chroma.return_value = mock_client
         mock_collection = Mock()
         mock_client.get_or_create_collection.return_value = mock_collection
+        mock_client.list_collections.return_value = []
 
         mock_emb = Mock()
         mock_embedder.return_value = mock_emb
@@ -57,13 +58,14 @@ class TestVaultIndexer:
                 if outside_file.exists():
                     outside_file.unlink()
 
-    @patch("obsidian_rag_mcp.rag.indexer.OpenAIEmbedder")
+    @patch("obsidian_rag_mcp.rag.indexer.create_embedder")
     @patch("obsidian_rag_mcp.rag.indexer.chromadb.PersistentClient")
     def test_vault_path_validation(self, mock_chroma, mock_embedder):
         """Test that invalid vault paths raise errors."""
         mock_client = Mock()
         mock_chroma.return_value = mock_client
         mock_client.get_or_create_collection.return_value = Mock()
+        mock_client.list_collections.return_value = []
         mock_embedder.return_value = Mock()
 
         # Non-existent path should raise
@@ -74,7 +76,7 @@ class TestVaultIndexer:
             )
             VaultIndexer(config, api_key="test-key")
 
-    @patch("obsidian_rag_mcp.rag.indexer.OpenAIEmbedder")
+    @patch("obsidian_rag_mcp.rag.indexer.create_embedder")
     @patch("obsidian_rag_mcp.rag.indexer.chromadb.PersistentClient")
     def test_ignore_patterns(self, mock_chroma, mock_embedder):
         """Test that ignore patterns work correctly."""
@@ -82,6 +84,7 @@ class TestVaultIndexer:
         mock_chroma.return_value = mock_client
         mock_collection = Mock()
         mock_client.get_or_create_collection.return_value = mock_collection
+        mock_client.list_collections.return_value = []
         mock_embedder.return_value = Mock()
 
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -109,6 +112,187 @@ class TestVaultIndexer:
             # Excalidraw files should be ignored
             assert "drawing.excalidraw.md" not in file_names
 
+    @patch("obsidian_rag_mcp.rag.indexer.create_embedder")
+    @patch("obsidian_rag_mcp.rag.indexer.chromadb.PersistentClient")
+    def test_check_file(self, mock_chroma, mock_embedder):
+        """Test the read/hash stage returns path, content and file record."""
+        mock_client = Mock()
+        mock_chroma.return_value = mock_client
+        mock_client.get_or_create_collection.return_value = Mock()
+        mock_client.list_collections.return_value = []
+        mock_embedder.return_value = Mock()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            vault = Path(tmpdir)
+            (vault / "sub").mkdir()
+            (vault / "sub" / "note.md").write_text("# Note")
+            (vault / "binary.md").write_bytes(b"\xff\xfe\x00")
+
+            config = IndexerConfig(
+                vault_path=str(vault),
+                persist_dir=str(vault / ".chroma"),
+                jobs=2,
+            )
+            indexer = VaultIndexer(config, api_key="test-key")
+            assert indexer.jobs == 2
+
+            rel_path, content, record = indexer._check_file(vault / "sub" / "note.md")
+            assert rel_path == str(Path("sub") / "note.md")
+            assert content == "# Note"
+            assert record.content_hash == indexer._compute_hash("# Note")
+            assert record.size == len("# Note")
+
+            # Undecodable files are skipped rather than failing the run
+            assert indexer._check_file(vault / "binary.md") is None
+
+    @patch("obsidian_rag_mcp.rag.indexer.create_embedder")
+    @patch("obsidian_rag_mcp.rag.indexer.chromadb.PersistentClient")
+    def test_unchanged_stat_skips_read(self, mock_chroma, mock_embedder):
+        """Test files with an unchanged stat signature are not re-read."""
+        mock_client = Mock()
+        mock_chroma.return_value = mock_client
+        mock_client.get_or_create_collection.return_value = Mock()
+        mock_client.list_collections.return_value = []
+        mock_embedder.return_value = Mock()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            vault = Path(tmpdir)
+            note = vault / "note.md"
+            note.write_text("# Note")
+
+            config = IndexerConfig(
+                vault_path=str(vault),
+                persist_dir=str(vault / ".chroma"),
+            )
+            indexer = VaultIndexer(config, api_key="test-key")
+            _, _, record = indexer._check_file(note)
+
+            with patch.object(Path, "read_text") as mock_read:
+                result = indexer._check_file(note, previous=record)
+                assert result == ("note.md", None, record)
+                mock_read.assert_not_called()
+
+            # Force always reads
+            _, content, _ = indexer._check_file(note, previous=record, force=True)
+            assert content == "# Note"
+
+            # A stat change falls back to reading and hashing
+            note.write_text("# Note, edited")
+            _, content, new_record = indexer._check_file(note, previous=record)
+            assert content == "# Note, edited"
+            assert new_record.content_hash != record.content_hash
+
+    @patch("obsidian_rag_mcp.rag.indexer.create_embedder")
+    @patch("obsidian_rag_mcp.rag.indexer.chromadb.PersistentClient")
+    def test_chunk_batches_span_files(self, mock_chroma, mock_embedder):
+        """Test the chunking stage yields fixed-size batches across files."""
+        mock_client = Mock()
+        mock_chroma.return_value = mock_client
+        mock_client.get_or_create_collection.return_value = Mock()
+        mock_client.list_collections.return_value = []
+        mock_embedder.return_value = Mock()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            vault = Path(tmpdir)
+            for i in range(3):
+                (vault / f"note{i}.md").write_text(
+                    f"# Note {i}\n\nIntro\n\n## A\n\nFirst\n\n## B\n\nSecond"
+                )
+
+            config = IndexerConfig(
+                vault_path=str(vault),
+                persist_dir=str(vault / ".chroma"),
+                pipeline_batch_size=2,
+            )
+            indexer = VaultIndexer(config, api_key="test-key")
+
+            batches = list(indexer._iter_chunk_batches(indexer.scan_vault()))
+
+            # 3 files x 3 sections = 9 chunks -> 2, 2, 2, 2, 1
+            assert [len(b.chunks) for b in batches] == [2, 2, 2, 2, 1]
+            # Each file is completed in the batch holding its last chunk
+            completed = [[path for path, _ in b.completed] for b in batches]
+            assert completed == [[], ["note0.md"], ["note1.md"], [], ["note2.md"]]
+
+    @patch("obsidian_rag_mcp.rag.indexer.create_embedder")
+    @patch("obsidian_rag_mcp.rag.indexer.chromadb.PersistentClient")
+    def test_move_file_chunks(self, mock_chroma, mock_embedder):
+        """Test moving re-keys chunks and conclusions without embedding."""
+        mock_client = Mock()
+        mock_chroma.return_value = mock_client
+        mock_collection = Mock()
+        mock_client.get_or_create_collection.return_value = mock_collection
+        mock_client.list_collections.return_value = []
+        mock_emb = Mock()
+        mock_embedder.return_value = mock_emb
+
+        mock_collection.get.return_value = {
+            "ids": ["old/a.md#abc", "old/a.md#def"],
+            "embeddings": [[0.1], [0.2]],
+            "documents": ["one", "two"],
+            "metadatas": [
+                {"source_path": "old/a.md", "chunk_index": 0},
+                {"source_path": "old/a.md", "chunk_index": 1},
+            ],
+        }
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config = IndexerConfig(
+                vault_path=tmpdir, persist_dir=str(Path(tmpdir) / ".chroma")
+            )
+            indexer = VaultIndexer(config, api_key="test-key")
+            indexer.conclusion_store = Mock()
+
+            indexer._move_file_chunks("old/a.md", "new/a.md")
+
+        upsert = mock_collection.upsert.call_args.kwargs
+        assert upsert["ids"] == ["new/a.md#abc", "new/a.md#def"]
+        assert upsert["embeddings"] == [[0.1], [0.2]]
+        assert all(m["source_path"] == "new/a.md" for m in upsert["metadatas"])
+        mock_collection.delete.assert_called_once_with(
+            ids=["old/a.md#abc", "old/a.md#def"]
+        )
+        indexer.conclusion_store.move_source.assert_called_once_with(
+            "old/a.md",
+            "new/a.md",
+            {"old/a.md#abc": "new/a.md#abc", "old/a.md#def": "new/a.md#def"},
+        )
+        mock_emb.embed_texts.assert_not_called()
+
+    @patch("obsidian_rag_mcp.rag.indexer.create_embedder")
+    @patch("obsidian_rag_mcp.rag.indexer.chromadb.PersistentClient")
+    def test_delete_sources_batches(self, mock_chroma, mock_embedder):
+        """Test files are deleted with one $in filter per batch."""
+        mock_client = Mock()
+        mock_chroma.return_value = mock_client
+        mock_collection = Mock()
+        mock_client.get_or_create_collection.return_value = mock_collection
+        mock_client.list_collections.return_value = []
+        mock_embedder.return_value = Mock()
+
+        # The second batch fails and is left for the next run
+        mock_collection.delete.side_effect = [None, RuntimeError("locked"), None]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config = IndexerConfig(
+                vault_path=tmpdir,
+                persist_dir=str(Path(tmpdir) / ".chroma"),
+                delete_batch_size=2,
+            )
+            indexer = VaultIndexer(config, api_key="test-key")
+            indexer.conclusion_store = Mock()
+
+            deleted = indexer._delete_sources(["a.md", "b.md", "c.md", "d.md", "e.md"])
+
+        assert deleted == ["a.md", "b.md", "e.md"]
+        filters = [c.kwargs["where"] for c in mock_collection.delete.call_args_list]
+        assert filters == [
+            {"source_path": {"$in": ["a.md", "b.md"]}},
+            {"source_path": {"$in": ["c.md", "d.md"]}},
+            {"source_path": {"$in": ["e.md"]}},
+        ]
+        assert indexer.conclusion_store.delete_by_sources.call_count == 2
+
 
 class TestIndexerConfig:
     """Test IndexerConfig defaults and behavior."""
@@ -121,6 +305,40 @@ class TestIndexerConfig:
         assert ".trash/*" in config.ignore_patterns
         assert "*.excalidraw.md" in config.ignore_patterns
 
+    def test_jobs_default_and_validation(self):
+        """Test jobs defaults to auto and rejects non-positive values."""
+        config = IndexerConfig(vault_path="/tmp/vault")
+        assert config.jobs is None
+
+        with pytest.raises(ValueError, match="jobs must be at least 1"):
+            IndexerConfig(vault_path="/tmp/vault", jobs=0)
+
+    def test_chunk_workers_validation(self):
+        """Test chunking runs in-process by default and rejects negative workers."""
+        assert IndexerConfig(vault_path="/tmp/vault").chunk_workers == 0
+        with pytest.raises(ValueError, match="chunk_workers"):
+            IndexerConfig(vault_path="/tmp/vault", chunk_workers=-1)
+
+    def test_pipeline_validation(self):
+        """Test pipeline batch and queue sizes must be positive."""
+        with pytest.raises(ValueError, match="pipeline_batch_size"):
+            IndexerConfig(vault_path="/tmp/vault", pipeline_batch_size=0)
+        with pytest.raises(ValueError, match="pipeline_queue_size"):
+            IndexerConfig(vault_path="/tmp/vault", pipeline_queue_size=0)
+        with pytest.raises(ValueError, match="rebuild_batch_size"):
+            IndexerConfig(vault_path="/tmp/vault", rebuild_batch_size=0)
+
+    def test_embedding_cache_validation(self):
+        """Test the embedding cache can be disabled but not sized negatively."""
+        assert IndexerConfig(vault_path="/tmp/vault", embedding_cache_size=0)
+        with pytest.raises(ValueError, match="embedding_cache_size"):
+            IndexerConfig(vault_path="/tmp/vault", embedding_cache_size=-1)
+
+    def test_delete_batch_size_validation(self):
+        """Test the bulk delete batch size must be positive."""
+        with pytest.raises(ValueError, match="delete_batch_size"):
+            IndexerConfig(vault_path="/tmp/vault", delete_batch_size=0)
+
     def test_reasoning_disabled_by_default(self):
         """Test reasoning is disabled by default."""
         config = IndexerConfig(vault_path="/tmp/vault")
@@ -136,13 +354,14 @@ class TestIndexerConfig:
 class TestReasoningIndexer:
     """Test indexer with reasoning layer enabled."""
 
-    @patch("obsidian_rag_mcp.rag.indexer.OpenAIEmbedder")
+    @patch("obsidian_rag_mcp.rag.indexer.create_embedder")
     @patch("obsidian_rag_mcp.rag.indexer.chromadb.PersistentClient")
     def test_reasoning_not_initialized_when_disabled(self, mock_chroma, mock_embedder):
         """Test reasoning components not initialized when disabled."""
         mock_client = Mock()
         mock_chroma.return_value = mock_client
         mock_client.get_or_create_collection.return_value = Mock()
+        mock_client.list_collections.return_value = []
         mock_embedder.return_value = Mock()
 
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -160,7 +379,7 @@ class TestReasoningIndexer:
             assert indexer.conclusion_store is None
 
     @patch("obsidian_rag_mcp.reasoning.extractor._create_openai_client")
-    @patch("obsidian_rag_mcp.rag.indexer.OpenAIEmbedder")
+    @patch("obsidian_rag_mcp.rag.indexer.create_embedder")
     @patch("obsidian_rag_mcp.rag.indexer.chromadb.PersistentClient")
     def test_reasoning_initialized_when_enabled(
         self, mock_chroma, mock_embedder, mock_openai
@@ -171,6 +390,7 @@ class TestReasoningIndexer:
         mock_collection = Mock()
         mock_collection.count.return_value = 0
         mock_client.get_or_create_collection.return_value = mock_collection
+        mock_client.list_collections.return_value = []
         mock_embedder.return_value = Mock()
 
         mock_openai_instance = Mock()
@@ -192,7 +412,7 @@ class TestReasoningIndexer:
             assert indexer.conclusion_store is not None
 
     @patch("obsidian_rag_mcp.reasoning.extractor._create_openai_client")
-    @patch("obsidian_rag_mcp.rag.indexer.OpenAIEmbedder")
+    @patch("obsidian_rag_mcp.rag.indexer.create_embedder")
     @patch("obsidian_rag_mcp.rag.indexer.chromadb.PersistentClient")
     def test_index_stats_include_reasoning_info(
         self, mock_chroma, mock_embedder, mock_openai
@@ -203,6 +423,7 @@ class TestReasoningIndexer:
         mock_collection = Mock()
         mock_collection.count.return_value = 5
         mock_client.get_or_create_collection.return_value = mock_collection
+        mock_client.list_collections.return_value = []
         mock_embedder.return_value = Mock()
 
         mock_openai_instance = Mock()
@@ -227,7 +448,7 @@ class TestReasoningIndexer:
             assert "total_conclusions" in stats_dict
             assert "reasoning_enabled" in stats_dict
 
-    @patch("obsidian_rag_mcp.rag.indexer.OpenAIEmbedder")
+    @patch("obsidian_rag_mcp.rag.indexer.create_embedder")
     @patch("obsidian_rag_mcp.rag.indexer.chromadb.PersistentClient")
     def test_index_stats_exclude_reasoning_when_disabled(
         self, mock_chroma, mock_embedder
@@ -238,6 +459,7 @@ class TestReasoningIndexer:
         mock_collection = Mock()
         mock_collection.count.return_value = 5
         mock_client.get_or_create_collection.return_value = mock_collection
+        mock_client.list_collections.return_value = []
         mock_embedder.return_value = Mock()
 
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -7,12 +7,17 @@ ChromaDB may hold file locks, so we use ignore_errors for cleanup.
 """
 
 import gc
+import os
 import shutil
 import tempfile
 from pathlib import Path
 from unittest.mock import Mock, patch
 
+import httpx
+import numpy as np
 import pytest
+from chromadb.api.models.Collection import Collection
+from openai import BadRequestError
 
 from obsidian_rag_mcp.rag.engine import RAGEngine
 from obsidian_rag_mcp.rag.indexer import IndexerConfig, VaultIndexer
@@ -114,6 +119,205 @@ TCP/IP is the foundation of internet communication.
         sources = [r.source_path for r in results.results]
         assert "database.md" in sources
 
+    def test_streaming_pipeline_small_batches(self, mock_openai_embeddings, temp_dirs):
+        """Index with one chunk per pipeline batch and verify every chunk is stored."""
+        vault_dir, persist_dir = temp_dirs
+        vault_path = Path(vault_dir)
+
+        for i in range(5):
+            (vault_path / f"note{i}.md").write_text(
+                f"# Note {i}\n\nIntro {i}\n\n## Details\n\nMore about {i}."
+            )
+
+        config = IndexerConfig(
+            vault_path=str(vault_path),
+            persist_dir=persist_dir,
+            pipeline_batch_size=1,
+            pipeline_queue_size=1,
+        )
+        indexer = VaultIndexer(config, api_key="test-key")
+        stats = indexer.index_vault()
+
+        assert stats.total_files == 5
+        assert stats.total_chunks == 10
+
+    def test_chunk_workers_match_in_process(self, mock_openai_embeddings, temp_dirs):
+        """Chunking in worker processes stores the same chunks as in-process."""
+        vault_dir, persist_dir = temp_dirs
+        vault_path = Path(vault_dir)
+
+        for i in range(7):
+            (vault_path / f"note{i}.md").write_text(
+                f"---\ntags: [n{i}]\n---\n# Note {i}\n\nIntro {i}\n\n"
+                f"## Details\n\nMore about {i}. #inline"
+            )
+        (vault_path / "empty.md").write_text("")
+
+        def index(chunk_workers: int, persist_subdir: str) -> dict:
+            config = IndexerConfig(
+                vault_path=str(vault_path),
+                persist_dir=str(Path(persist_dir) / persist_subdir),
+                chunk_workers=chunk_workers,
+                delete_batch_size=3,  # Several groups in flight
+                embedding_cache_size=0,
+            )
+            indexer = VaultIndexer(config, api_key="test-key")
+            stats = indexer.index_vault(force=True)
+            assert stats.total_files == 8
+            stored = indexer.collection.get(include=["documents", "metadatas"])
+            return {
+                chunk_id: (doc, meta)
+                for chunk_id, doc, meta in zip(
+                    stored["ids"], stored["documents"], stored["metadatas"], strict=True
+                )
+            }
+
+        in_process = index(0, "in_process")
+        assert len(in_process) == 15
+        assert index(2, "workers") == in_process
+
+    def test_chunk_diff_rewrites_only_changed_chunks(
+        self, mock_openai_embeddings, temp_dirs
+    ):
+        """Inserting a section embeds only that section and reindexes the rest."""
+        mock_embedder, _ = mock_openai_embeddings
+        vault_dir, persist_dir = temp_dirs
+        note_path = Path(vault_dir) / "note.md"
+        body = "## Alpha\n\nFirst section.\n\n## Beta\n\nSecond section."
+        note_path.write_text(body)
+
+        # No embedding cache, so API calls show exactly what was re-embedded
+        config = IndexerConfig(
+            vault_path=vault_dir, persist_dir=persist_dir, embedding_cache_size=0
+        )
+        indexer = VaultIndexer(config, api_key="test-key")
+        indexer.index_vault()
+        old_ids = set(indexer.collection.get()["ids"])
+
+        mock_embedder.embeddings.create.reset_mock()
+        note_path.write_text("## Intro\n\nNew section.\n\n" + body)
+        stats = indexer.index_vault()
+
+        assert stats.total_chunks == 3
+        assert mock_embedder.embeddings.create.call_count == 1
+        assert mock_embedder.embeddings.create.call_args.kwargs["input"] == [
+            "New section."
+        ]
+        stored = indexer.collection.get()
+        assert old_ids < set(stored["ids"])
+        # Kept chunks had their positions updated in place
+        indexes = {m["heading"]: m["chunk_index"] for m in stored["metadatas"]}
+        assert indexes == {"Intro": 0, "Alpha": 1, "Beta": 2}
+
+        # Removing a section deletes just its chunk
+        mock_embedder.embeddings.create.reset_mock()
+        note_path.write_text("## Intro\n\nNew section.\n\n## Beta\n\nSecond section.")
+        stats = indexer.index_vault()
+
+        assert stats.total_chunks == 2
+        assert mock_embedder.embeddings.create.call_count == 0
+
+    def test_moved_note_keeps_embeddings(self, mock_openai_embeddings, temp_dirs):
+        """Moving a note re-keys its chunks instead of re-embedding them."""
+        mock_embedder, _ = mock_openai_embeddings
+        vault_dir, persist_dir = temp_dirs
+        vault_path = Path(vault_dir)
+        (vault_path / "inbox").mkdir()
+        (vault_path / "inbox" / "idea.md").write_text(
+            "# Idea\n\nIntro.\n\n## Details\n\nMore."
+        )
+
+        config = IndexerConfig(
+            vault_path=vault_dir, persist_dir=persist_dir, embedding_cache_size=0
+        )
+        indexer = VaultIndexer(config, api_key="test-key")
+        indexer.index_vault()
+
+        (vault_path / "projects").mkdir()
+        (vault_path / "inbox" / "idea.md").rename(vault_path / "projects" / "idea.md")
+        mock_embedder.embeddings.create.reset_mock()
+        stats = indexer.index_vault()
+
+        assert mock_embedder.embeddings.create.call_count == 0
+        assert stats.total_chunks == 2
+        stored = indexer.collection.get()
+        assert all(cid.startswith("projects/idea.md#") for cid in stored["ids"])
+        assert {m["source_path"] for m in stored["metadatas"]} == {"projects/idea.md"}
+        assert indexer.manifest.get_file("inbox/idea.md") is None
+        assert indexer.manifest.get_file("projects/idea.md") is not None
+
+    def test_renamed_note_title_follows_file_name(
+        self, mock_openai_embeddings, temp_dirs
+    ):
+        """A title taken from the file name is updated by the move itself."""
+        mock_embedder, _ = mock_openai_embeddings
+        vault_dir, persist_dir = temp_dirs
+        vault_path = Path(vault_dir)
+        (vault_path / "draft.md").write_text("No heading here.\n\n## Part\n\nMore.")
+        (vault_path / "titled.md").write_text("# Kept Title\n\nBody.")
+
+        config = IndexerConfig(
+            vault_path=vault_dir,
+            persist_dir=persist_dir,
+            embedding_cache_size=0,
+            chunk_diff=False,
+        )
+        indexer = VaultIndexer(config, api_key="test-key")
+        indexer.index_vault()
+
+        (vault_path / "draft.md").rename(vault_path / "final.md")
+        (vault_path / "titled.md").rename(vault_path / "renamed.md")
+        mock_embedder.embeddings.create.reset_mock()
+        indexer.index_vault()
+
+        assert mock_embedder.embeddings.create.call_count == 0
+        titles = {
+            m["source_path"]: m["title"] for m in indexer.collection.get()["metadatas"]
+        }
+        assert titles == {"final.md": "final", "renamed.md": "Kept Title"}
+
+    def test_index_paths(self, mock_openai_embeddings, temp_dirs):
+        """index_paths updates only the given files and directories."""
+        mock_embedder, _ = mock_openai_embeddings
+        vault_dir, persist_dir = temp_dirs
+        vault_path = Path(vault_dir)
+        (vault_path / "inbox").mkdir()
+        (vault_path / "a.md").write_text("# A\n\nFirst.")
+        (vault_path / "b.md").write_text("# B\n\nSecond.")
+        (vault_path / "inbox" / "c.md").write_text("# C\n\nThird.")
+
+        config = IndexerConfig(
+            vault_path=vault_dir, persist_dir=persist_dir, embedding_cache_size=0
+        )
+        indexer = VaultIndexer(config, api_key="test-key")
+        indexer.index_vault()
+        mock_embedder.embeddings.create.reset_mock()
+
+        # Edit a, delete b, and add a new file that isn't reported
+        (vault_path / "a.md").write_text("# A\n\nEdited.")
+        (vault_path / "b.md").unlink()
+        (vault_path / "unreported.md").write_text("# U\n\nNot reported.")
+
+        stats = indexer.index_paths(["a.md", str(vault_path / "b.md")])
+
+        assert mock_embedder.embeddings.create.call_count == 1
+        assert stats.total_files == 2
+        sources = {m["source_path"] for m in indexer.collection.get()["metadatas"]}
+        assert sources == {"a.md", os.path.join("inbox", "c.md")}
+
+        # Moving a directory is reported as the old and new directory paths
+        (vault_path / "inbox").rename(vault_path / "archive")
+        mock_embedder.embeddings.create.reset_mock()
+        indexer.index_paths([vault_path / "inbox", vault_path / "archive"])
+
+        assert mock_embedder.embeddings.create.call_count == 0
+        sources = {m["source_path"] for m in indexer.collection.get()["metadatas"]}
+        assert sources == {"a.md", os.path.join("archive", "c.md")}
+
+        # Paths outside the vault and ignored paths are skipped
+        stats = indexer.index_paths(["/elsewhere/x.md", ".obsidian/y.md"])
+        assert stats.total_files == 2
+
     def test_incremental_index_updates(self, mock_openai_embeddings, temp_dirs):
         """Modify a file and verify new content is searchable after reindex."""
         vault_dir, persist_dir = temp_dirs
@@ -208,6 +412,215 @@ TCP/IP is the foundation of internet communication.
         assert "keeper.md" in sources2
         assert "deletable.md" not in sources2
 
+    def test_bulk_deletes_in_small_batches(self, mock_openai_embeddings, temp_dirs):
+        """Stale and changed files are cleared in $in batches across files."""
+        vault_dir, persist_dir = temp_dirs
+        vault_path = Path(vault_dir)
+        for i in range(5):
+            (vault_path / f"note{i}.md").write_text(f"# Note {i}\n\nBody {i}.")
+
+        config = IndexerConfig(
+            vault_path=vault_dir,
+            persist_dir=persist_dir,
+            delete_batch_size=2,
+            chunk_diff=False,
+        )
+        indexer = VaultIndexer(config, api_key="test-key")
+        indexer.index_vault()
+
+        for i in range(3):
+            (vault_path / f"note{i}.md").unlink()
+        (vault_path / "note3.md").write_text("# Note 3\n\nRewritten.")
+        stats = indexer.index_vault()
+
+        stored = indexer.collection.get()
+        assert stats.total_chunks == 2
+        assert sorted(m["source_path"] for m in stored["metadatas"]) == [
+            "note3.md",
+            "note4.md",
+        ]
+        assert "Rewritten." in " ".join(stored["documents"])
+        assert indexer.manifest.file_count() == 2
+
+    def test_rejected_chunk_is_skipped(self, mock_openai_embeddings, temp_dirs):
+        """A chunk the API rejects is skipped and recorded; the run completes."""
+        mock_embedder, _ = mock_openai_embeddings
+        vault_dir, persist_dir = temp_dirs
+        vault_path = Path(vault_dir)
+
+        for i in range(4):
+            (vault_path / f"note{i}.md").write_text(f"# Note {i}\n\nBody {i}.")
+        (vault_path / "note2.md").write_text(
+            "# Note 2\n\nPoisoned body.\n\n## More\n\nFine."
+        )
+
+        create = mock_embedder.embeddings.create.side_effect
+
+        def filtering_create(**kwargs):
+            response = create(**kwargs)
+            response.data = [
+                item
+                for item, text in zip(response.data, kwargs["input"], strict=True)
+                if "Poisoned" not in text
+            ]
+            return response
+
+        mock_embedder.embeddings.create.side_effect = filtering_create
+
+        config = IndexerConfig(vault_path=str(vault_path), persist_dir=persist_dir)
+        indexer = VaultIndexer(config, api_key="test-key")
+        stats = indexer.index_vault()
+
+        assert stats.total_chunks == 4
+        assert stats.skipped_chunks == 1
+        assert stats.to_dict()["skipped_chunks"] == 1
+        [(chunk_id, path, reason)] = indexer.manifest.skipped_chunks()
+        assert path == "note2.md"
+        assert chunk_id.startswith("note2.md#")
+        assert "embeddings" in reason
+
+        # Not retried until the note changes; fixing it clears the record
+        assert indexer.index_vault().skipped_chunks == 0
+        (vault_path / "note2.md").write_text("# Note 2\n\nFixed body.")
+        stats = indexer.index_vault()
+        assert stats.total_chunks == 4
+        assert indexer.manifest.skipped_chunks() == []
+
+    def test_fully_rejected_file_is_retried(self, mock_openai_embeddings, temp_dirs):
+        """A file whose chunks were all rejected isn't recorded as indexed."""
+        mock_embedder, _ = mock_openai_embeddings
+        vault_dir, persist_dir = temp_dirs
+        vault_path = Path(vault_dir)
+
+        (vault_path / "good.md").write_text("# Good\n\nBody.")
+        (vault_path / "bad.md").write_text("# Bad\n\nPoisoned body.")
+
+        create = mock_embedder.embeddings.create.side_effect
+
+        def filtering_create(**kwargs):
+            response = create(**kwargs)
+            response.data = [
+                item
+                for item, text in zip(response.data, kwargs["input"], strict=True)
+                if "Poisoned" not in text
+            ]
+            return response
+
+        mock_embedder.embeddings.create.side_effect = filtering_create
+
+        config = IndexerConfig(vault_path=str(vault_path), persist_dir=persist_dir)
+        indexer = VaultIndexer(config, api_key="test-key")
+        assert indexer.index_vault().skipped_chunks == 1
+        assert indexer.manifest.get_file("good.md") is not None
+        assert indexer.manifest.get_file("bad.md") is None
+
+        # Retried on the next run, and recorded once it embeds
+        mock_embedder.embeddings.create.side_effect = create
+        stats = indexer.index_vault()
+        assert stats.skipped_chunks == 0
+        assert stats.total_chunks == 2
+        assert indexer.manifest.get_file("bad.md") is not None
+
+    def test_request_errors_fail_the_run(self, mock_openai_embeddings, temp_dirs):
+        """An error about the request itself fails the run without recording files."""
+        mock_embedder, _ = mock_openai_embeddings
+        vault_dir, persist_dir = temp_dirs
+        vault_path = Path(vault_dir)
+
+        for i in range(20):
+            (vault_path / f"note{i}.md").write_text(
+                f"# Note {i}\n\nBody {i}.\n\n## More\n\nDetails {i}."
+            )
+        mock_embedder.embeddings.create.side_effect = BadRequestError(
+            "This model does not support specifying dimensions.",
+            response=httpx.Response(
+                400, request=httpx.Request("POST", "https://api.openai.com")
+            ),
+            body={"code": None, "param": None},
+        )
+
+        config = IndexerConfig(vault_path=str(vault_path), persist_dir=persist_dir)
+        indexer = VaultIndexer(config, api_key="test-key")
+        with pytest.raises(BadRequestError):
+            indexer.index_vault()
+
+        assert mock_embedder.embeddings.create.call_count == 1
+        assert indexer.manifest.file_count() == 0
+        assert indexer.manifest.skipped_chunks() == []
+
+    def test_duplicate_chunks_embedded_once(self, mock_openai_embeddings, temp_dirs):
+        """Identical sections across notes share one embedding request input."""
+        mock_embedder, _ = mock_openai_embeddings
+        vault_dir, persist_dir = temp_dirs
+        vault_path = Path(vault_dir)
+
+        boilerplate = (
+            "## Action Items\n\nFollow up with the owning team and file tickets."
+        )
+        for i in range(3):
+            (vault_path / f"rca{i}.md").write_text(
+                f"# Incident {i}\n\nRoot cause number {i}.\n\n{boilerplate}"
+            )
+
+        config = IndexerConfig(
+            vault_path=str(vault_path),
+            persist_dir=persist_dir,
+            embedding_cache_size=0,
+        )
+        indexer = VaultIndexer(config, api_key="test-key")
+        stats = indexer.index_vault()
+
+        sent = [
+            text
+            for call in mock_embedder.embeddings.create.call_args_list
+            for text in call.kwargs["input"]
+        ]
+        assert len(sent) == len(set(sent))
+        assert stats.deduplicated_chunks == stats.total_chunks - len(sent)
+        assert stats.deduplicated_chunks == 2
+        assert stats.to_dict()["deduplicated_chunks"] == 2
+
+        # Every copy is stored, with the same embedding
+        stored = indexer.collection.get(include=["embeddings", "documents"])
+        copies = [
+            emb
+            for doc, emb in zip(stored["documents"], stored["embeddings"], strict=True)
+            if "Follow up" in doc
+        ]
+        assert len(copies) == 3
+        assert all(np.array_equal(copies[0], emb) for emb in copies[1:])
+
+    def test_duplicates_across_batches_embedded_once(
+        self, mock_openai_embeddings, temp_dirs
+    ):
+        """Chunks equal once cleaned are embedded once across pipeline batches."""
+        mock_embedder, _ = mock_openai_embeddings
+        vault_dir, persist_dir = temp_dirs
+        vault_path = Path(vault_dir)
+
+        (vault_path / "a.md").write_text("Shared checklist.\nStep two.")
+        # Trailing whitespace is dropped before embedding
+        (vault_path / "b.md").write_text("Shared checklist.  \nStep two.\t")
+        (vault_path / "c.md").write_text("Something else.")
+
+        config = IndexerConfig(
+            vault_path=str(vault_path),
+            persist_dir=persist_dir,
+            embedding_cache_size=0,
+            pipeline_batch_size=1,
+        )
+        indexer = VaultIndexer(config, api_key="test-key")
+        stats = indexer.index_vault()
+
+        sent = [
+            text
+            for call in mock_embedder.embeddings.create.call_args_list
+            for text in call.kwargs["input"]
+        ]
+        assert len(sent) == 2
+        assert stats.total_chunks == 3
+        assert stats.deduplicated_chunks == 1
+
     def test_search_by_tag_filters_correctly(self, mock_openai_embeddings, temp_dirs):
         """Test that tag-based filtering works correctly."""
         vault_dir, persist_dir = temp_dirs
@@ -267,6 +680,318 @@ How to cook pasta.
         assert len(all_sources) == 3
 
 
+class TestOfflineBackend:
+    """Test indexing and search without network access."""
+
+    def test_index_then_search_offline(self, temp_dirs, monkeypatch):
+        """The hashing backend indexes and searches with no API key."""
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        monkeypatch.delenv("AZURE_OPENAI_ENDPOINT", raising=False)
+        monkeypatch.setenv("EMBEDDING_BACKEND", "hashing")
+        vault_dir, persist_dir = temp_dirs
+        vault_path = Path(vault_dir)
+
+        (vault_path / "k8s.md").write_text(
+            "# Kubernetes\n\nDeployment rollout strategy for the cluster."
+        )
+        (vault_path / "pie.md").write_text("# Baking\n\nApple pie with cinnamon.")
+
+        engine = RAGEngine(vault_path=vault_dir, persist_dir=persist_dir)
+        stats = engine.index()
+        assert stats.total_chunks == 2
+        # No embedding cache for local embeddings
+        assert engine.indexer.embedding_cache is None
+
+        response = engine.search("kubernetes rollout", top_k=1)
+        assert response.results[0].source_path == "k8s.md"
+
+
+class TestCheckpointing:
+    """Test that interrupted runs keep their progress."""
+
+    @staticmethod
+    def _write_notes(vault_path: Path, count: int) -> None:
+        for i in range(count):
+            (vault_path / f"note{i}.md").write_text(f"# Note {i}\n\nBody of note {i}.")
+
+    @staticmethod
+    def _fail_on_call(mock_embedder, call_number: int) -> None:
+        """Make the embeddings API fail on the given call."""
+        create = mock_embedder.embeddings.create.side_effect
+        calls = [0]
+
+        def flaky_create(**kwargs):
+            calls[0] += 1
+            if calls[0] == call_number:
+                raise RuntimeError("embedding service unavailable")
+            return create(**kwargs)
+
+        mock_embedder.embeddings.create.side_effect = flaky_create
+
+    def test_interrupted_run_keeps_stored_files(
+        self, mock_openai_embeddings, temp_dirs
+    ):
+        """Files stored before a failure are not re-embedded by the next run."""
+        mock_embedder, _ = mock_openai_embeddings
+        vault_dir, persist_dir = temp_dirs
+        vault_path = Path(vault_dir)
+        self._write_notes(vault_path, 3)
+
+        config = IndexerConfig(
+            vault_path=str(vault_path),
+            persist_dir=persist_dir,
+            pipeline_batch_size=1,
+            pipeline_queue_size=1,
+        )
+        self._fail_on_call(mock_embedder, 2)
+        with pytest.raises(RuntimeError, match="unavailable"):
+            VaultIndexer(config, api_key="test-key").index_vault()
+
+        mock_embedder.embeddings.create.reset_mock()
+        stats = VaultIndexer(config, api_key="test-key").index_vault()
+
+        # Only the two files that weren't stored are embedded again
+        assert mock_embedder.embeddings.create.call_count == 2
+        assert stats.total_chunks == 3
+
+    def test_resume_force_run(self, mock_openai_embeddings, temp_dirs):
+        """--resume continues an interrupted force reindex."""
+        mock_embedder, _ = mock_openai_embeddings
+        vault_dir, persist_dir = temp_dirs
+        vault_path = Path(vault_dir)
+        self._write_notes(vault_path, 4)
+
+        # Without the embedding cache, API calls count the files actually redone
+        config = IndexerConfig(
+            vault_path=str(vault_path),
+            persist_dir=persist_dir,
+            pipeline_batch_size=1,
+            pipeline_queue_size=1,
+            rebuild_batch_size=1,
+            embedding_cache_size=0,
+        )
+        VaultIndexer(config, api_key="test-key").index_vault()
+
+        # Interrupt a force reindex after two files are stored
+        self._fail_on_call(mock_embedder, 3)
+        with pytest.raises(RuntimeError, match="unavailable"):
+            VaultIndexer(config, api_key="test-key").index_vault(force=True)
+
+        mock_embedder.embeddings.create.reset_mock()
+        indexer = VaultIndexer(config, api_key="test-key")
+        stats = indexer.index_vault(resume=True)
+
+        assert mock_embedder.embeddings.create.call_count == 2
+        assert stats.total_chunks == 4
+        assert indexer.manifest.force_run_started_at() is None
+
+    def test_force_reindex_reuses_cached_embeddings(
+        self, mock_openai_embeddings, temp_dirs
+    ):
+        """A force reindex after wiping the collection makes no API calls."""
+        mock_embedder, _ = mock_openai_embeddings
+        vault_dir, persist_dir = temp_dirs
+        vault_path = Path(vault_dir)
+        self._write_notes(vault_path, 3)
+
+        config = IndexerConfig(vault_path=str(vault_path), persist_dir=persist_dir)
+        VaultIndexer(config, api_key="test-key").index_vault()
+
+        indexer = VaultIndexer(config, api_key="test-key")
+        indexer.delete_index()
+        mock_embedder.embeddings.create.reset_mock()
+        stats = indexer.index_vault(force=True)
+
+        assert mock_embedder.embeddings.create.call_count == 0
+        assert stats.total_chunks == 3
+
+        # Editing one note only embeds the changed chunk
+        (vault_path / "note1.md").write_text("# Note 1\n\nRewritten body.")
+        indexer.index_vault()
+        assert mock_embedder.embeddings.create.call_count == 1
+        assert mock_embedder.embeddings.create.call_args.kwargs["input"] == [
+            "# Note 1\n\nRewritten body."
+        ]
+
+    def test_force_reindex_swaps_in_new_collection(
+        self, mock_openai_embeddings, temp_dirs
+    ):
+        """A force reindex builds a separate collection and swaps it in."""
+        vault_dir, persist_dir = temp_dirs
+        vault_path = Path(vault_dir)
+        self._write_notes(vault_path, 3)
+
+        config = IndexerConfig(vault_path=str(vault_path), persist_dir=persist_dir)
+        indexer = VaultIndexer(config, api_key="test-key")
+        indexer.index_vault()
+        old_collection = indexer.collection
+
+        (vault_path / "note2.md").unlink()
+        store_chunks = indexer._store_chunks
+        live_counts = []
+
+        def spy(chunks, embeddings, collection=None):
+            # The live collection is untouched while the build is loading
+            live_counts.append(indexer.collection.count())
+            store_chunks(chunks, embeddings, collection)
+
+        with patch.object(indexer, "_store_chunks", side_effect=spy):
+            stats = indexer.index_vault(force=True)
+
+        assert live_counts == [3]
+        assert stats.total_chunks == 2
+        assert indexer.collection.id != old_collection.id
+        assert indexer.collection.name == config.collection_name
+        names = {c.name for c in indexer.chroma_client.list_collections()}
+        assert names == {config.collection_name}
+        assert set(indexer.manifest.file_records()) == {"note0.md", "note1.md"}
+
+    def test_interrupted_swap_restores_old_collection(
+        self, mock_openai_embeddings, temp_dirs
+    ):
+        """If a swap dies between renames, the next run restores the old index."""
+        vault_dir, persist_dir = temp_dirs
+        vault_path = Path(vault_dir)
+        self._write_notes(vault_path, 2)
+
+        config = IndexerConfig(vault_path=str(vault_path), persist_dir=persist_dir)
+        name = config.collection_name
+        VaultIndexer(config, api_key="test-key").index_vault()
+
+        modify = Collection.modify
+
+        def crash_before_rename_in(collection, name=None, **kwargs):
+            if name == config.collection_name:
+                raise RuntimeError("killed")
+            modify(collection, name=name, **kwargs)
+
+        (vault_path / "note2.md").write_text("# Note 2\n\nBody 2.")
+        with patch.object(Collection, "modify", crash_before_rename_in):
+            with pytest.raises(RuntimeError, match="killed"):
+                VaultIndexer(config, api_key="test-key").index_vault(force=True)
+
+        # A reader meanwhile searches the old index and changes nothing
+        reader = VaultIndexer(config, api_key="test-key")
+        assert reader.collection.count() == 2
+        names = {c.name for c in reader.chroma_client.list_collections()}
+        assert names == {f"{name}__old", f"{name}__build"}
+
+        # The next run restores it, and --resume finishes the force reindex
+        stats = reader.index_vault(resume=True)
+        assert stats.total_chunks == 3
+        names = {c.name for c in reader.chroma_client.list_collections()}
+        assert names == {name}
+        assert not reader.manifest.swap_in_progress()
+        assert reader.manifest.force_run_started_at() is None
+
+    def test_force_reindex_replaces_skipped_chunks_at_swap(
+        self, mock_openai_embeddings, temp_dirs
+    ):
+        """Skipped chunks of the live index survive until a rebuild is swapped in."""
+        mock_embedder, _ = mock_openai_embeddings
+        vault_dir, persist_dir = temp_dirs
+        vault_path = Path(vault_dir)
+        self._write_notes(vault_path, 2)
+        (vault_path / "note1.md").write_text(
+            "# Note 1\n\nPoisoned body.\n\n## More\n\nFine."
+        )
+
+        create = mock_embedder.embeddings.create.side_effect
+
+        def filtering_create(**kwargs):
+            response = create(**kwargs)
+            response.data = [
+                item
+                for item, text in zip(response.data, kwargs["input"], strict=True)
+                if "Poisoned" not in text
+            ]
+            return response
+
+        mock_embedder.embeddings.create.side_effect = filtering_create
+        config = IndexerConfig(
+            vault_path=str(vault_path),
+            persist_dir=persist_dir,
+            embedding_cache_size=0,
+        )
+        indexer = VaultIndexer(config, api_key="test-key")
+        indexer.index_vault()
+        [skipped] = indexer.manifest.skipped_chunks()
+
+        # An abandoned rebuild leaves the live index's records alone
+        self._fail_on_call(mock_embedder, 1)
+        with pytest.raises(RuntimeError, match="unavailable"):
+            indexer.index_vault(force=True)
+        assert indexer.manifest.skipped_chunks() == [skipped]
+
+        # A finished one replaces them with its own
+        mock_embedder.embeddings.create.side_effect = filtering_create
+        indexer.index_vault(force=True)
+        assert indexer.manifest.skipped_chunks() == [skipped]
+        (vault_path / "note1.md").write_text("# Note 1\n\nFixed body.")
+        indexer.index_vault(force=True)
+        assert indexer.manifest.skipped_chunks() == []
+
+    def test_swap_interrupted_after_renames_is_finished(
+        self, mock_openai_embeddings, temp_dirs
+    ):
+        """If a swap dies after both renames, the next run keeps the new index."""
+        vault_dir, persist_dir = temp_dirs
+        vault_path = Path(vault_dir)
+        self._write_notes(vault_path, 2)
+
+        config = IndexerConfig(vault_path=str(vault_path), persist_dir=persist_dir)
+        indexer = VaultIndexer(config, api_key="test-key")
+        indexer.index_vault()
+
+        (vault_path / "note2.md").write_text("# Note 2\n\nBody 2.")
+        with patch.object(
+            indexer.manifest, "end_force_run", side_effect=RuntimeError("killed")
+        ):
+            with pytest.raises(RuntimeError, match="killed"):
+                indexer.index_vault(force=True)
+
+        reopened = VaultIndexer(config, api_key="test-key")
+        stats = reopened.index_vault()
+        assert stats.total_chunks == 3
+        assert set(reopened.manifest.file_records()) == {
+            "note0.md",
+            "note1.md",
+            "note2.md",
+        }
+        names = {c.name for c in reopened.chroma_client.list_collections()}
+        assert names == {config.collection_name}
+
+    def test_empty_index_with_leftover_collection_kept(
+        self, mock_openai_embeddings, temp_dirs
+    ):
+        """An empty live index isn't replaced by a leftover retired collection."""
+        vault_dir, persist_dir = temp_dirs
+        vault_path = Path(vault_dir)
+        self._write_notes(vault_path, 2)
+
+        config = IndexerConfig(vault_path=str(vault_path), persist_dir=persist_dir)
+        indexer = VaultIndexer(config, api_key="test-key")
+        indexer.index_vault()
+
+        # The vault is emptied and rebuilt, but dropping the old index fails
+        for note in vault_path.glob("*.md"):
+            note.unlink()
+        delete_collection = indexer.chroma_client.delete_collection
+
+        def keep_retired(name):
+            if not name.endswith("__old"):
+                delete_collection(name)
+
+        with patch.object(
+            indexer.chroma_client, "delete_collection", side_effect=keep_retired
+        ):
+            indexer.index_vault(force=True)
+
+        reopened = VaultIndexer(config, api_key="test-key")
+        assert reopened.index_vault().total_chunks == 0
+        assert reopened.collection.name == config.collection_name
+
+
 class TestReasoningPipeline:
     """Test the reasoning extraction pipeline."""
 
@@ -0,0 +1,73 @@
+"""Tests for the local hashing embedder."""
+
+import math
+
+import numpy as np
+import pytest
+
+from obsidian_rag_mcp.rag.embedder import EmbedderConfig, create_embedder
+from obsidian_rag_mcp.rag.local_embedder import DEFAULT_DIMENSIONS, HashingEmbedder
+
+
+def cosine(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.dot(a, b))
+
+
+class TestHashingEmbedder:
+    """Test HashingEmbedder."""
+
+    def test_deterministic_unit_vectors(self):
+        """Test the same text always maps to the same normalized vector."""
+        embedder = HashingEmbedder()
+        first = embedder.embed_text("Project planning notes")
+        second = HashingEmbedder().embed_text("Project planning notes")
+
+        assert np.array_equal(first, second)
+        assert len(first) == DEFAULT_DIMENSIONS
+        assert first.dtype == np.float32
+        assert math.isclose(np.linalg.norm(first), 1.0, rel_tol=1e-6)
+
+    def test_similar_texts_score_higher(self):
+        """Test texts sharing words are closer than unrelated texts."""
+        embedder = HashingEmbedder()
+        query = embedder.embed_text("kubernetes deployment rollout")
+        related, unrelated = embedder.embed_texts(
+            [
+                "Notes on the kubernetes deployment and its rollout strategy",
+                "Grandma's recipe for apple pie with cinnamon",
+            ]
+        )
+
+        assert cosine(query, related) > cosine(query, unrelated)
+
+    def test_dimensions_and_empty_text(self):
+        """Test configured dimensions and texts without any features."""
+        embedder = HashingEmbedder(EmbedderConfig(backend="hashing", dimensions=64))
+        assert embedder.embedding_dimension == 64
+
+        vector = embedder.embed_text("   ...   ")
+        assert len(vector) == 64
+        assert math.isclose(sum(v * v for v in vector), 1.0)
+
+    def test_partial_never_skips(self):
+        """Test every input can be embedded locally."""
+        embeddings, errors = HashingEmbedder().embed_texts_partial(["a", "b"])
+        assert len(embeddings) == 2
+        assert errors == {}
+
+
+class TestCreateEmbedder:
+    """Test backend selection."""
+
+    def test_hashing_backend_needs_no_api_key(self, monkeypatch):
+        """Test the hashing backend is created without credentials."""
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        monkeypatch.setenv("EMBEDDING_BACKEND", "hashing")
+
+        embedder = create_embedder()
+        assert isinstance(embedder, HashingEmbedder)
+
+    def test_unknown_backend(self):
+        """Test unknown backends are rejected."""
+        with pytest.raises(ValueError, match="backend must be one of"):
+            EmbedderConfig(backend="word2vec")
@@ -0,0 +1,184 @@
+"""Tests for the SQLite index manifest."""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from obsidian_rag_mcp.rag.manifest import FileRecord, IndexManifest
+
+
+class TestFileRecord:
+    """Test FileRecord stat matching."""
+
+    def test_matches_stat(self):
+        """Test a record matches the stat it was built from."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            note = Path(tmpdir) / "note.md"
+            note.write_text("# Note")
+            record = FileRecord.from_stat(note.stat(), "abc")
+
+            assert record.matches_stat(note.stat())
+
+            note.write_text("# Note, longer")
+            assert not record.matches_stat(note.stat())
+
+    def test_unknown_signature_never_matches(self):
+        """Test records without a stat signature always force a read."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            note = Path(tmpdir) / "note.md"
+            note.write_text("")
+            assert not FileRecord(content_hash="abc").matches_stat(os.stat(note))
+
+
+class TestIndexManifest:
+    """Test IndexManifest persistence."""
+
+    def test_lazy_open(self):
+        """Test the database is not created until first use."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manifest = IndexManifest(tmpdir)
+            assert not manifest.path.exists()
+
+            assert manifest.file_count() == 0
+            assert manifest.path.exists()
+            manifest.close()
+
+    def test_file_records_roundtrip(self):
+        """Test upsert, lookup, bulk load and delete of file records."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manifest = IndexManifest(tmpdir)
+            manifest.set_files(
+                [
+                    ("a.md", FileRecord("h1", size=1, mtime_ns=2, inode=3)),
+                    ("b.md", FileRecord("h2")),
+                ]
+            )
+            manifest.set_file("a.md", FileRecord("h3", size=4, mtime_ns=5, inode=6))
+
+            assert manifest.get_file("a.md") == FileRecord("h3", 4, 5, 6)
+            assert manifest.get_file("missing.md") is None
+            assert set(manifest.file_records()) == {"a.md", "b.md"}
+
+            manifest.delete_files(["b.md"])
+            assert manifest.file_count() == 1
+            manifest.close()
+
+            # Persisted across connections
+            reopened = IndexManifest(tmpdir)
+            assert reopened.get_file("a.md").content_hash == "h3"
+            reopened.close()
+
+    def test_rename_and_paths_under(self):
+        """Test moving a record and listing records inside a directory."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manifest = IndexManifest(tmpdir)
+            paths = ["a.md", os.path.join("dir", "b.md"), "dir-other.md"]
+            manifest.set_files([(path, FileRecord("h")) for path in paths])
+            manifest.set_file(os.path.join("dir", "sub", "c.md"), FileRecord("h"))
+
+            assert sorted(manifest.paths_under("dir")) == [
+                os.path.join("dir", "b.md"),
+                os.path.join("dir", "sub", "c.md"),
+            ]
+
+            manifest.rename_file("a.md", "z.md", FileRecord("h2"))
+            assert manifest.get_file("a.md") is None
+            assert manifest.get_file("z.md") == FileRecord("h2")
+            manifest.close()
+
+    def test_extraction_cache(self):
+        """Test marking and querying extracted chunk hashes."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manifest = IndexManifest(tmpdir)
+            manifest.mark_extracted(["x", "y"])
+            manifest.mark_extracted(["y"])
+
+            assert manifest.extracted_hashes(["x", "z"]) == {"x"}
+            assert manifest.extracted_count() == 2
+
+            manifest.clear()
+            assert manifest.extracted_count() == 0
+            manifest.close()
+
+    def test_skipped_chunks(self):
+        """Test skipped chunks are recorded per file and cleared with it."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manifest = IndexManifest(tmpdir)
+            manifest.add_skipped(
+                [
+                    ("b.md#2", "b.md", "filtered"),
+                    ("a.md#1", "a.md", "too long"),
+                    ("c.md#1", "c.md", "filtered"),
+                ]
+            )
+            assert manifest.skipped_chunks() == [
+                ("a.md#1", "a.md", "too long"),
+                ("b.md#2", "b.md", "filtered"),
+                ("c.md#1", "c.md", "filtered"),
+            ]
+
+            manifest.clear_skipped(["a.md"])
+            manifest.rename_file("b.md", "moved.md", FileRecord("h"))
+            assert manifest.skipped_chunks() == [("c.md#1", "c.md", "filtered")]
+
+            manifest.clear()
+            assert manifest.skipped_chunks() == []
+            manifest.close()
+
+    def test_force_run_progress(self):
+        """Test force reindex checkpoints survive until the run ends."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manifest = IndexManifest(tmpdir)
+            assert manifest.force_run_started_at() is None
+
+            manifest.begin_force_run()
+            manifest.set_files([("a.md", FileRecord("h1"))], force_run=True)
+            manifest.set_files([("b.md", FileRecord("h2"))])
+            manifest.close()
+
+            reopened = IndexManifest(tmpdir)
+            assert reopened.force_run_started_at() is not None
+
+            assert reopened.force_run_records() == {"a.md": FileRecord("h1")}
+            # Live records are untouched until the run ends
+            assert reopened.get_file("a.md") is None
+
+            reopened.begin_swap()
+            assert reopened.swap_in_progress()
+            reopened.end_force_run()
+            assert reopened.force_run_started_at() is None
+            assert not reopened.swap_in_progress()
+            assert reopened.force_run_records() == {}
+            # The rebuilt records replace the live ones
+            assert reopened.file_count() == 1
+            assert reopened.get_file("a.md") == FileRecord("h1")
+            reopened.close()
+
+    def test_imports_legacy_json(self):
+        """Test file_hashes.json and extraction_cache.json are migrated once."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            persist = Path(tmpdir)
+            (persist / "file_hashes.json").write_text(
+                json.dumps(
+                    {
+                        "old.md": "abc123",
+                        "new.md": {
+                            "content_hash": "def456",
+                            "size": 10,
+                            "mtime_ns": 20,
+                            "inode": 30,
+                        },
+                    }
+                )
+            )
+            (persist / "extraction_cache.json").write_text(json.dumps({"h": True}))
+
+            manifest = IndexManifest(persist)
+            assert manifest.get_file("old.md") == FileRecord("abc123")
+            assert manifest.get_file("new.md") == FileRecord("def456", 10, 20, 30)
+            assert manifest.extracted_hashes(["h"]) == {"h"}
+            manifest.close()
+
+            assert not (persist / "file_hashes.json").exists()
+            assert (persist / "file_hashes.json.migrated").exists()
@@ -0,0 +1,79 @@
+"""Tests for the bounded pipeline helpers."""
+
+import threading
+import time
+
+import pytest
+
+from obsidian_rag_mcp.utils.pipeline import prefetch
+
+
+class TestPrefetch:
+    """Tests for prefetch."""
+
+    def test_preserves_order(self):
+        """Items come out in the order the stage produced them."""
+        assert list(prefetch(range(100), maxsize=3)) == list(range(100))
+
+    def test_chained_stages(self):
+        """Stages can be chained, each running on its own thread."""
+        threads = set()
+
+        def stage(items):
+            for item in items:
+                threads.add(threading.current_thread().name)
+                yield item * 2
+
+        doubled = prefetch(stage(range(10)), maxsize=2, name="first")
+        quadrupled = prefetch(stage(doubled), maxsize=2, name="second")
+
+        assert list(quadrupled) == [i * 4 for i in range(10)]
+        assert threads == {"pipeline-first", "pipeline-second"}
+
+    def test_bounded_buffer(self):
+        """The stage never runs more than maxsize items ahead of the consumer."""
+        produced = []
+
+        def stage():
+            for i in range(20):
+                produced.append(i)
+                yield i
+
+        stream = prefetch(stage(), maxsize=2)
+        assert next(stream) == 0
+        time.sleep(0.2)
+        # One consumed, two buffered, one blocked waiting for space
+        assert len(produced) <= 4
+        stream.close()
+
+    def test_exception_propagates(self):
+        """Exceptions in the stage are raised in the consumer."""
+
+        def stage():
+            yield 1
+            raise RuntimeError("stage failed")
+
+        stream = prefetch(stage())
+        assert next(stream) == 1
+        with pytest.raises(RuntimeError, match="stage failed"):
+            next(stream)
+
+    def test_early_close_stops_upstream(self):
+        """Closing the consumer stops the stage and closes its source."""
+        closed = threading.Event()
+
+        def stage():
+            try:
+                yield from range(1000)
+            finally:
+                closed.set()
+
+        stream = prefetch(stage(), maxsize=1)
+        assert next(stream) == 0
+        stream.close()
+        assert closed.is_set()
+
+    def test_invalid_maxsize(self):
+        """maxsize must be positive."""
+        with pytest.raises(ValueError, match="maxsize"):
+            list(prefetch([], maxsize=0))
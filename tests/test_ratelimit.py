@@ -0,0 +1,91 @@
+"""Tests for the token-bucket rate limiter."""
+
+import threading
+
+import pytest
+
+from obsidian_rag_mcp.utils.ratelimit import RateLimiter
+
+
+class FakeClock:
+    """Clock whose sleep advances time instantly."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestRateLimiter:
+    """Tests for RateLimiter."""
+
+    def test_unlimited_never_waits(self):
+        """Without limits, acquire returns immediately."""
+        limiter = RateLimiter()
+        assert not limiter.enabled
+        assert limiter.acquire(10_000) == 0.0
+
+    def test_requests_per_minute(self):
+        """A full bucket allows a burst, then requests are spaced out."""
+        clock = FakeClock()
+        limiter = RateLimiter(requests_per_minute=60, clock=clock, sleep=clock.sleep)
+
+        for _ in range(60):
+            assert limiter.acquire() == 0.0
+        assert limiter.acquire() == pytest.approx(1.0)
+        assert limiter.acquire() == pytest.approx(1.0)
+
+    def test_tokens_per_minute(self):
+        """Token usage is limited independently of the request count."""
+        clock = FakeClock()
+        limiter = RateLimiter(
+            requests_per_minute=1000,
+            tokens_per_minute=600,
+            clock=clock,
+            sleep=clock.sleep,
+        )
+
+        assert limiter.acquire(500) == 0.0
+        # 100 tokens left; 200 more need 10 tokens/s * 10s
+        assert limiter.acquire(200) == pytest.approx(10.0)
+
+    def test_oversized_request_waits_for_full_bucket(self):
+        """A request larger than the per-minute allowance isn't starved."""
+        clock = FakeClock()
+        limiter = RateLimiter(tokens_per_minute=600, clock=clock, sleep=clock.sleep)
+
+        assert limiter.acquire(100) == 0.0
+        assert limiter.acquire(5000) == pytest.approx(10.0)
+        # The overdraft is paid back before the next request
+        assert limiter.acquire(60) > 60.0
+
+    def test_thread_safe(self):
+        """Concurrent callers never exceed the burst allowance."""
+        limiter = RateLimiter(requests_per_minute=100)
+        results = []
+
+        def worker():
+            for _ in range(10):
+                results.append(limiter.acquire())
+
+        threads = [threading.Thread(target=worker) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(results) == 100
+        assert all(waited < 1.0 for waited in results)
+
+    def test_validation(self):
+        """Limits must be positive."""
+        with pytest.raises(ValueError, match="requests_per_minute"):
+            RateLimiter(requests_per_minute=0)
+        with pytest.raises(ValueError, match="tokens_per_minute"):
+            RateLimiter(tokens_per_minute=-5)
@@ -552,6 +552,37 @@ class TestConclusionStore:
             assert deleted == 2
             assert store.count() == 1
 
+    def test_delete_by_source_chunks(self):
+        """Test deleting conclusions derived from specific chunks."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = ConclusionStore(persist_dir=tmpdir)
+
+            ctx = ChunkContext(
+                source_path="a.md",
+                title="Test",
+                heading=None,
+                tags=[],
+                chunk_index=0,
+            )
+            store.add(
+                [
+                    Conclusion(
+                        id=f"id{i}",
+                        type=ConclusionType.DEDUCTIVE,
+                        statement=f"Statement {i}",
+                        confidence=0.9,
+                        evidence=[],
+                        source_chunk_id=f"chunk{i % 2}",
+                        context=ctx,
+                    )
+                    for i in range(3)
+                ]
+            )
+
+            assert store.delete_by_source_chunks([]) == 0
+            assert store.delete_by_source_chunks(["chunk0"]) == 2
+            assert store.count() == 1
+
     def test_clear(self):
         """Test clearing all conclusions."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -694,6 +725,52 @@ class TestConclusionStore:
             assert retrieved.context.heading == "Chapter 1"
             assert retrieved.context.tags == ["python", "tutorial"]
 
+    @patch("obsidian_rag_mcp.reasoning.conclusion_store.chromadb.PersistentClient")
+    def test_move_source_updates_file_name_title(self, mock_client_class):
+        """Test moved conclusions rename titles taken from the file name."""
+        mock_client = Mock()
+        mock_client_class.return_value = mock_client
+
+        mock_collection = Mock()
+        mock_client.get_or_create_collection.return_value = mock_collection
+        mock_collection.get.return_value = {
+            "ids": ["c1", "c2"],
+            "metadatas": [
+                {
+                    "source_path": "inbox/draft.md",
+                    "source_chunk_id": "inbox/draft.md#a",
+                    "title": "draft",
+                },
+                {
+                    "source_path": "inbox/draft.md",
+                    "source_chunk_id": "inbox/draft.md#b",
+                    "title": "Own Title",
+                },
+            ],
+        }
+
+        store = ConclusionStore(persist_dir="/tmp/test")
+        moved = store.move_source(
+            "inbox/draft.md", "final.md", {"inbox/draft.md#a": "final.md#a"}
+        )
+
+        assert moved == 2
+        mock_collection.update.assert_called_once_with(
+            ids=["c1", "c2"],
+            metadatas=[
+                {
+                    "source_path": "final.md",
+                    "source_chunk_id": "final.md#a",
+                    "title": "final",
+                },
+                {
+                    "source_path": "final.md",
+                    "source_chunk_id": "inbox/draft.md#b",
+                    "title": "Own Title",
+                },
+            ],
+        )
+
     @patch("obsidian_rag_mcp.reasoning.conclusion_store.chromadb.PersistentClient")
     def test_search_confidence_filter_in_query(self, mock_client_class):
         """Test that confidence filter is included in ChromaDB where clause."""
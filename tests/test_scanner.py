@@ -0,0 +1,127 @@
+"""Tests for the vault scanner and ignore matcher."""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from obsidian_rag_mcp.rag.scanner import IgnoreMatcher, scan_markdown
+
+
+class TestIgnoreMatcher:
+    """Test .gitignore-style pattern semantics."""
+
+    @pytest.mark.parametrize(
+        "pattern,path,is_dir,expected",
+        [
+            # Unanchored patterns match at any depth
+            ("*.excalidraw.md", "a.excalidraw.md", False, True),
+            ("*.excalidraw.md", "x/y/a.excalidraw.md", False, True),
+            ("*.excalidraw.md", "a.md", False, False),
+            # "*" doesn't cross directories in anchored patterns
+            ("drafts/*.md", "drafts/a.md", False, True),
+            ("drafts/*.md", "drafts/sub/a.md", False, False),
+            ("drafts/*.md", "x/drafts/a.md", False, False),
+            # "**" spans directories
+            ("archive/**/*.md", "archive/a.md", False, True),
+            ("archive/**/*.md", "archive/2020/01/a.md", False, True),
+            ("**/tmp", "a/b/tmp", True, True),
+            # Leading slash anchors to the root
+            ("/Templates", "Templates", True, True),
+            ("/Templates", "x/Templates", True, False),
+            # Trailing slash matches directories only
+            ("build/", "build", True, True),
+            ("build/", "build", False, False),
+            # Legacy "name/*" ignores that directory anywhere
+            (".obsidian/*", ".obsidian", True, True),
+            ("node_modules/*", "a/node_modules", True, True),
+            (".venv*/*", ".venv-3.11", True, True),
+            # Character classes
+            ("note[0-9].md", "note1.md", False, True),
+            ("note[!0-9].md", "note1.md", False, False),
+        ],
+    )
+    def test_match(self, pattern, path, is_dir, expected):
+        """Test single-pattern matching."""
+        assert IgnoreMatcher([pattern]).match(path, is_dir=is_dir) is expected
+
+    def test_negation_last_match_wins(self):
+        """Test "!" re-includes paths matched by earlier patterns."""
+        matcher = IgnoreMatcher(["*.md", "!keep.md", "# comment", ""])
+
+        assert matcher.match("drop.md")
+        assert not matcher.match("keep.md")
+        assert not matcher.match("sub/keep.md")
+
+    def test_ignores_checks_parents(self):
+        """Test files under an ignored directory are ignored."""
+        matcher = IgnoreMatcher([".obsidian/*"])
+
+        assert matcher.ignores(".obsidian/plugins/readme.md")
+        assert not matcher.ignores("notes/readme.md")
+
+    def test_no_patterns(self):
+        """Test an empty matcher ignores nothing."""
+        matcher = IgnoreMatcher([])
+
+        assert not matcher.match("a.md")
+        assert not matcher.ignores("a/b.md")
+
+
+class TestScanMarkdown:
+    """Test the pruning directory walker."""
+
+    def test_prunes_ignored_directories(self):
+        """Test ignored directories are not descended into."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "notes" / "deep").mkdir(parents=True)
+            (root / "notes" / "a.md").write_text("a")
+            (root / "notes" / "deep" / "b.md").write_text("b")
+            (root / "notes" / "image.png").write_text("")
+            for i in range(5):
+                (root / "node_modules" / f"pkg{i}").mkdir(parents=True)
+                (root / "node_modules" / f"pkg{i}" / "README.md").write_text("x")
+
+            result = scan_markdown(root, IgnoreMatcher(["node_modules/*"]))
+
+            assert [p.relative_to(root).as_posix() for p in result.files] == [
+                "notes/a.md",
+                "notes/deep/b.md",
+            ]
+            assert result.dirs_pruned == 1
+            # Root, notes and notes/deep only
+            assert result.dirs_visited == 3
+            assert result.seconds >= 0
+
+    def test_scan_subdirectory(self):
+        """Test scanning a subdirectory keeps vault-relative matching."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "projects" / "drafts").mkdir(parents=True)
+            (root / "projects" / "a.md").write_text("a")
+            (root / "projects" / "drafts" / "b.md").write_text("b")
+            (root / "other.md").write_text("o")
+
+            result = scan_markdown(
+                root, IgnoreMatcher(["/projects/drafts/"]), "projects"
+            )
+
+            assert [p.relative_to(root).as_posix() for p in result.files] == [
+                "projects/a.md"
+            ]
+
+    def test_skips_symlinked_directories(self):
+        """Test symlinked directories are never followed."""
+        with (
+            tempfile.TemporaryDirectory() as outside,
+            tempfile.TemporaryDirectory() as tmpdir,
+        ):
+            (Path(outside) / "secret.md").write_text("secret")
+            root = Path(tmpdir)
+            (root / "note.md").write_text("note")
+            (root / "linked").symlink_to(outside, target_is_directory=True)
+
+            result = scan_markdown(root, IgnoreMatcher([]))
+
+            assert [p.name for p in result.files] == ["note.md"]
@@ -1,6 +1,13 @@
 """Tests for token counting utilities."""
 
-from obsidian_rag_mcp.utils.tokens import count_tokens
+import tiktoken
+
+from obsidian_rag_mcp.utils.tokens import (
+    count_tokens,
+    count_tokens_batch,
+    encode_with_offsets,
+    truncate_tokens,
+)
 
 
 class TestCountTokens:
@@ -91,3 +98,73 @@ x = 42
         actual = count_tokens(text)
         # Verify the function works with special characters
         assert actual > 0
+
+
+class TestCountTokensBatch:
+    """Tests for count_tokens_batch function."""
+
+    def test_matches_count_tokens(self):
+        """Batch counts equal individual counts, in order."""
+        texts = ["Hello, world!", "", "日本語のテキスト", "def f(x):\n    return x"] * 5
+        assert count_tokens_batch(texts) == [count_tokens(t) for t in texts]
+        assert count_tokens_batch(texts, num_threads=1) == count_tokens_batch(texts)
+        assert count_tokens_batch([]) == []
+
+    def test_special_tokens_counted_as_text(self):
+        """Special-token strings are ordinary text on every path."""
+        texts = ["Ends with <|endoftext|>", "<|fim_prefix|>code", "plain"]
+        assert count_tokens_batch(texts) == [count_tokens(t) for t in texts]
+        assert truncate_tokens(texts[0], 100) == (texts[0], count_tokens(texts[0]))
+        assert len(encode_with_offsets(texts[1])[0]) == count_tokens(texts[1])
+
+
+class TestTruncateTokens:
+    """Tests for truncate_tokens function."""
+
+    def test_short_text_unchanged(self):
+        """Text within the limit is returned as is, with its count."""
+        text = "A short sentence."
+        assert truncate_tokens(text, 100) == (text, count_tokens(text))
+        assert truncate_tokens("", 10) == ("", 0)
+
+    def test_long_text_truncated(self):
+        """Text over the limit is cut to a prefix within the limit."""
+        text = "word " * 1000
+        truncated, count = truncate_tokens(text, 50)
+        assert text.startswith(truncated)
+        assert count == count_tokens(truncated)
+        assert 0 < count <= 50
+
+    def test_multibyte_boundary(self):
+        """A cut inside a multi-byte character never yields replacement chars."""
+        text = "こんにちは世界" * 50
+        for limit in range(1, 20):
+            truncated, count = truncate_tokens(text, limit)
+            assert "\ufffd" not in truncated
+            assert text.startswith(truncated)
+            assert count <= limit
+
+
+class TestEncodeWithOffsets:
+    """Tests for encode_with_offsets function."""
+
+    def test_offsets_slice_on_token_boundaries(self):
+        """Slicing at consecutive offsets gives each token's text."""
+        text = "Plain words, and code() mixed together."
+        tokens, offsets = encode_with_offsets(text)
+        encoder = tiktoken.get_encoding("cl100k_base")
+
+        assert len(tokens) == len(offsets) == count_tokens(text)
+        bounds = [*offsets, len(text)]
+        pieces = [text[a:b] for a, b in zip(bounds, bounds[1:], strict=False)]
+        assert pieces == [encoder.decode([token]) for token in tokens]
+        assert encode_with_offsets("") == ([], [])
+
+    def test_multibyte_offsets(self):
+        """Offsets stay within the text and never decrease for multi-byte text."""
+        text = "日本語のテキスト、絵文字 🎉 も含む。"
+        tokens, offsets = encode_with_offsets(text)
+
+        assert len(tokens) == len(offsets)
+        assert offsets == sorted(offsets)
+        assert 0 == offsets[0] and offsets[-1] < len(text)
@@ -0,0 +1,107 @@
+"""Tests for the vault watcher."""
+
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from obsidian_rag_mcp.rag.scanner import IgnoreMatcher
+from obsidian_rag_mcp.rag.watcher import VaultWatcher, WatcherConfig
+
+
+def _mock_indexer(vault: Path) -> Mock:
+    indexer = Mock()
+    indexer.vault_path = vault
+    indexer.ignore_matcher = IgnoreMatcher([".obsidian/*"])
+    return indexer
+
+
+def _wait_for_call(mock, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not mock.called and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+
+class TestWatcherConfig:
+    """Test WatcherConfig validation."""
+
+    def test_defaults(self):
+        """Test default configuration."""
+        config = WatcherConfig()
+        assert config.debounce_ms == 1000
+        assert config.force_polling is False
+
+    def test_validation(self):
+        """Test invalid values are rejected."""
+        with pytest.raises(ValueError, match="debounce_ms"):
+            WatcherConfig(debounce_ms=-1)
+        with pytest.raises(ValueError, match="poll_interval"):
+            WatcherConfig(poll_interval=0)
+
+
+class TestVaultWatcher:
+    """Test change filtering and dispatch to the indexer."""
+
+    def test_is_relevant(self):
+        """Test only indexable notes and possible directories are relevant."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            vault = Path(tmpdir)
+            (vault / "folder").mkdir()
+            (vault / "image.png").write_text("")
+            watcher = VaultWatcher(_mock_indexer(vault))
+
+            assert watcher.is_relevant(vault / "note.md")
+            assert watcher.is_relevant(vault / "folder")
+            # Deleted paths may have been directories
+            assert watcher.is_relevant(vault / "gone")
+            assert not watcher.is_relevant(vault / "image.png")
+            assert not watcher.is_relevant(vault / ".obsidian" / "workspace.md")
+            assert not watcher.is_relevant("/elsewhere/note.md")
+
+    def test_flush_survives_errors(self):
+        """Test indexing failures are logged rather than stopping the watcher."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            indexer = _mock_indexer(Path(tmpdir))
+            indexer.index_paths.side_effect = RuntimeError("boom")
+            watcher = VaultWatcher(indexer)
+
+            assert watcher.flush({"a.md"}) is None
+            assert watcher.flush(set()) is None
+            indexer.index_paths.assert_called_once_with(["a.md"])
+
+    @pytest.mark.parametrize("force_polling", [True, False])
+    def test_reports_changed_paths(self, force_polling):
+        """Test a new note is passed to index_paths by either backend."""
+        if not force_polling:
+            pytest.importorskip("watchfiles")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            vault = Path(tmpdir).resolve()
+            indexer = _mock_indexer(vault)
+            updates = []
+            watcher = VaultWatcher(
+                indexer,
+                WatcherConfig(
+                    debounce_ms=50, poll_interval=0.05, force_polling=force_polling
+                ),
+                on_update=updates.append,
+            )
+            assert watcher.backend == ("polling" if force_polling else "native")
+
+            watcher.start()
+            try:
+                # Give the native watcher time to register
+                time.sleep(0.3)
+                (vault / "new.md").write_text("# New")
+                _wait_for_call(indexer.index_paths)
+            finally:
+                watcher.stop(timeout=10)
+
+            assert indexer.index_paths.called
+            reported = indexer.index_paths.call_args.args[0]
+            assert str(vault / "new.md") in reported
+            assert updates == [indexer.index_paths.return_value]
+            assert not any(t.name == "vault-watcher" for t in threading.enumerate())